@@ -1,6 +1,12 @@
+import io
+import time
+
 from flask import Flask, render_template, request, jsonify
-from logic.aes_verbose import aes_encrypt_verbose
+from logic.aes_verbose import aes_encrypt_verbose, prepare_key, aes_encrypt_paged, aes_trace_page
+from logic.aes_modes import aes_mode_encrypt, aes_mode_decrypt, modes_benchmark
+from logic.aes_core import key_cache_stats
 from logic.des_verbose import des_encrypt_verbose
+from logic.des_modes import des_encrypt_stream, des_decrypt_stream
 from logic.row_transposition_verbose import row_transposition_encrypt_verbose
 from logic.rail_fence_verbose import rail_fence_encrypt_verbose
 from logic.otp_verbose import otp_encrypt_verbose
@@ -10,13 +16,24 @@ from logic.hill_verbose import hill_encrypt_verbose
 from logic.playfair_verbose import playfair_encrypt_verbose
 from logic.monoalphabetic_verbose import monoalphabetic_encrypt_verbose
 from logic.caesar_verbose import caesar_encrypt_verbose
-from logic.rsa_verbose import generate_keypair, rsa_encrypt_verbose, rsa_decrypt_verbose
+from logic.rsa_verbose import generate_keypair, generate_keypair_large, validate_crt, rsa_encrypt_verbose, rsa_decrypt_verbose
+from logic.rsa_verbose import rsa_encrypt_packed, rsa_decrypt_packed, rsa_decrypt_batch
 from logic.rsa_verbose import generate_keypair, rsa_encrypt_verbose, rsa_decrypt_verbose
 from logic.diffie_hellman_verbose import diffie_hellman_step1_setup, diffie_hellman_step2_keys, diffie_hellman_step3_secret
+from logic.dh_groups import get_group, list_groups
 from logic.elgamal_verbose import generate_keys_elgamal, elgamal_encrypt_verbose, elgamal_decrypt_verbose
-from logic.dsa_verbose import dsa_setup_parameters, dsa_generate_keys, dsa_sign_verbose, dsa_verify_verbose
+from logic.elgamal_verbose import elgamal_encrypt_packed, elgamal_decrypt_packed
+from logic.dsa_verbose import dsa_setup_parameters, dsa_generate_keys, dsa_sign_verbose, dsa_verify_verbose, dsa_verify_batch
 from logic.ecc_verbose import ecc_setup_parameters, ecc_generate_keys, ecc_shared_secret, get_curve_points
-from logic.hmac_verbose import hmac_verbose
+from logic.ecc_verbose import ecc_setup_named_curve, ecc_generate_keys_named, ecc_shared_secret_named
+from logic.ecc_core import point_to_dict, point_from_dict
+from logic.ecdsa_core import ecdsa_keypair, ecdsa_sign, ecdsa_verify, ecdsa_verify_batch, ecdsa_benchmark
+from logic.dsa_params import get_parameters as get_dsa_parameters
+from logic.hmac_verbose import hmac_verbose, hmac_init, hmac_update, hmac_finalize, hmac_key_cache_stats, STREAM_CHUNK_SIZE
+from logic.hash_trace import hash_digest, hash_trace_start, hash_trace_page, hash_constants
+from logic.rc4_verbose import rc4_crypt, rc4_trace, rc4_cache_stats
+from logic.enigma_core import enigma_encrypt, bombe_search
+from logic.trace_codec import wants_compact, encode_aes_trace, encode_des_trace
 from logic.prng_verbose import lcg_generate
 from logic.trng_verbose import get_system_entropy, process_user_entropy
 from logic.ipsec_verbose import get_ipsec_structure
@@ -142,8 +159,94 @@ def hmac_calculate_route():
         key = data.get('key', '')
         message = data.get('message', '')
         
-        result = hmac_verbose(key, message)
+        result = hmac_verbose(key, message, data.get('algo', 'sha256'))
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Streaming HMAC: init -> any number of raw-body uploads -> finalize
+@app.route('/hmac_stream/init', methods=['POST'])
+def hmac_stream_init_route():
+    data = request.get_json(silent=True) or {}
+    try:
+        sid = hmac_init(data.get('key', ''), data.get('algo', 'sha256'))
+        return jsonify({"session": sid, "chunk_size": STREAM_CHUNK_SIZE})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/hmac_stream/<sid>', methods=['POST', 'PUT'])
+def hmac_stream_update_route(sid):
+    # Raw body (application/octet-stream), read in fixed-size pieces: never held in memory
+    def chunks():
+        while True:
+            chunk = request.stream.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    try:
+        return jsonify({"session": sid, "bytes": hmac_update(sid, chunks())})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/hmac_stream/<sid>/finalize', methods=['POST'])
+def hmac_stream_finalize_route(sid):
+    try:
+        return jsonify(hmac_finalize(sid))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/hmac_key_cache', methods=['POST'])
+def hmac_key_cache_route():
+    return jsonify(hmac_key_cache_stats())
+
+def _hash_input(data):
+    if data.get('message_hex') is not None:
+        return bytes.fromhex(data['message_hex'])
+    return data.get('message', '').encode('utf-8')
+
+@app.route('/hash_digest', methods=['POST'])
+def hash_digest_route():
+    # Fast path (hashlib), no trace
+    data = request.json
+    try:
+        algo = data.get('algo', 'sha256')
+        return jsonify({"algo": algo, "digest": hash_digest(algo, _hash_input(data))})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/hash_trace', methods=['POST'])
+def hash_trace_route():
+    # Digest, handle and constants; the rounds come from /hash_trace_page
+    data = request.json
+    try:
+        algo = data.get('algo', 'sha256')
+        result = hash_trace_start(algo, _hash_input(data))
+        result["constants"] = hash_constants(algo)
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/hash_trace_page', methods=['POST'])
+def hash_trace_page_route():
+    data = request.json
+    try:
+        return jsonify(hash_trace_page(data.get('handle', ''), data.get('start', 0), data.get('count', 1)))
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -159,6 +262,79 @@ def des():
 def modes():
     return render_template('modes.html')
 
+def _modes_key(data):
+    if data.get('key_hex'):
+        return bytes.fromhex(data['key_hex'])
+    return prepare_key(data.get('key', ''))
+
+@app.route('/modes_encrypt', methods=['POST'])
+def modes_encrypt():
+    data = request.json
+    text = data.get('text', '')
+    
+    if not (data.get('key') or data.get('key_hex')):
+        return jsonify({"error": "Missing key"}), 400
+        
+    try:
+        key_bytes = _modes_key(data)
+        iv = bytes.fromhex(data['iv']) if data.get('iv') else None
+        aad = data.get('aad', '').encode('utf-8')
+        
+        start = time.perf_counter()
+        result = aes_mode_encrypt(text.encode('utf-8'), key_bytes, data.get('mode', 'CBC'), iv, aad)
+        elapsed = time.perf_counter() - start
+        
+        return jsonify({
+            "mode": result['mode'],
+            "key_hex": key_bytes.hex(),
+            "iv_hex": result['iv'].hex() if result['iv'] else None,
+            "ciphertext_hex": result['ciphertext'].hex(),
+            "tag_hex": result['tag'].hex() if result['tag'] else None,
+            "blocks": -(-len(result['ciphertext']) // 16),
+            "parallel": result['parallel'],
+            "elapsed_ms": round(elapsed * 1000, 3)
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/modes_decrypt', methods=['POST'])
+def modes_decrypt():
+    data = request.json
+    
+    if not (data.get('key') or data.get('key_hex')):
+        return jsonify({"error": "Missing key"}), 400
+        
+    try:
+        key_bytes = _modes_key(data)
+        ciphertext = bytes.fromhex(data.get('ciphertext_hex', ''))
+        iv = bytes.fromhex(data['iv']) if data.get('iv') else None
+        tag = bytes.fromhex(data['tag']) if data.get('tag') else None
+        aad = data.get('aad', '').encode('utf-8')
+        
+        result = aes_mode_decrypt(ciphertext, key_bytes, data.get('mode', 'CBC'), iv, aad, tag)
+        return jsonify({
+            "mode": result['mode'],
+            "plaintext": result['plaintext'].decode('utf-8', errors='replace'),
+            "plaintext_hex": result['plaintext'].hex(),
+            "parallel": result['parallel']
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/modes_benchmark', methods=['POST'])
+def modes_benchmark_route():
+    data = request.json or {}
+    try:
+        # Capped so a classroom request cannot keep a worker busy for long
+        size = min(int(data.get('size', 64 * 1024)), 4 * 1024 * 1024)
+        return jsonify(modes_benchmark(size))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/encrypt', methods=['POST'])
 def encrypt():
     data = request.json
@@ -169,11 +345,47 @@ def encrypt():
         return jsonify({"error": "Missing text or key"}), 400
         
     try:
-        result = aes_encrypt_verbose(text, key)
+        result = aes_encrypt_verbose(text, key, trace=data.get('trace', True))
+        if wants_compact(request.headers.get('Accept')):
+            result = encode_aes_trace(result)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/encrypt_paged', methods=['POST'])
+def encrypt_paged():
+    data = request.json
+    text = data.get('text', '')
+    key = data.get('key', '')
+    
+    if not text or not key:
+        return jsonify({"error": "Missing text or key"}), 400
+        
+    try:
+        result = aes_encrypt_paged(text, key)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/aes_trace', methods=['POST'])
+def aes_trace():
+    data = request.json
+    handle = data.get('handle', '')
+    
+    try:
+        result = aes_trace_page(handle, data.get('start', 0), data.get('count', 1))
+        if wants_compact(request.headers.get('Accept')):
+            result = encode_aes_trace(result)
+        return jsonify(result)
+    except KeyError as e:
+        return jsonify({"error": e.args[0]}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/aes_key_cache', methods=['POST'])
+def aes_key_cache():
+    return jsonify(key_cache_stats())
+
 @app.route('/encrypt_des', methods=['POST'])
 def encrypt_des():
     data = request.json
@@ -185,7 +397,62 @@ def encrypt_des():
         
     try:
         result = des_encrypt_verbose(text, key)
+        if wants_compact(request.headers.get('Accept')):
+            result = encode_des_trace(result)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _bulk_input():
+    # Multipart upload is streamed from the uploaded file; JSON carries text or hex
+    upload = request.files.get('file')
+    if upload:
+        return upload.stream, request.form
+    data = request.json or {}
+    if data.get('data_hex'):
+        return io.BytesIO(bytes.fromhex(data['data_hex'])), data
+    return io.BytesIO(data.get('text', '').encode('utf-8')), data
+
+@app.route('/encrypt_des_bulk', methods=['POST'])
+def encrypt_des_bulk():
+    try:
+        src, params = _bulk_input()
+        key = params.get('key', '')
+        if not key:
+            return jsonify({"error": "Missing key"}), 400
+
+        trace_blocks = [int(i) for i in params.get('trace_blocks', [])] if request.is_json else []
+        dst = io.BytesIO()
+        start = time.perf_counter()
+        result = des_encrypt_stream(src, dst, key, params.get('mode', 'ECB'), params.get('iv'), trace_blocks=trace_blocks)
+        elapsed = time.perf_counter() - start
+        result['ciphertext_hex'] = dst.getvalue().hex().upper()
+        result['elapsed_ms'] = round(elapsed * 1000, 3)
+        result['mb_per_s'] = round(result['bytes_in'] / elapsed / 1e6, 3) if elapsed else None
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/decrypt_des_bulk', methods=['POST'])
+def decrypt_des_bulk():
+    try:
+        src, params = _bulk_input()
+        key = params.get('key', '')
+        if not key:
+            return jsonify({"error": "Missing key"}), 400
+
+        dst = io.BytesIO()
+        result = des_decrypt_stream(src, dst, key, params.get('mode', 'ECB'), params.get('iv'))
+        plain = dst.getvalue()
+        result['plaintext_hex'] = plain.hex().upper()
+        result['plaintext'] = plain.decode('utf-8', errors='replace')
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -252,6 +519,11 @@ def encrypt_otp():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def _step_window_args(data):
+    # Optional window of step dicts for long texts: step_start, step_count
+    count = data.get('step_count')
+    return int(data.get('step_start', 0)), (int(count) if count is not None else None)
+
 @app.route('/vernam')
 def vernam():
     return render_template('vernam.html')
@@ -266,7 +538,7 @@ def encrypt_vernam():
         return jsonify({"error": "Missing text"}), 400
         
     try:
-        result = vernam_encrypt_verbose(text, key)
+        result = vernam_encrypt_verbose(text, key, *_step_window_args(data))
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -285,7 +557,7 @@ def encrypt_vigenere():
         return jsonify({"error": "Missing text or key"}), 400
         
     try:
-        result = vigenere_encrypt_verbose(text, key)
+        result = vigenere_encrypt_verbose(text, key, *_step_window_args(data))
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -339,7 +611,7 @@ def encrypt_monoalphabetic():
     key = data.get('key', '') # Optional, defaults to empty in logic if needed, but logic expects key for keyword mix
     
     try:
-        result = monoalphabetic_encrypt_verbose(text, key)
+        result = monoalphabetic_encrypt_verbose(text, key, *_step_window_args(data))
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -352,6 +624,42 @@ def caesar():
 def enigma():
     return render_template('enigma.html')
 
+@app.route('/enigma_encrypt', methods=['POST'])
+def enigma_encrypt_route():
+    # rotors (left to right), reflector, rings, positions, plugboard ("AB CD ..."); trace for the letter paths
+    data = request.json
+    if not data.get('text'):
+        return jsonify({"error": "Missing text"}), 400
+    try:
+        result = enigma_encrypt(data['text'], data, bool(data.get('trace')))
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/enigma_bombe', methods=['POST'])
+def enigma_bombe_route():
+    # Crib attack: every order of the given rotors (default I-V, 60 orders) x 17576 start positions
+    data = request.json
+    if not data.get('ciphertext') or not data.get('crib'):
+        return jsonify({"error": "Missing ciphertext or crib"}), 400
+    try:
+        offset = data.get('offset')
+        result = bombe_search(
+            data['ciphertext'], data['crib'],
+            offset=int(offset) if offset is not None else None,
+            rotors=data.get('rotors'),
+            reflector=data.get('reflector', 'B'),
+            rings=data.get('rings', 'AAA'),
+            max_stops=max(1, min(int(data.get('max_stops', 50)), 200))
+        )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/encrypt_caesar', methods=['POST'])
 def encrypt_caesar():
     data = request.json
@@ -359,7 +667,7 @@ def encrypt_caesar():
     shift = data.get('shift', 3) # Default shift 3
     
     try:
-        result = caesar_encrypt_verbose(text, shift)
+        result = caesar_encrypt_verbose(text, shift, *_step_window_args(data))
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -372,6 +680,17 @@ def rsa():
 def rsa_generate_keys():
     data = request.json
     try:
+        if data.get('bits'):
+            # Real-size key from random primes, with CRT parameters
+            key_data = generate_keypair_large(int(data.get('bits')))
+            return jsonify({
+                "public_key": key_data['public'],
+                "private_key": key_data['private'],
+                "phi": key_data['phi'],
+                "crt": key_data['crt'],
+                "bits": key_data['bits'],
+                "steps": key_data['steps']
+            })
         p = int(data.get('p'))
         q = int(data.get('q'))
         key_data = generate_keypair(p, q)
@@ -397,8 +716,13 @@ def rsa_encrypt_route():
         return jsonify({"error": "Missing text"}), 400
         
     try:
+        if data.get('packed'):
+            # OAEP blocks instead of one value per character
+            return jsonify(rsa_encrypt_packed(text.encode('utf-8'), (e_val, n_val)))
         result = rsa_encrypt_verbose(text, (e_val, n_val))
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -406,15 +730,47 @@ def rsa_encrypt_route():
 def rsa_decrypt_route():
     data = request.json
     ciphertext = data.get('ciphertext') # List of ints
-    d_val = int(data.get('d'))
-    n_val = int(data.get('n'))
     
     if not ciphertext:
         return jsonify({"error": "Missing ciphertext"}), 400
         
     try:
-        result = rsa_decrypt_verbose(ciphertext, (d_val, n_val))
+        d_val = int(data.get('d'))
+        n_val = int(data.get('n'))
+        # Optional CRT parameters: p and q are enough, dP/dQ/qInv are derived (and checked if given)
+        crt = data.get('crt')
+        if crt:
+            crt = validate_crt(crt, d_val, n_val)
+        if data.get('packed'):
+            result = rsa_decrypt_packed(ciphertext, (d_val, n_val), crt)
+            result['plaintext'] = result['plaintext'].decode('utf-8', errors='replace')
+            return jsonify(result)
+        result = rsa_decrypt_verbose(ciphertext, (d_val, n_val), crt)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/rsa_decrypt_batch', methods=['POST'])
+def rsa_decrypt_batch_route():
+    # Same input as /rsa_decrypt (per-character ciphertext), plaintext and stats only
+    data = request.json
+    ciphertext = data.get('ciphertext')
+    if not ciphertext:
+        return jsonify({"error": "Missing ciphertext"}), 400
+
+    try:
+        d_val = int(data.get('d'))
+        n_val = int(data.get('n'))
+        crt = data.get('crt')
+        if crt:
+            crt = validate_crt(crt, d_val, n_val)
+        values, stats = rsa_decrypt_batch(ciphertext, (d_val, n_val), crt, data.get('parallel'))
+        plaintext = ''.join(chr(m) if m < 0x110000 else '?' for m in values)
+        return jsonify({"plaintext": plaintext, "stats": stats})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -428,15 +784,24 @@ def dh_step1_setup():
     data = request.json or {}
     p = data.get('p') # Optional
     g = data.get('g') # Optional
+    bits = data.get('bits') # Optional: size of a generated safe prime
+    group = data.get('group') # Optional: named group (modp2048, ffdhe3072, ...)
     if p: p = int(p)
     if g: g = int(g)
+    if bits: bits = int(bits)
     
     try:
-        result = diffie_hellman_step1_setup(p, g)
+        result = diffie_hellman_step1_setup(p, g, bits, group)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/dh_groups', methods=['GET'])
+def dh_groups_route():
+    return jsonify({"groups": list_groups()})
+
 @app.route('/dh_step2_keys', methods=['POST'])
 def dh_step2_keys():
     data = request.json
@@ -447,9 +812,15 @@ def dh_step2_keys():
         private_b = data.get('private_b')
         if private_a: private_a = int(private_a)
         if private_b: private_b = int(private_b)
+        exponent_bits = None
+        if data.get('group'):
+            group = get_group(data.get('group'))
+            p, g, exponent_bits = group['p'], group['g'], group['exponent_bits']
         
-        result = diffie_hellman_step2_keys(p, g, private_a, private_b)
+        result = diffie_hellman_step2_keys(p, g, private_a, private_b, exponent_bits)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -493,8 +864,12 @@ def elgamal_encrypt():
         g = int(data.get('g'))
         y = int(data.get('y'))
         
+        if data.get('packed'):
+            return jsonify(elgamal_encrypt_packed(message.encode('utf-8'), p, g, y))
         result = elgamal_encrypt_verbose(message, p, g, y)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -506,8 +881,14 @@ def elgamal_decrypt():
         p = int(data.get('p'))
         x = int(data.get('x'))
         
+        if data.get('packed'):
+            result = elgamal_decrypt_packed(ciphertext, p, x)
+            result['plaintext'] = result['plaintext'].decode('utf-8', errors='replace')
+            return jsonify(result)
         result = elgamal_decrypt_verbose(ciphertext, p, x)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -517,9 +898,15 @@ def dsa():
 
 @app.route('/dsa_setup', methods=['POST'])
 def dsa_setup():
+    data = request.get_json(silent=True) or {}
     try:
+        if data.get('L'):
+            # FIPS 186-4 sizes, e.g. L = 2048, N = 256 (slow the first time, then cached on disk)
+            return jsonify(dsa_setup_parameters(int(data.get('L')), int(data.get('N', 256))))
         result = dsa_setup_parameters()
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -533,6 +920,8 @@ def dsa_generate_keys_route():
         
         result = dsa_generate_keys(p, q, g)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -548,6 +937,8 @@ def dsa_sign_route():
         
         result = dsa_sign_verbose(message, p, q, g, x)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -565,6 +956,28 @@ def dsa_verify_route():
         
         result = dsa_verify_verbose(message, r, s, p, q, g, y)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/dsa_verify_batch', methods=['POST'])
+def dsa_verify_batch_route():
+    # {"p", "q", "g", "y", "signatures": [{"message", "r", "s"}, ...]} -> validity per item
+    data = request.json
+    signatures = data.get('signatures')
+    if not signatures:
+        return jsonify({"error": "Missing signatures"}), 400
+    try:
+        p = int(data.get('p'))
+        q = int(data.get('q'))
+        g = int(data.get('g'))
+        y = int(data.get('y'))
+        items = [(item['message'], item['r'], item['s']) for item in signatures]
+        results, stats = dsa_verify_batch(items, p, q, g, y)
+        return jsonify({"results": results, "stats": stats})
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -578,9 +991,14 @@ def comparison():
 
 @app.route('/ecc_setup', methods=['POST'])
 def ecc_setup():
+    data = request.get_json(silent=True) or {}
     try:
+        if data.get('curve'):
+            return jsonify(ecc_setup_named_curve(data.get('curve')))
         result = ecc_setup_parameters()
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -588,12 +1006,17 @@ def ecc_setup():
 def ecc_generate_keys_route():
     data = request.json
     try:
+        if data.get('curve'):
+            # Standard curve: wNAF by default, 'ladder' on request
+            return jsonify(ecc_generate_keys_named(data.get('curve'), data.get('method', 'wnaf')))
         p = int(data.get('p'))
         a = int(data.get('a'))
         G = data.get('G') # dict with x, y
         
         result = ecc_generate_keys(p, a, G)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -601,6 +1024,8 @@ def ecc_generate_keys_route():
 def ecc_shared_secret_route():
     data = request.json
     try:
+        if data.get('curve'):
+            return jsonify(ecc_shared_secret_named(data.get('curve'), data.get('private_d'), data.get('public_Q'), data.get('method', 'ladder')))
         private_d = int(data.get('private_d'))
         public_Q = data.get('public_Q')
         p = int(data.get('p'))
@@ -608,6 +1033,8 @@ def ecc_shared_secret_route():
         
         result = ecc_shared_secret(private_d, public_Q, p, a)
         return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -619,8 +1046,94 @@ def ecc_get_points_route():
         a = int(data.get('a'))
         b = int(data.get('b'))
         
+        if data.get('limit') is not None:
+            # Paged: {"points", "total", "offset", "next_offset"}
+            return jsonify(get_curve_points(p, a, b, int(data.get('offset', 0)), int(data.get('limit'))))
         points = get_curve_points(p, a, b)
         return jsonify({"points": points})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ECDSA on the standard curves: d, r, s and point coordinates as hex strings
+@app.route('/ecdsa_generate_keys', methods=['POST'])
+def ecdsa_generate_keys_route():
+    data = request.get_json(silent=True) or {}
+    try:
+        curve = data.get('curve', 'P-256')
+        d, Q = ecdsa_keypair(curve)
+        return jsonify({"curve": curve, "d": format(d, 'x'), "Q": point_to_dict(Q)})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/ecdsa_sign', methods=['POST'])
+def ecdsa_sign_route():
+    data = request.json
+    message = data.get('message')
+    if message is None or not data.get('d'):
+        return jsonify({"error": "Missing message or private key"}), 400
+    try:
+        curve = data.get('curve', 'P-256')
+        r, s = ecdsa_sign(curve, int(str(data.get('d')), 16), message)
+        return jsonify({"curve": curve, "r": format(r, 'x'), "s": format(s, 'x')})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/ecdsa_verify', methods=['POST'])
+def ecdsa_verify_route():
+    data = request.json
+    message = data.get('message')
+    if message is None or not data.get('Q') or not data.get('r') or not data.get('s'):
+        return jsonify({"error": "Missing message, public key or signature"}), 400
+    try:
+        curve = data.get('curve', 'P-256')
+        valid = ecdsa_verify(curve, point_from_dict(data.get('Q')), message,
+                             int(str(data.get('r')), 16), int(str(data.get('s')), 16))
+        return jsonify({"curve": curve, "valid": valid})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/ecdsa_verify_batch', methods=['POST'])
+def ecdsa_verify_batch_route():
+    # {"curve", "signatures": [{"Q": {x, y}, "message", "r", "s"}, ...]}
+    data = request.json
+    signatures = data.get('signatures')
+    if not signatures:
+        return jsonify({"error": "Missing signatures"}), 400
+    try:
+        items = [{
+            "Q": point_from_dict(item['Q']),
+            "message": item['message'],
+            "r": int(str(item['r']), 16),
+            "s": int(str(item['s']), 16)
+        } for item in signatures]
+        results, stats = ecdsa_verify_batch(data.get('curve', 'P-256'), items)
+        return jsonify({"results": results, "stats": stats})
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/ecdsa_benchmark', methods=['POST'])
+def ecdsa_benchmark_route():
+    # With "dsa": true also DSA 3072/256 (FIPS 186-4 parameters, generated once and cached on disk)
+    data = request.get_json(silent=True) or {}
+    try:
+        rounds = min(max(int(data.get('rounds', 20)), 1), 200)
+        dsa_params = None
+        if data.get('dsa'):
+            params = get_dsa_parameters(3072, 256)
+            dsa_params = (params["p"], params["q"], params["g"])
+        return jsonify(ecdsa_benchmark(data.get('curve', 'P-256'), rounds, dsa_params))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -628,6 +1141,56 @@ def ecc_get_points_route():
 def rc4():
     return render_template('rc4.html')
 
+def _rc4_key(data):
+    if data.get('key_hex'):
+        return bytes.fromhex(data['key_hex'])
+    return data.get('key', '').encode('utf-8')
+
+@app.route('/rc4_crypt', methods=['POST'])
+def rc4_crypt_route():
+    # Encryption and decryption are the same XOR: text or data_hex in, hex out
+    data = request.json
+    try:
+        key = _rc4_key(data)
+        if not key:
+            return jsonify({"error": "Missing key"}), 400
+        if data.get('data_hex') is not None:
+            payload = bytes.fromhex(data['data_hex'])
+        else:
+            payload = data.get('text', '').encode('utf-8')
+        drop = int(data.get('drop', 0))
+        start = time.perf_counter()
+        output = rc4_crypt(payload, key, drop)
+        elapsed = time.perf_counter() - start
+        return jsonify({
+            "output_hex": output.hex(),
+            "output_text": output.decode('utf-8', errors='replace'),
+            "drop": drop,
+            "bytes": len(output),
+            "elapsed_ms": round(elapsed * 1000, 3)
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/rc4_trace', methods=['POST'])
+def rc4_trace_route():
+    # key_values: list of numbers (Mini-RC4 of the page), otherwise the bytes of key / key_hex
+    data = request.json
+    try:
+        key = [int(k) for k in data['key_values']] if data.get('key_values') else list(_rc4_key(data))
+        result = rc4_trace(key, int(data.get('length', 16)), int(data.get('n', 256)), int(data.get('drop', 0)))
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/rc4_cache', methods=['POST'])
+def rc4_cache_route():
+    return jsonify(rc4_cache_stats())
+
 @app.route('/integrations')
 def integrations():
     return render_template('integrations.html')
@@ -0,0 +1,286 @@
+# AES Core (AES-128/192/256) on 32-bit words with T-tables
+# SubBytes, ShiftRows and MixColumns of one round collapse into four table lookups per column.
+# aes_verbose keeps the step-by-step 4x4 matrix version for the visualizer.
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+# AES Constants
+SBOX = (
+    0x63, 0x7C, 0x77, 0x7B, 0xF2, 0x6B, 0x6F, 0xC5, 0x30, 0x01, 0x67, 0x2B, 0xFE, 0xD7, 0xAB, 0x76,
+    0xCA, 0x82, 0xC9, 0x7D, 0xFA, 0x59, 0x47, 0xF0, 0xAD, 0xD4, 0xA2, 0xAF, 0x9C, 0xA4, 0x72, 0xC0,
+    0xB7, 0xFD, 0x93, 0x26, 0x36, 0x3F, 0xF7, 0xCC, 0x34, 0xA5, 0xE5, 0xF1, 0x71, 0xD8, 0x31, 0x15,
+    0x04, 0xC7, 0x23, 0xC3, 0x18, 0x96, 0x05, 0x9A, 0x07, 0x12, 0x80, 0xE2, 0xEB, 0x27, 0xB2, 0x75,
+    0x09, 0x83, 0x2C, 0x1A, 0x1B, 0x6E, 0x5A, 0xA0, 0x52, 0x3B, 0xD6, 0xB3, 0x29, 0xE3, 0x2F, 0x84,
+    0x53, 0xD1, 0x00, 0xED, 0x20, 0xFC, 0xB1, 0x5B, 0x6A, 0xCB, 0xBE, 0x39, 0x4A, 0x4C, 0x58, 0xCF,
+    0xD0, 0xEF, 0xAA, 0xFB, 0x43, 0x4D, 0x33, 0x85, 0x45, 0xF9, 0x02, 0x7F, 0x50, 0x3C, 0x9F, 0xA8,
+    0x51, 0xA3, 0x40, 0x8F, 0x92, 0x9D, 0x38, 0xF5, 0xBC, 0xB6, 0xDA, 0x21, 0x10, 0xFF, 0xF3, 0xD2,
+    0xCD, 0x0C, 0x13, 0xEC, 0x5F, 0x97, 0x44, 0x17, 0xC4, 0xA7, 0x7E, 0x3D, 0x64, 0x5D, 0x19, 0x73,
+    0x60, 0x81, 0x4F, 0xDC, 0x22, 0x2A, 0x90, 0x88, 0x46, 0xEE, 0xB8, 0x14, 0xDE, 0x5E, 0x0B, 0xDB,
+    0xE0, 0x32, 0x3A, 0x0A, 0x49, 0x06, 0x24, 0x5C, 0xC2, 0xD3, 0xAC, 0x62, 0x91, 0x95, 0xE4, 0x79,
+    0xE7, 0xC8, 0x37, 0x6D, 0x8D, 0xD5, 0x4E, 0xA9, 0x6C, 0x56, 0xF4, 0xEA, 0x65, 0x7A, 0xAE, 0x08,
+    0xBA, 0x78, 0x25, 0x2E, 0x1C, 0xA6, 0xB4, 0xC6, 0xE8, 0xDD, 0x74, 0x1F, 0x4B, 0xBD, 0x8B, 0x8A,
+    0x70, 0x3E, 0xB5, 0x66, 0x48, 0x03, 0xF6, 0x0E, 0x61, 0x35, 0x57, 0xB9, 0x86, 0xC1, 0x1D, 0x9E,
+    0xE1, 0xF8, 0x98, 0x11, 0x69, 0xD9, 0x8E, 0x94, 0x9B, 0x1E, 0x87, 0xE9, 0xCE, 0x55, 0x28, 0xDF,
+    0x8C, 0xA1, 0x89, 0x0D, 0xBF, 0xE6, 0x42, 0x68, 0x41, 0x99, 0x2D, 0x0F, 0xB0, 0x54, 0xBB, 0x16,
+)
+
+RCON = (
+    0x00, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40,
+    0x80, 0x1B, 0x36, 0x6C, 0xD8, 0xAB, 0x4D, 0x9A,
+    0x2F, 0x5E, 0xBC, 0x63, 0xC6, 0x97, 0x35, 0x6A,
+    0xD4, 0xB3, 0x7D, 0xFA, 0xEF, 0xC5, 0x91, 0x39,
+)
+
+INV_SBOX = tuple(SBOX.index(i) for i in range(256))
+
+# Number of rounds per key length (bytes)
+ROUNDS = {16: 10, 24: 12, 32: 14}
+
+# --- GF(2^8) Arithmetic (only used to build the tables) ---
+
+def xtime(a):
+    a <<= 1
+    if a & 0x100:
+        a ^= 0x11B
+    return a
+
+def gmul(a, b):
+    p = 0
+    while b:
+        if b & 1:
+            p ^= a
+        a = xtime(a)
+        b >>= 1
+    return p
+
+def _ror8(word):
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
+
+def _rotations(table):
+    t1 = tuple(_ror8(w) for w in table)
+    t2 = tuple(_ror8(w) for w in t1)
+    t3 = tuple(_ror8(w) for w in t2)
+    return table, t1, t2, t3
+
+# --- T-Tables ---
+
+# Te0[x] = MixColumns column of S[x] in row 0: (2*S, S, S, 3*S)
+TE0, TE1, TE2, TE3 = _rotations(tuple(
+    (gmul(s, 2) << 24) | (s << 16) | (s << 8) | gmul(s, 3) for s in SBOX
+))
+
+# Td0[x] = InvMixColumns column of InvS[x] in row 0: (14*S', 9*S', 13*S', 11*S')
+TD0, TD1, TD2, TD3 = _rotations(tuple(
+    (gmul(s, 14) << 24) | (gmul(s, 9) << 16) | (gmul(s, 13) << 8) | gmul(s, 11) for s in INV_SBOX
+))
+
+# --- Key Schedule ---
+
+def _sub_word(w):
+    return (SBOX[w >> 24] << 24) | (SBOX[(w >> 16) & 0xFF] << 16) | (SBOX[(w >> 8) & 0xFF] << 8) | SBOX[w & 0xFF]
+
+def _inv_mix_word(w):
+    # InvMixColumns of a round-key word: Td(S[b]) cancels the inverse S-box inside Td
+    return (TD0[SBOX[w >> 24]] ^ TD1[SBOX[(w >> 16) & 0xFF]] ^
+            TD2[SBOX[(w >> 8) & 0xFF]] ^ TD3[SBOX[w & 0xFF]])
+
+def expand_key_words(key_bytes):
+    """FIPS-197 key expansion: 4 * (rounds + 1) words for a 16/24/32-byte key."""
+    nk = len(key_bytes) // 4
+    rounds = ROUNDS[len(key_bytes)]
+    w = list(struct.unpack(f'>{nk}I', key_bytes))
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = w[i - 1]
+        if i % nk == 0:
+            temp = _sub_word(((temp << 8) | (temp >> 24)) & 0xFFFFFFFF) ^ (RCON[i // nk] << 24)
+        elif nk > 6 and i % nk == 4:
+            temp = _sub_word(temp)
+        w.append(w[i - nk] ^ temp)
+    return w
+
+def aes_key_schedule(key_bytes):
+    """Encryption and decryption round keys for the T-table rounds.
+    Decryption uses the equivalent inverse cipher: reversed keys, InvMixColumns on the middle ones."""
+    if len(key_bytes) not in ROUNDS:
+        raise ValueError("La chiave AES deve essere di 16, 24 o 32 byte.")
+    rounds = ROUNDS[len(key_bytes)]
+    enc = expand_key_words(key_bytes)
+    dec = []
+    for r in range(rounds, -1, -1):
+        words = enc[4 * r: 4 * r + 4]
+        if 0 < r < rounds:
+            words = [_inv_mix_word(x) for x in words]
+        dec.extend(words)
+    return {"rounds": rounds, "enc": enc, "dec": dec}
+
+# --- Key Schedule Cache ---
+# LRU of expanded schedules keyed by the raw key bytes, shared by every AES entry point.
+# Evicted schedules are overwritten with zeros before being dropped; callers receive tuple
+# copies, so a wipe never reaches a schedule that is still in use.
+
+KEY_CACHE_SIZE = 128
+
+_key_cache = OrderedDict()
+_key_cache_lock = threading.Lock()
+_key_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_key_cache_maxsize = KEY_CACHE_SIZE
+
+def _zeroize(schedule):
+    for words in (schedule["enc"], schedule["dec"]):
+        for i in range(len(words)):
+            words[i] = 0
+
+def _frozen(schedule):
+    return {"rounds": schedule["rounds"], "enc": tuple(schedule["enc"]), "dec": tuple(schedule["dec"])}
+
+def get_key_schedule(key_bytes):
+    """Cached aes_key_schedule: repeated keys skip key expansion. Returns an immutable copy."""
+    key_bytes = bytes(key_bytes)
+    with _key_cache_lock:
+        schedule = _key_cache.get(key_bytes)
+        if schedule is not None:
+            _key_cache.move_to_end(key_bytes)
+            _key_cache_stats["hits"] += 1
+            return _frozen(schedule)
+        _key_cache_stats["misses"] += 1
+
+    schedule = aes_key_schedule(key_bytes)
+    result = _frozen(schedule)
+
+    with _key_cache_lock:
+        if _key_cache_maxsize > 0:
+            if key_bytes in _key_cache:
+                # Another thread expanded the same key meanwhile: keep its entry, wipe ours
+                _zeroize(schedule)
+                _key_cache.move_to_end(key_bytes)
+                return result
+            _key_cache[key_bytes] = schedule
+            while len(_key_cache) > _key_cache_maxsize:
+                _, evicted = _key_cache.popitem(last=False)
+                _zeroize(evicted)
+                _key_cache_stats["evictions"] += 1
+        else:
+            _zeroize(schedule)
+    return result
+
+def configure_key_cache(maxsize):
+    """Changes the cache size (0 disables caching), evicting the oldest entries if needed."""
+    global _key_cache_maxsize
+    if maxsize < 0:
+        raise ValueError("La dimensione della cache non può essere negativa.")
+    with _key_cache_lock:
+        _key_cache_maxsize = maxsize
+        while len(_key_cache) > maxsize:
+            _, evicted = _key_cache.popitem(last=False)
+            _zeroize(evicted)
+            _key_cache_stats["evictions"] += 1
+
+def clear_key_cache():
+    with _key_cache_lock:
+        while _key_cache:
+            _, evicted = _key_cache.popitem()
+            _zeroize(evicted)
+        for name in _key_cache_stats:
+            _key_cache_stats[name] = 0
+
+def key_cache_stats():
+    with _key_cache_lock:
+        return dict(_key_cache_stats, size=len(_key_cache), maxsize=_key_cache_maxsize)
+
+# --- Block Encryption / Decryption ---
+
+def aes_encrypt_block(block, schedule):
+    """Encrypts 16 bytes with an expanded schedule from aes_key_schedule."""
+    rk = schedule["enc"]
+    te0, te1, te2, te3 = TE0, TE1, TE2, TE3
+    s0, s1, s2, s3 = struct.unpack('>4I', block)
+    s0 ^= rk[0]
+    s1 ^= rk[1]
+    s2 ^= rk[2]
+    s3 ^= rk[3]
+    k = 4
+    for _ in range(schedule["rounds"] - 1):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[k],
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[k + 1],
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[k + 2],
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[k + 3],
+        )
+        k += 4
+    # Final round: no MixColumns
+    S = SBOX
+    return struct.pack(
+        '>4I',
+        ((S[s0 >> 24] << 24) | (S[(s1 >> 16) & 0xFF] << 16) | (S[(s2 >> 8) & 0xFF] << 8) | S[s3 & 0xFF]) ^ rk[k],
+        ((S[s1 >> 24] << 24) | (S[(s2 >> 16) & 0xFF] << 16) | (S[(s3 >> 8) & 0xFF] << 8) | S[s0 & 0xFF]) ^ rk[k + 1],
+        ((S[s2 >> 24] << 24) | (S[(s3 >> 16) & 0xFF] << 16) | (S[(s0 >> 8) & 0xFF] << 8) | S[s1 & 0xFF]) ^ rk[k + 2],
+        ((S[s3 >> 24] << 24) | (S[(s0 >> 16) & 0xFF] << 16) | (S[(s1 >> 8) & 0xFF] << 8) | S[s2 & 0xFF]) ^ rk[k + 3],
+    )
+
+def aes_decrypt_block(block, schedule):
+    """Decrypts 16 bytes with an expanded schedule from aes_key_schedule."""
+    rk = schedule["dec"]
+    td0, td1, td2, td3 = TD0, TD1, TD2, TD3
+    s0, s1, s2, s3 = struct.unpack('>4I', block)
+    s0 ^= rk[0]
+    s1 ^= rk[1]
+    s2 ^= rk[2]
+    s3 ^= rk[3]
+    k = 4
+    for _ in range(schedule["rounds"] - 1):
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ rk[k],
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ rk[k + 1],
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ rk[k + 2],
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ rk[k + 3],
+        )
+        k += 4
+    S = INV_SBOX
+    return struct.pack(
+        '>4I',
+        ((S[s0 >> 24] << 24) | (S[(s3 >> 16) & 0xFF] << 16) | (S[(s2 >> 8) & 0xFF] << 8) | S[s1 & 0xFF]) ^ rk[k],
+        ((S[s1 >> 24] << 24) | (S[(s0 >> 16) & 0xFF] << 16) | (S[(s3 >> 8) & 0xFF] << 8) | S[s2 & 0xFF]) ^ rk[k + 1],
+        ((S[s2 >> 24] << 24) | (S[(s1 >> 16) & 0xFF] << 16) | (S[(s0 >> 8) & 0xFF] << 8) | S[s3 & 0xFF]) ^ rk[k + 2],
+        ((S[s3 >> 24] << 24) | (S[(s2 >> 16) & 0xFF] << 16) | (S[(s1 >> 8) & 0xFF] << 8) | S[s0 & 0xFF]) ^ rk[k + 3],
+    )
+
+def aes_encrypt_ecb(data, schedule):
+    """Independent per-block encryption of already padded data."""
+    return b''.join(aes_encrypt_block(data[i:i + 16], schedule) for i in range(0, len(data), 16))
+
+# --- Benchmark ---
+
+def aes_benchmark(blocks=2000):
+    """Per-block time of the T-table core against the verbose matrix path (AES-128).
+    Key expansion is done once for both, so only the block function is measured."""
+    from logic.aes_verbose import encrypt_block_verbose, expand_key
+
+    key = bytes(range(16))
+    block = bytes(range(16, 32))
+    matrix_schedule = expand_key(int.from_bytes(key, 'big'))
+    schedule = aes_key_schedule(key)
+
+    start = time.perf_counter()
+    for _ in range(blocks):
+        encrypt_block_verbose(block, matrix_schedule)
+    verbose_us = (time.perf_counter() - start) / blocks * 1e6
+
+    start = time.perf_counter()
+    for _ in range(blocks):
+        aes_encrypt_block(block, schedule)
+    core_us = (time.perf_counter() - start) / blocks * 1e6
+
+    return {
+        "verbose_us_per_block": round(verbose_us, 2),
+        "core_us_per_block": round(core_us, 2),
+        "speedup": round(verbose_us / core_us, 1)
+    }
+
+if __name__ == '__main__':
+    result = aes_benchmark()
+    print(f"Verbose: {result['verbose_us_per_block']} us/block")
+    print(f"T-table: {result['core_us_per_block']} us/block")
+    print(f"Speedup: {result['speedup']}x")
@@ -0,0 +1,287 @@
+# AES Block Cipher Modes: ECB, CBC, CFB, OFB, CTR, GCM
+# Built on the T-table core and the shared key-schedule cache (aes_core).
+# CBC/CFB encryption and OFB are inherently serial; the CTR and GCM keystream
+# is independent per block, so large inputs are split across a process pool.
+
+import os
+import time
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from logic.aes_core import get_key_schedule, aes_encrypt_block, aes_decrypt_block
+
+BLOCK_SIZE = 16
+MODES = ('ECB', 'CBC', 'CFB', 'OFB', 'CTR', 'GCM')
+MASK128 = (1 << 128) - 1
+MASK32 = 0xFFFFFFFF
+
+# Inputs at least this big (bytes) get their CTR/GCM keystream from the process pool
+PARALLEL_THRESHOLD = 256 * 1024
+PARALLEL_WORKERS = os.cpu_count() or 1
+
+_pool = None
+
+def configure_parallel(threshold=None, workers=None):
+    """Changes the size threshold and/or worker count of the keystream pool."""
+    global PARALLEL_THRESHOLD, PARALLEL_WORKERS, _pool
+    if threshold is not None:
+        PARALLEL_THRESHOLD = threshold
+    if workers is not None and workers != PARALLEL_WORKERS:
+        PARALLEL_WORKERS = workers
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS)
+    return _pool
+
+# --- Helpers ---
+
+def pkcs7_pad(data):
+    padding_len = BLOCK_SIZE - (len(data) % BLOCK_SIZE)
+    return data + bytes([padding_len] * padding_len)
+
+def pkcs7_unpad(data):
+    if not data or len(data) % BLOCK_SIZE:
+        raise ValueError("Lunghezza del testo cifrato non multipla di 16 byte.")
+    padding_len = data[-1]
+    if not 1 <= padding_len <= BLOCK_SIZE or data[-padding_len:] != bytes([padding_len] * padding_len):
+        raise ValueError("Padding PKCS#7 non valido.")
+    return data[:-padding_len]
+
+def xor_bytes(a, b):
+    """XOR of a with the first len(a) bytes of b, as one big-int operation."""
+    n = len(a)
+    if n == 0:
+        return b''
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b[:n], 'big')).to_bytes(n, 'big')
+
+def _blocks(data):
+    return [data[i:i + BLOCK_SIZE] for i in range(0, len(data), BLOCK_SIZE)]
+
+# --- Counter Keystream (serial or parallel) ---
+
+def _next_counter(counter, inc32):
+    if inc32:
+        # GCM increments only the low 32 bits
+        return (counter & ~MASK32) | ((counter + 1) & MASK32)
+    return (counter + 1) & MASK128
+
+def _keystream_range(key_bytes, counter, nblocks, inc32):
+    """E(counter), E(counter+1), ... for nblocks blocks."""
+    schedule = get_key_schedule(key_bytes)
+    out = []
+    for _ in range(nblocks):
+        out.append(aes_encrypt_block(counter.to_bytes(BLOCK_SIZE, 'big'), schedule))
+        counter = _next_counter(counter, inc32)
+    return b''.join(out)
+
+def _advance_counter(counter, n, inc32):
+    if inc32:
+        return (counter & ~MASK32) | ((counter + n) & MASK32)
+    return (counter + n) & MASK128
+
+def counter_keystream(key_bytes, counter, nbytes, parallel=None):
+    """Keystream of nbytes starting at the counter block. Returns (keystream, used_pool)."""
+    return _counter_keystream(key_bytes, counter, nbytes, False, parallel)
+
+def _counter_keystream(key_bytes, counter, nbytes, inc32, parallel=None):
+    nblocks = -(-nbytes // BLOCK_SIZE)
+    if parallel is None:
+        parallel = nbytes >= PARALLEL_THRESHOLD and PARALLEL_WORKERS > 1
+    if not parallel or nblocks < 2:
+        return _keystream_range(key_bytes, counter, nblocks, inc32), False
+
+    # Contiguous counter ranges, a few per worker to even out the load
+    parts = min(nblocks, PARALLEL_WORKERS * 4)
+    per_part = -(-nblocks // parts)
+    starts, counts = [], []
+    offset = 0
+    while offset < nblocks:
+        count = min(per_part, nblocks - offset)
+        starts.append(_advance_counter(counter, offset, inc32))
+        counts.append(count)
+        offset += count
+    n = len(starts)
+    chunks = _get_pool().map(_keystream_range, [key_bytes] * n, starts, counts, [inc32] * n)
+    return b''.join(chunks), True
+
+# --- GHASH (GF(2^128) with 8-bit tables) ---
+
+_R = 0xE1 << 120
+
+@lru_cache(maxsize=32)
+def _ghash_tables(h):
+    """T[j][b] = (byte b at position j) * H, so X * H is 16 lookups."""
+    # basis[i] = H * x^i in GCM bit order (x^i is bit i counted from the MSB)
+    basis = []
+    v = h
+    for _ in range(128):
+        basis.append(v)
+        v = (v >> 1) ^ _R if v & 1 else v >> 1
+    tables = []
+    for j in range(16):
+        row = [0] * 256
+        for b in range(1, 256):
+            low = b & -b
+            bit = 7 - (low.bit_length() - 1)
+            row[b] = row[b ^ low] ^ basis[8 * j + bit]
+        tables.append(tuple(row))
+    return tuple(tables)
+
+def ghash(h, aad, ciphertext):
+    tables = _ghash_tables(h)
+    y = 0
+    for data in (aad, ciphertext):
+        for i in range(0, len(data), BLOCK_SIZE):
+            x = y ^ int.from_bytes(data[i:i + BLOCK_SIZE].ljust(BLOCK_SIZE, b'\0'), 'big')
+            y = 0
+            for j in range(16):
+                y ^= tables[j][(x >> (120 - 8 * j)) & 0xFF]
+    x = y ^ ((len(aad) * 8) << 64 | (len(ciphertext) * 8))
+    y = 0
+    for j in range(16):
+        y ^= tables[j][(x >> (120 - 8 * j)) & 0xFF]
+    return y
+
+def _gcm_j0(key_bytes, iv):
+    if len(iv) == 12:
+        return int.from_bytes(iv + b'\x00\x00\x00\x01', 'big')
+    h = int.from_bytes(aes_encrypt_block(bytes(BLOCK_SIZE), get_key_schedule(key_bytes)), 'big')
+    return ghash(h, b'', iv)
+
+def _gcm(key_bytes, iv, data, aad, parallel, decrypt=False):
+    schedule = get_key_schedule(key_bytes)
+    h = int.from_bytes(aes_encrypt_block(bytes(BLOCK_SIZE), schedule), 'big')
+    j0 = _gcm_j0(key_bytes, iv)
+    keystream, used_pool = _counter_keystream(key_bytes, _next_counter(j0, True), len(data), True, parallel)
+    out = xor_bytes(data, keystream)
+    ciphertext = data if decrypt else out
+    s = ghash(h, aad, ciphertext)
+    tag = int.from_bytes(aes_encrypt_block(j0.to_bytes(BLOCK_SIZE, 'big'), schedule), 'big') ^ s
+    return out, tag.to_bytes(BLOCK_SIZE, 'big'), used_pool
+
+# --- Public API ---
+
+def aes_mode_encrypt(data, key_bytes, mode='CBC', iv=None, aad=b'', parallel=None):
+    """Encrypts bytes with the given mode. iv is random when not given (12 bytes for GCM)."""
+    mode = mode.upper()
+    if mode not in MODES:
+        raise ValueError(f"Modalità non supportata: {mode}")
+    if iv is None and mode != 'ECB':
+        iv = secrets.token_bytes(12 if mode == 'GCM' else BLOCK_SIZE)
+    if mode not in ('ECB', 'GCM') and len(iv) != BLOCK_SIZE:
+        raise ValueError("L'IV deve essere di 16 byte.")
+
+    schedule = get_key_schedule(key_bytes)
+    tag = None
+    used_pool = False
+
+    if mode == 'ECB':
+        ciphertext = b''.join(aes_encrypt_block(b, schedule) for b in _blocks(pkcs7_pad(data)))
+    elif mode == 'CBC':
+        out = []
+        prev = iv
+        for b in _blocks(pkcs7_pad(data)):
+            prev = aes_encrypt_block(xor_bytes(b, prev), schedule)
+            out.append(prev)
+        ciphertext = b''.join(out)
+    elif mode == 'CFB':
+        out = []
+        prev = iv
+        for b in _blocks(data):
+            prev = xor_bytes(b, aes_encrypt_block(prev, schedule))
+            out.append(prev)
+        ciphertext = b''.join(out)
+    elif mode == 'OFB':
+        out = []
+        feedback = iv
+        for b in _blocks(data):
+            feedback = aes_encrypt_block(feedback, schedule)
+            out.append(xor_bytes(b, feedback))
+        ciphertext = b''.join(out)
+    elif mode == 'CTR':
+        keystream, used_pool = counter_keystream(key_bytes, int.from_bytes(iv, 'big'), len(data), parallel)
+        ciphertext = xor_bytes(data, keystream)
+    else:
+        ciphertext, tag, used_pool = _gcm(key_bytes, iv, data, aad, parallel)
+
+    return {
+        "mode": mode,
+        "iv": iv,
+        "ciphertext": ciphertext,
+        "tag": tag,
+        "parallel": used_pool
+    }
+
+def aes_mode_decrypt(data, key_bytes, mode='CBC', iv=None, aad=b'', tag=None, parallel=None):
+    mode = mode.upper()
+    if mode not in MODES:
+        raise ValueError(f"Modalità non supportata: {mode}")
+    if mode != 'ECB' and not iv:
+        raise ValueError(f"IV mancante per la modalità {mode}")
+    if mode in ('ECB', 'CBC') and (not data or len(data) % BLOCK_SIZE):
+        raise ValueError("Lunghezza del testo cifrato non multipla di 16 byte.")
+
+    schedule = get_key_schedule(key_bytes)
+    used_pool = False
+
+    if mode == 'ECB':
+        plaintext = pkcs7_unpad(b''.join(aes_decrypt_block(b, schedule) for b in _blocks(data)))
+    elif mode == 'CBC':
+        # Unlike CBC encryption, every block only needs the previous ciphertext block
+        prev_blocks = [iv] + _blocks(data)[:-1]
+        plaintext = pkcs7_unpad(b''.join(
+            xor_bytes(aes_decrypt_block(b, schedule), p) for b, p in zip(_blocks(data), prev_blocks)
+        ))
+    elif mode == 'CFB':
+        prev_blocks = [iv] + _blocks(data)[:-1]
+        plaintext = b''.join(xor_bytes(b, aes_encrypt_block(p, schedule)) for b, p in zip(_blocks(data), prev_blocks))
+    elif mode == 'OFB':
+        out = []
+        feedback = iv
+        for b in _blocks(data):
+            feedback = aes_encrypt_block(feedback, schedule)
+            out.append(xor_bytes(b, feedback))
+        plaintext = b''.join(out)
+    elif mode == 'CTR':
+        keystream, used_pool = counter_keystream(key_bytes, int.from_bytes(iv, 'big'), len(data), parallel)
+        plaintext = xor_bytes(data, keystream)
+    else:
+        if tag is None:
+            raise ValueError("Tag GCM mancante.")
+        plaintext, expected, used_pool = _gcm(key_bytes, iv, data, aad, parallel, decrypt=True)
+        if not secrets.compare_digest(expected, tag):
+            raise ValueError("Tag GCM non valido: messaggio o AAD alterati.")
+
+    return {
+        "mode": mode,
+        "plaintext": plaintext,
+        "parallel": used_pool
+    }
+
+# --- Benchmark ---
+
+def modes_benchmark(size=256 * 1024, modes=MODES, parallel=None):
+    """MB/s per mode on random data, to compare serial and parallelizable modes."""
+    data = secrets.token_bytes(size)
+    key_bytes = secrets.token_bytes(16)
+    results = {}
+    for mode in modes:
+        start = time.perf_counter()
+        result = aes_mode_encrypt(data, key_bytes, mode, parallel=parallel)
+        elapsed = time.perf_counter() - start
+        results[mode] = {
+            "mb_per_s": round(size / elapsed / 1e6, 3),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "parallel": result["parallel"]
+        }
+    return results
+
+if __name__ == '__main__':
+    for mode, r in modes_benchmark(1024 * 1024).items():
+        print(f"AES-{mode}: {r['mb_per_s']} MB/s{' (pool)' if r['parallel'] else ''}")
@@ -1,30 +1,9 @@
 
-# AES Constants
-s_box = (
-    0x63, 0x7C, 0x77, 0x7B, 0xF2, 0x6B, 0x6F, 0xC5, 0x30, 0x01, 0x67, 0x2B, 0xFE, 0xD7, 0xAB, 0x76,
-    0xCA, 0x82, 0xC9, 0x7D, 0xFA, 0x59, 0x47, 0xF0, 0xAD, 0xD4, 0xA2, 0xAF, 0x9C, 0xA4, 0x72, 0xC0,
-    0xB7, 0xFD, 0x93, 0x26, 0x36, 0x3F, 0xF7, 0xCC, 0x34, 0xA5, 0xE5, 0xF1, 0x71, 0xD8, 0x31, 0x15,
-    0x04, 0xC7, 0x23, 0xC3, 0x18, 0x96, 0x05, 0x9A, 0x07, 0x12, 0x80, 0xE2, 0xEB, 0x27, 0xB2, 0x75,
-    0x09, 0x83, 0x2C, 0x1A, 0x1B, 0x6E, 0x5A, 0xA0, 0x52, 0x3B, 0xD6, 0xB3, 0x29, 0xE3, 0x2F, 0x84,
-    0x53, 0xD1, 0x00, 0xED, 0x20, 0xFC, 0xB1, 0x5B, 0x6A, 0xCB, 0xBE, 0x39, 0x4A, 0x4C, 0x58, 0xCF,
-    0xD0, 0xEF, 0xAA, 0xFB, 0x43, 0x4D, 0x33, 0x85, 0x45, 0xF9, 0x02, 0x7F, 0x50, 0x3C, 0x9F, 0xA8,
-    0x51, 0xA3, 0x40, 0x8F, 0x92, 0x9D, 0x38, 0xF5, 0xBC, 0xB6, 0xDA, 0x21, 0x10, 0xFF, 0xF3, 0xD2,
-    0xCD, 0x0C, 0x13, 0xEC, 0x5F, 0x97, 0x44, 0x17, 0xC4, 0xA7, 0x7E, 0x3D, 0x64, 0x5D, 0x19, 0x73,
-    0x60, 0x81, 0x4F, 0xDC, 0x22, 0x2A, 0x90, 0x88, 0x46, 0xEE, 0xB8, 0x14, 0xDE, 0x5E, 0x0B, 0xDB,
-    0xE0, 0x32, 0x3A, 0x0A, 0x49, 0x06, 0x24, 0x5C, 0xC2, 0xD3, 0xAC, 0x62, 0x91, 0x95, 0xE4, 0x79,
-    0xE7, 0xC8, 0x37, 0x6D, 0x8D, 0xD5, 0x4E, 0xA9, 0x6C, 0x56, 0xF4, 0xEA, 0x65, 0x7A, 0xAE, 0x08,
-    0xBA, 0x78, 0x25, 0x2E, 0x1C, 0xA6, 0xB4, 0xC6, 0xE8, 0xDD, 0x74, 0x1F, 0x4B, 0xBD, 0x8B, 0x8A,
-    0x70, 0x3E, 0xB5, 0x66, 0x48, 0x03, 0xF6, 0x0E, 0x61, 0x35, 0x57, 0xB9, 0x86, 0xC1, 0x1D, 0x9E,
-    0xE1, 0xF8, 0x98, 0x11, 0x69, 0xD9, 0x8E, 0x94, 0x9B, 0x1E, 0x87, 0xE9, 0xCE, 0x55, 0x28, 0xDF,
-    0x8C, 0xA1, 0x89, 0x0D, 0xBF, 0xE6, 0x42, 0x68, 0x41, 0x99, 0x2D, 0x0F, 0xB0, 0x54, 0xBB, 0x16,
-)
+import secrets
+import threading
+from collections import OrderedDict
 
-r_con = (
-    0x00, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40,
-    0x80, 0x1B, 0x36, 0x6C, 0xD8, 0xAB, 0x4D, 0x9A,
-    0x2F, 0x5E, 0xBC, 0x63, 0xC6, 0x97, 0x35, 0x6A,
-    0xD4, 0xB3, 0x7D, 0xFA, 0xEF, 0xC5, 0x91, 0x39,
-)
+from logic.aes_core import SBOX as s_box, RCON as r_con, xtime, get_key_schedule, aes_encrypt_ecb
 
 def text2matrix(text):
     matrix = []
@@ -53,34 +32,26 @@ def sub_bytes(s):
             s[i][j] = s_box[s[i][j]]
 
 def shift_rows(s):
-    s[0][1], s[1][1], s[2][1], s[3][1] = s[1][1], s[2][1], s[3][1], s[0][1]
-    s[0][2], s[1][2], s[2][2], s[3][2] = s[2][2], s[3][2], s[0][2], s[1][2]
-    s[0][3], s[1][3], s[2][3], s[3][3] = s[3][3], s[0][3], s[1][3], s[2][3]
+    # State is s[row][col]: row r rotates left by r positions
+    s[1][0], s[1][1], s[1][2], s[1][3] = s[1][1], s[1][2], s[1][3], s[1][0]
+    s[2][0], s[2][1], s[2][2], s[2][3] = s[2][2], s[2][3], s[2][0], s[2][1]
+    s[3][0], s[3][1], s[3][2], s[3][3] = s[3][3], s[3][0], s[3][1], s[3][2]
 
 def mix_single_column(a):
-    # Galois Field (2^8) Multiplication of two Bytes
-    def gmul(a, b):
-        p = 0
-        for i in range(8):
-            if b & 1:
-                p ^= a
-            hi_bit_set = a & 0x80
-            a <<= 1
-            if hi_bit_set:
-                a ^= 0x1B
-            b >>= 1
-        return p & 0xFF
-
+    # Galois Field (2^8) multiplication by 2 is xtime (shared with aes_core)
     t = a[0] ^ a[1] ^ a[2] ^ a[3]
     u = a[0]
-    a[0] ^= t ^ gmul(a[0] ^ a[1], 2)
-    a[1] ^= t ^ gmul(a[1] ^ a[2], 2)
-    a[2] ^= t ^ gmul(a[2] ^ a[3], 2)
-    a[3] ^= t ^ gmul(a[3] ^ u, 2)
+    a[0] ^= t ^ xtime(a[0] ^ a[1])
+    a[1] ^= t ^ xtime(a[1] ^ a[2])
+    a[2] ^= t ^ xtime(a[2] ^ a[3])
+    a[3] ^= t ^ xtime(a[3] ^ u)
 
 def mix_columns(s):
-    for i in range(4):
-        mix_single_column(s[i])
+    for c in range(4):
+        col = [s[r][c] for r in range(4)]
+        mix_single_column(col)
+        for r in range(4):
+            s[r][c] = col[r]
 
 def add_round_key(s, k):
     for i in range(4):
@@ -106,6 +77,10 @@ def expand_key(master_key):
         key_columns.append(new_word)
     return key_columns
 
+def words_to_columns(words):
+    # Same layout as expand_key (one [b0, b1, b2, b3] list per word), from the cached schedule
+    return [[(w >> 24) & 0xFF, (w >> 16) & 0xFF, (w >> 8) & 0xFF, w & 0xFF] for w in words]
+
 def bytes_to_matrix(text_bytes):
     # Takes 16 bytes and makes a 4x4 matrix (column-major order usually in AES papers, 
     # but here let's stick to standard convenient representation: row-major or matching key expansion)
@@ -207,52 +182,97 @@ def encrypt_block_verbose(block_bytes, key_schedule):
     
     return steps
 
-def aes_encrypt_verbose(plaintext_str, key_str):
-    # Prepare key
+def prepare_key(key_str):
     # Simple logic: pad or truncate key to 16 bytes
     key_bytes = key_str.encode('utf-8')
     if len(key_bytes) > 16:
         key_bytes = key_bytes[:16]
     elif len(key_bytes) < 16:
         key_bytes = pad(key_bytes)[:16]
+    return key_bytes
+
+def aes_encrypt_verbose(plaintext_str, key_str, trace=True):
+    # Prepare key
+    key_bytes = prepare_key(key_str)
         
-    # Prepare plaintext (handle multiple blocks?)
-    # For demo, let's just do the first block or single block.
-    # The prompt says "inserendo i dati di ingresso testo... esegue tutti i passi"
-    # Usually visualized on one block.
+    # Prepare plaintext: all blocks, PKCS#7 padded
     input_bytes = plaintext_str.encode('utf-8')
-    # Pad to 16 bytes (or multiple)
     input_bytes = pad(input_bytes)
     
-    # Run key expansion
-    # We need master key as integer or handle bytes properly
-    # text2matrix takes int? No, the original helper was a bit weird.
-    # Let's rewrite expand_key to handle bytes directly more cleanly or adapt.
+    # Ciphertext always comes from the T-table core; the key schedule is cached per key
+    schedule = get_key_schedule(key_bytes)
+    ciphertext = aes_encrypt_ecb(input_bytes, schedule)
     
-    # Adapting expand_key input:
-    # Need to convert key_bytes to int per byte logic if we use that existing expand_key?
-    # Actually, `text2matrix` expects a large integer `text`.
-    # Let's just fix `expand_key` to take `key_bytes` directly.
-    
-    # Fix in expand_key call:
-    key_int = int.from_bytes(key_bytes, byteorder='big')
-    key_schedule = expand_key(key_int) 
-    
-    # Process blocks
+    # The matrix version only runs when the step-by-step trace is requested
     all_blocks_steps = []
-    
-    # Just take first block for the visualizer? Or do all?
-    # User might input short text.
-    # Let's do all blocks.
-    
-    num_blocks = len(input_bytes) // 16
-    for i in range(num_blocks):
-        block = input_bytes[i*16 : (i+1)*16]
-        block_steps = encrypt_block_verbose(block, key_schedule)
-        all_blocks_steps.append(block_steps)
+    if trace:
+        key_schedule = words_to_columns(schedule["enc"])
+        
+        num_blocks = len(input_bytes) // 16
+        for i in range(num_blocks):
+            block = input_bytes[i*16 : (i+1)*16]
+            block_steps = encrypt_block_verbose(block, key_schedule)
+            all_blocks_steps.append(block_steps)
         
     return {
         "key_hex": key_bytes.hex(),
         "input_hex": input_bytes.hex(),
+        "ciphertext_hex": ciphertext.hex(),
         "blocks": all_blocks_steps
     }
+
+# --- Paged Trace ---
+# The ciphertext for all blocks is computed at once with the core; the step-by-step
+# matrices are produced later, only for the block range the page asks for.
+
+TRACE_SESSIONS = 64
+TRACE_PAGE_MAX = 8
+
+_trace_sessions = OrderedDict()
+_trace_lock = threading.Lock()
+
+def aes_encrypt_paged(plaintext_str, key_str):
+    key_bytes = prepare_key(key_str)
+    input_bytes = pad(plaintext_str.encode('utf-8'))
+    ciphertext = aes_encrypt_ecb(input_bytes, get_key_schedule(key_bytes))
+    
+    handle = secrets.token_hex(8)
+    with _trace_lock:
+        _trace_sessions[handle] = (key_bytes, input_bytes)
+        while len(_trace_sessions) > TRACE_SESSIONS:
+            _trace_sessions.popitem(last=False)
+    
+    return {
+        "handle": handle,
+        "key_hex": key_bytes.hex(),
+        "num_blocks": len(input_bytes) // 16,
+        "ciphertext_hex": ciphertext.hex()
+    }
+
+def aes_trace_page(handle, start=0, count=1):
+    with _trace_lock:
+        session = _trace_sessions.get(handle)
+        if session is not None:
+            _trace_sessions.move_to_end(handle)
+    if session is None:
+        raise KeyError("Sessione di trace scaduta o inesistente.")
+    
+    key_bytes, input_bytes = session
+    num_blocks = len(input_bytes) // 16
+    start = max(0, int(start))
+    end = min(num_blocks, start + max(0, min(int(count), TRACE_PAGE_MAX)))
+    
+    key_schedule = words_to_columns(get_key_schedule(key_bytes)["enc"])
+    blocks = []
+    for i in range(start, end):
+        blocks.append(encrypt_block_verbose(input_bytes[i*16 : (i+1)*16], key_schedule))
+    
+    return {
+        "handle": handle,
+        "key_hex": key_bytes.hex(),
+        "num_blocks": num_blocks,
+        "start": start,
+        "end": end,
+        "input_hex": input_bytes[start*16 : end*16].hex(),
+        "blocks": blocks
+    }
@@ -1,4 +1,6 @@
-def caesar_encrypt_verbose(text, shift):
+from logic.substitution_core import ALPHABET, clean_letters, shift_alphabet, substitute, step_window
+
+def caesar_encrypt_verbose(text, shift, step_start=0, step_count=None):
     if not text:
         return {"error": "Missing text"}
     
@@ -8,28 +10,27 @@ def caesar_encrypt_verbose(text, shift):
     except ValueError:
         return {"error": "Invalid shift value"}
 
-    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    alphabet = ALPHABET
     
     # Generate Cipher Alphabet
     # Slicing: [shift:] + [:shift]
-    cipher_alphabet = alphabet[shift_val:] + alphabet[:shift_val]
-    
-    matrix_map = {}
-    for i, char in enumerate(alphabet):
-        matrix_map[char] = cipher_alphabet[i]
+    cipher_alphabet = shift_alphabet(shift_val)
         
-    text_clean = "".join([c.upper() for c in text if c.isalpha()])
-    ciphertext = ""
+    # Whole text in one translate; steps only for the requested window
+    letters = clean_letters(text)
+    ciphertext = substitute(letters, cipher_alphabet).decode('ascii')
+    text_clean = letters.decode('ascii')
+    window = step_window(len(text_clean), step_start, step_count)
     steps = []
     
-    for i, p_char in enumerate(text_clean):
-        c_char = matrix_map[p_char]
+    for i in window:
+        p_char = text_clean[i]
+        c_char = ciphertext[i]
         
         # Calculate indices for detailed view
         p_idx = ord(p_char) - ord('A')
-        c_idx = (p_idx + shift_val) % 26 # or just find in cipher_alphabet
+        c_idx = (p_idx + shift_val) % 26
         
-        ciphertext += c_char
         steps.append({
             "index": i,
             "p_char": p_char,
@@ -45,5 +46,7 @@ def caesar_encrypt_verbose(text, shift):
         "std_alphabet": list(alphabet),
         "cipher_alphabet": list(cipher_alphabet),
         "ciphertext": ciphertext,
-        "steps": steps
+        "steps": steps,
+        "steps_start": window.start,
+        "total_letters": len(text_clean)
     }
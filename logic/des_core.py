@@ -0,0 +1,278 @@
+# DES Core on 64-bit integers
+# Same algorithm as des_verbose, but permutations and S-boxes are table lookups on ints
+# instead of operations on '0'/'1' strings. des_verbose builds its trace on top of this.
+
+from functools import lru_cache
+
+# --- Constants (Permutation Tables and S-Boxes) ---
+
+# Initial Permutation Table
+IP = [
+    58, 50, 42, 34, 26, 18, 10, 2,
+    60, 52, 44, 36, 28, 20, 12, 4,
+    62, 54, 46, 38, 30, 22, 14, 6,
+    64, 56, 48, 40, 32, 24, 16, 8,
+    57, 49, 41, 33, 25, 17, 9, 1,
+    59, 51, 43, 35, 27, 19, 11, 3,
+    61, 53, 45, 37, 29, 21, 13, 5,
+    63, 55, 47, 39, 31, 23, 15, 7
+]
+
+# Final Permutation Table (Inverse of IP)
+FP = [
+    40, 8, 48, 16, 56, 24, 64, 32,
+    39, 7, 47, 15, 55, 23, 63, 31,
+    38, 6, 46, 14, 54, 22, 62, 30,
+    37, 5, 45, 13, 53, 21, 61, 29,
+    36, 4, 44, 12, 52, 20, 60, 28,
+    35, 3, 43, 11, 51, 19, 59, 27,
+    34, 2, 42, 10, 50, 18, 58, 26,
+    33, 1, 41, 9, 49, 17, 57, 25
+]
+
+# Expansion Table (32 -> 48 bits)
+E = [
+    32, 1, 2, 3, 4, 5,
+    4, 5, 6, 7, 8, 9,
+    8, 9, 10, 11, 12, 13,
+    12, 13, 14, 15, 16, 17,
+    16, 17, 18, 19, 20, 21,
+    20, 21, 22, 23, 24, 25,
+    24, 25, 26, 27, 28, 29,
+    28, 29, 30, 31, 32, 1
+]
+
+# Permutation Table (32 -> 32 bits after S-Boxes)
+P = [
+    16, 7, 20, 21,
+    29, 12, 28, 17,
+    1, 15, 23, 26,
+    5, 18, 31, 10,
+    2, 8, 24, 14,
+    32, 27, 3, 9,
+    19, 13, 30, 6,
+    22, 11, 4, 25
+]
+
+# PC1 (Permuted Choice 1 for Key Schedule: 64 -> 56 bits)
+PC1 = [
+    57, 49, 41, 33, 25, 17, 9,
+    1, 58, 50, 42, 34, 26, 18,
+    10, 2, 59, 51, 43, 35, 27,
+    19, 11, 3, 60, 52, 44, 36,
+    63, 55, 47, 39, 31, 23, 15,
+    7, 62, 54, 46, 38, 30, 22,
+    14, 6, 61, 53, 45, 37, 29,
+    21, 13, 5, 28, 20, 12, 4
+]
+
+# PC2 (Permuted Choice 2 for Key Schedule: 56 -> 48 bits)
+PC2 = [
+    14, 17, 11, 24, 1, 5,
+    3, 28, 15, 6, 21, 10,
+    23, 19, 12, 4, 26, 8,
+    16, 7, 27, 20, 13, 2,
+    41, 52, 31, 37, 47, 55,
+    30, 40, 51, 45, 33, 48,
+    44, 49, 39, 56, 34, 53,
+    46, 42, 50, 36, 29, 32
+]
+
+# Key Shift Schedule
+SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+
+# S-Boxes (8 boxes, each maps 6 bits -> 4 bits)
+S_BOX = [
+    # S1
+    [
+        [14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7],
+        [0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8],
+        [4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0],
+        [15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13]
+    ],
+    # S2
+    [
+        [15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10],
+        [3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5],
+        [0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15],
+        [13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9]
+    ],
+    # S3
+    [
+        [10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8],
+        [13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1],
+        [13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7],
+        [1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12]
+    ],
+    # S4
+    [
+        [7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15],
+        [13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9],
+        [10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4],
+        [3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14]
+    ],
+    # S5
+    [
+        [2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9],
+        [14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6],
+        [4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14],
+        [11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3]
+    ],
+    # S6
+    [
+        [12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11],
+        [10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8],
+        [9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6],
+        [4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13]
+    ],
+    # S7
+    [
+        [4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1],
+        [13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6],
+        [1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2],
+        [6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12]
+    ],
+    # S8
+    [
+        [13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7],
+        [1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2],
+        [7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8],
+        [2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11]
+    ]
+]
+
+
+# --- Precomputed Tables ---
+
+def _build_byte_permutation(table, in_bits):
+    """For each input byte (position, value) precomputes its contribution to the permuted output."""
+    out_bits = len(table)
+    lookup = []
+    for byte_pos in range(in_bits // 8):
+        # (bit inside the byte, output shift) for every output bit coming from this byte
+        wiring = []
+        for out_idx, src in enumerate(table):
+            if (src - 1) // 8 == byte_pos:
+                wiring.append((7 - (src - 1) % 8, out_bits - 1 - out_idx))
+        row = []
+        for value in range(256):
+            out = 0
+            for in_shift, out_shift in wiring:
+                if (value >> in_shift) & 1:
+                    out |= 1 << out_shift
+            row.append(out)
+        lookup.append(tuple(row))
+    return tuple(lookup)
+
+def _apply_byte_permutation(lookup, value, in_bits):
+    out = 0
+    shift = in_bits - 8
+    for row in lookup:
+        out |= row[(value >> shift) & 0xFF]
+        shift -= 8
+    return out
+
+_IP_TABLE = _build_byte_permutation(IP, 64)
+_FP_TABLE = _build_byte_permutation(FP, 64)
+_PC1_TABLE = _build_byte_permutation(PC1, 64)
+_PC2_TABLE = _build_byte_permutation(PC2, 56)
+_P_TABLE = _build_byte_permutation(P, 32)
+
+# S-boxes indexed directly by the 6-bit input (row = outer bits, col = inner bits)
+S_FLAT = tuple(
+    tuple(S_BOX[j][((x >> 4) & 0x2) | (x & 0x1)][(x >> 1) & 0xF] for x in range(64))
+    for j in range(8)
+)
+
+# SP-boxes: S-box output already moved to its place and passed through P
+SP = tuple(
+    tuple(_apply_byte_permutation(_P_TABLE, S_FLAT[j][x] << (28 - 4 * j), 32) for x in range(64))
+    for j in range(8)
+)
+
+# --- Bit-level Primitives ---
+
+def initial_permutation(block):
+    t = _IP_TABLE
+    return (t[0][block >> 56] | t[1][(block >> 48) & 0xFF] | t[2][(block >> 40) & 0xFF] |
+            t[3][(block >> 32) & 0xFF] | t[4][(block >> 24) & 0xFF] | t[5][(block >> 16) & 0xFF] |
+            t[6][(block >> 8) & 0xFF] | t[7][block & 0xFF])
+
+def final_permutation(block):
+    t = _FP_TABLE
+    return (t[0][block >> 56] | t[1][(block >> 48) & 0xFF] | t[2][(block >> 40) & 0xFF] |
+            t[3][(block >> 32) & 0xFF] | t[4][(block >> 24) & 0xFF] | t[5][(block >> 16) & 0xFF] |
+            t[6][(block >> 8) & 0xFF] | t[7][block & 0xFF])
+
+def pc1(key):
+    """64-bit key -> 56 bits (C || D)."""
+    return _apply_byte_permutation(_PC1_TABLE, key, 64)
+
+def pc2(cd):
+    """56-bit C || D -> 48-bit round key."""
+    return _apply_byte_permutation(_PC2_TABLE, cd, 56)
+
+def permute_p(x):
+    return _apply_byte_permutation(_P_TABLE, x, 32)
+
+def rotate28(x, n):
+    """Circular left shift of a 28-bit half."""
+    return ((x << n) | (x >> (28 - n))) & 0xFFFFFFF
+
+def _wrap32(r):
+    # 34-bit value: bit 32 of R, then R, then bit 1 of R. The 6-bit E chunks are windows on it.
+    return ((r & 1) << 33) | (r << 1) | (r >> 31)
+
+def expand(r):
+    """Expansion E (32 -> 48 bits)."""
+    x = _wrap32(r)
+    out = 0
+    for j in range(8):
+        out = (out << 6) | ((x >> (28 - 4 * j)) & 0x3F)
+    return out
+
+def feistel(r, k):
+    """f(R, K) = P(S(E(R) ^ K)) using the SP-boxes."""
+    x = _wrap32(r)
+    return (SP[0][((x >> 28) ^ (k >> 42)) & 0x3F] | SP[1][((x >> 24) ^ (k >> 36)) & 0x3F] |
+            SP[2][((x >> 20) ^ (k >> 30)) & 0x3F] | SP[3][((x >> 16) ^ (k >> 24)) & 0x3F] |
+            SP[4][((x >> 12) ^ (k >> 18)) & 0x3F] | SP[5][((x >> 8) ^ (k >> 12)) & 0x3F] |
+            SP[6][((x >> 4) ^ (k >> 6)) & 0x3F] | SP[7][(x ^ k) & 0x3F])
+
+# --- Key Schedule ---
+
+@lru_cache(maxsize=256)
+def des_key_schedule(key):
+    """16 round keys (48-bit ints) for a 64-bit key."""
+    cd = pc1(key)
+    c = cd >> 28
+    d = cd & 0xFFFFFFF
+    subkeys = []
+    for shift in SHIFTS:
+        c = rotate28(c, shift)
+        d = rotate28(d, shift)
+        subkeys.append(pc2((c << 28) | d))
+    return tuple(subkeys)
+
+# --- Block Encryption ---
+
+def des_crypt_block(block, subkeys):
+    """One 64-bit block through IP, 16 Feistel rounds (with the given key order) and FP."""
+    block = initial_permutation(block)
+    l = block >> 32
+    r = block & 0xFFFFFFFF
+    sp0, sp1, sp2, sp3, sp4, sp5, sp6, sp7 = SP
+    for k in subkeys:
+        x = ((r & 1) << 33) | (r << 1) | (r >> 31)
+        l, r = r, l ^ (sp0[((x >> 28) ^ (k >> 42)) & 0x3F] | sp1[((x >> 24) ^ (k >> 36)) & 0x3F] |
+                       sp2[((x >> 20) ^ (k >> 30)) & 0x3F] | sp3[((x >> 16) ^ (k >> 24)) & 0x3F] |
+                       sp4[((x >> 12) ^ (k >> 18)) & 0x3F] | sp5[((x >> 8) ^ (k >> 12)) & 0x3F] |
+                       sp6[((x >> 4) ^ (k >> 6)) & 0x3F] | sp7[(x ^ k) & 0x3F])
+    # Pre-output is R16 L16
+    return final_permutation((r << 32) | l)
+
+def des_encrypt_block(block, key):
+    return des_crypt_block(block, des_key_schedule(key))
+
+def des_decrypt_block(block, key):
+    return des_crypt_block(block, des_key_schedule(key)[::-1])
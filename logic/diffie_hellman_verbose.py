@@ -1,95 +1,140 @@
 import random
+import secrets
 
-def is_prime(num):
-    if num < 2:
-        return False
-    for i in range(2, int(num ** 0.5) + 1):
-        if num % i == 0:
-            return False
-    return True
+from logic.number_theory import is_prime, random_safe_prime, prime_factors, find_generator, json_int, short_number
+from logic.fixed_base import fixed_base_pow
+from logic.dh_groups import get_group
 
-def generate_parameters():
-    # For demonstration, pick a small prime, e.g., 23
-    # In reality, this would be huge.
-    primes = [23, 47, 59, 83, 107, 167, 263, 359, 479, 599, 719, 839]
-    p = random.choice(primes)
-    
-    # Primitive root modulo p (a generator)
-    # Finding a generator: simplistic approach for small primes
-    g = 2
-    while True:
-        # Check if g is a primitive root
-        # Order of g must be p-1
-        powers = set()
-        for i in range(1, p):
-            powers.add(pow(g, i, p))
-        if len(powers) == p - 1:
-            break
-        g += 1
-        
+# Generated groups: safe primes p = 2q + 1 of this size range (bits). Larger sizes take
+# seconds to minutes to find in pure Python.
+DH_MIN_BITS = 32
+DH_MAX_BITS = 768
+
+def generate_parameters(bits=None):
+    if bits is None:
+        # For demonstration, pick a small prime, e.g., 23
+        # In reality, this would be huge.
+        primes = [23, 47, 59, 83, 107, 167, 263, 359, 479, 599, 719, 839]
+        p = random.choice(primes)
+    else:
+        if not DH_MIN_BITS <= bits <= DH_MAX_BITS:
+            raise ValueError(f"La dimensione di p deve essere tra {DH_MIN_BITS} e {DH_MAX_BITS} bit.")
+        # Safe prime: p - 1 = 2q, so the only factors to check are 2 and q
+        p = random_safe_prime(bits)
+
+    # Primitive root modulo p (a generator), cached per p
+    g = find_generator(p)
     return p, g
 
-def diffie_hellman_step1_setup(p=None, g=None):
-    if p is None or g is None:
-        p, g = generate_parameters()
-    
+def _named_group_setup(group):
+    p, q, g = group["p"], group["q"], group["g"]
     steps = []
     steps.append({
         "step": "1. Definizione Parametri Pubblici",
-        "description": f"Alice e Bob concordano di usare un numero primo <strong>p = {p}</strong> e una base (generatore) <strong>g = {g}</strong>.",
-        "math": f"p = {p}, g = {g}",
+        "description": f"Alice e Bob usano il gruppo standard <strong>{group['name']}</strong> ({group['rfc']}): un numero primo <strong>p</strong> di {p.bit_length()} bit e il generatore <strong>g = {g}</strong>.",
+        "math": f"p = {short_number(p)}, g = {g}",
+        "note": "Questi numeri non sono segreti: sono pubblicati nella RFC e tutti usano gli stessi."
+    })
+    steps.append({
+        "step": "1b. Struttura del Gruppo",
+        "description": f"p è un primo sicuro: p = 2q + 1 con q primo. Poiché p ≡ 7 (mod 8), 2 è un residuo quadratico, quindi g = 2 genera il sottogruppo di ordine primo q (metà degli elementi di Z_p*). Non serve generare né verificare nulla durante la richiesta.",
+        "math": f"q = (p - 1) / 2 = {short_number(q)}",
+        "note": f"Gli esponenti privati sono di {group['exponent_bits']} bit, la dimensione raccomandata dalla RFC per la sicurezza del gruppo."
+    })
+    return {
+        "p": json_int(p),
+        "g": g,
+        "bits": p.bit_length(),
+        "group": group["name"],
+        "exponent_bits": group["exponent_bits"],
+        "steps": steps
+    }
+
+def diffie_hellman_step1_setup(p=None, g=None, bits=None, group=None):
+    if group:
+        # Named RFC 3526 / RFC 7919 group: fixed parameters, nothing to generate
+        return _named_group_setup(get_group(group))
+    if p is None:
+        p, g = generate_parameters(bits)
+    elif g is None:
+        g = find_generator(p)
+    elif not is_prime(p):
+        raise ValueError("p deve essere primo.")
+
+    factors = prime_factors(p - 1)
+    # g^((p-1)/q) for every prime factor q: a caller-supplied g is checked with the same test
+    checks = [(q, pow(g, (p - 1) // q, p)) for q in factors]
+    failed = [q for q, v in checks if v == 1]
+    if not 1 < g < p or failed:
+        raise ValueError(f"g = {g} non è un generatore di Z_p* per p = {short_number(p)}"
+                         + (f": {g}^((p-1)/{short_number(failed[0])}) mod p = 1." if failed and 1 < g < p else "."))
+    steps = []
+    steps.append({
+        "step": "1. Definizione Parametri Pubblici",
+        "description": f"Alice e Bob concordano di usare un numero primo <strong>p = {short_number(p)}</strong> ({p.bit_length()} bit) e una base (generatore) <strong>g = {g}</strong>.",
+        "math": f"p = {short_number(p)}, g = {g}",
         "note": "Questi numeri non sono segreti. Chiunque può vederli."
     })
+    steps.append({
+        "step": "1b. Verifica del Generatore",
+        "description": "g genera tutto Z_p* se e solo se g^((p-1)/q) ≠ 1 per ogni fattore primo q di p - 1: bastano tante esponenziazioni quanti sono i fattori, invece di calcolare tutte le p - 1 potenze.",
+        "math": "<br>".join(
+            f"q = {short_number(q)}: {g}^((p-1)/q) mod p = {short_number(v)} {'=' if v == 1 else '≠'} 1" for q, v in checks
+        ),
+        "note": "Con un primo sicuro (p = 2q + 1, q primo) i fattori di p - 1 sono solo 2 e q." if len(factors) == 2 and factors[0] == 2 and 2 * factors[1] + 1 == p else ""
+    })
     
     return {
-        "p": p,
+        "p": json_int(p),
         "g": g,
+        "bits": p.bit_length(),
         "steps": steps
     }
 
-def diffie_hellman_step2_keys(p, g, private_a=None, private_b=None):
+def diffie_hellman_step2_keys(p, g, private_a=None, private_b=None, exponent_bits=None):
     # If privates not provided, generate random
+    # (exponent_bits: short exponents for the named groups)
     if private_a is None:
-        private_a = random.randint(2, p-2)
+        private_a = max(secrets.randbits(exponent_bits), 2) if exponent_bits else random.randint(2, p-2)
     if private_b is None:
-        private_b = random.randint(2, p-2)
+        private_b = max(secrets.randbits(exponent_bits), 2) if exponent_bits else random.randint(2, p-2)
         
     # Calculate Public Keys
     # A = g^a mod p
-    public_a = pow(g, private_a, p)
+    public_a = fixed_base_pow(g, private_a, p)
     
     # B = g^b mod p
-    public_b = pow(g, private_b, p)
+    public_b = fixed_base_pow(g, private_b, p)
     
     steps = []
     steps.append({
         "step": "2. Generazione Chiavi Private (Segrete)",
         "description": "Alice e Bob scelgono ciascuno un numero segreto casuale.",
-        "alice": f"Alice sceglie <strong>a = {private_a}</strong> (Segreto)",
-        "bob": f"Bob sceglie <strong>b = {private_b}</strong> (Segreto)",
+        "alice": f"Alice sceglie <strong>a = {short_number(private_a)}</strong> (Segreto)",
+        "bob": f"Bob sceglie <strong>b = {short_number(private_b)}</strong> (Segreto)",
         "note": "Questi valori NON vengono mai scambiati."
     })
     
     steps.append({
         "step": "3. Calcolo Chiavi Pubbliche",
         "description": "Ciascuno calcola la propria chiave pubblica usando g, p e la propria chiave privata.",
-        "math_alice": f"A = g^a mod p = {g}^{private_a} mod {p} = <strong>{public_a}</strong>",
-        "math_bob": f"B = g^b mod p = {g}^{private_b} mod {p} = <strong>{public_b}</strong>",
-        "result_alice": f"Chiave Pubblica Alice A = {public_a}",
-        "result_bob": f"Chiave Pubblica Bob B = {public_b}"
+        "math_alice": f"A = g^a mod p = {g}^{short_number(private_a)} mod {short_number(p)} = <strong>{short_number(public_a)}</strong>",
+        "math_bob": f"B = g^b mod p = {g}^{short_number(private_b)} mod {short_number(p)} = <strong>{short_number(public_b)}</strong>",
+        "result_alice": f"Chiave Pubblica Alice A = {short_number(public_a)}",
+        "result_bob": f"Chiave Pubblica Bob B = {short_number(public_b)}"
     })
     
     steps.append({
         "step": "4. Scambio Chiavi Pubbliche",
         "description": "Alice invia A a Bob. Bob invia B ad Alice. Ora il canale conosce A e B.",
-        "exchange": f"Alice --> A({public_a}) --> Bob<br>Bob --> B({public_b}) --> Alice"
+        "exchange": f"Alice --> A({short_number(public_a)}) --> Bob<br>Bob --> B({short_number(public_b)}) --> Alice"
     })
     
     return {
-        "private_a": private_a,
-        "private_b": private_b,
-        "public_a": public_a,
-        "public_b": public_b,
+        "private_a": json_int(private_a),
+        "private_b": json_int(private_b),
+        "public_a": json_int(public_a),
+        "public_b": json_int(public_b),
         "steps": steps
     }
 
@@ -105,15 +150,15 @@ def diffie_hellman_step3_secret(p, private_a, public_b, private_b, public_a):
     steps.append({
         "step": "5. Calcolo del Segreto Condiviso",
         "description": "Entrambi usano la chiave pubblica dell'altro e la propria chiave privata per calcolare lo stesso numero.",
-        "alice_calc": f"S = B^a mod p = {public_b}^{private_a} mod {p} = <strong>{secret_alice}</strong>",
-        "bob_calc": f"S = A^b mod p = {public_a}^{private_b} mod {p} = <strong>{secret_bob}</strong>",
+        "alice_calc": f"S = B^a mod p = {short_number(public_b)}^{short_number(private_a)} mod {short_number(p)} = <strong>{short_number(secret_alice)}</strong>",
+        "bob_calc": f"S = A^b mod p = {short_number(public_a)}^{short_number(private_b)} mod {short_number(p)} = <strong>{short_number(secret_bob)}</strong>",
         "result": "I due segreti coincidono!",
-        "note": f"Ora Alice e Bob condividono il segreto <strong>{secret_alice}</strong> che nessun altro può calcolare facilmente."
+        "note": f"Ora Alice e Bob condividono il segreto <strong>{short_number(secret_alice)}</strong> che nessun altro può calcolare facilmente."
     })
     
     return {
-        "secret_alice": secret_alice,
-        "secret_bob": secret_bob,
+        "secret_alice": json_int(secret_alice),
+        "secret_bob": json_int(secret_bob),
         "match": secret_alice == secret_bob,
         "steps": steps
     }
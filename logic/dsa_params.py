@@ -0,0 +1,141 @@
+# DSA Domain Parameters (FIPS 186-4)
+# p and q: probable primes from a SHA-256 seed (appendix A.1.1.2), so anyone holding the seed
+# and counter can check that p and q were not chosen with a hidden structure.
+# g: verifiable canonical generation (appendix A.2.3), g = Hash(seed || "ggen" || index || count)^((p-1)/q).
+# Generation takes seconds to tens of seconds at these sizes, so each (L, N) is generated once
+# and stored in a JSON file; parameters read back from disk are validated before use.
+
+import os
+import json
+import hashlib
+import secrets
+import threading
+
+from logic.number_theory import is_prime
+
+# (L, N) pairs allowed by FIPS 186-4 section 4.2
+DSA_SIZES = ((1024, 160), (2048, 224), (2048, 256), (3072, 256))
+
+# Random Miller-Rabin rounds on top of the 12 fixed bases of is_prime: at least the
+# 56 / 64 rounds of FIPS 186-4 table C.1 for p and q at every supported size
+PRIME_TEST_ROUNDS = 56
+
+GGEN_INDEX = 1
+
+DSA_PARAMS_CACHE = os.environ.get(
+    "DSA_PARAMS_CACHE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "dsa_params.json")
+)
+
+_params = {}
+_lock = threading.Lock()
+
+def _sha256_int(data):
+    return int.from_bytes(hashlib.sha256(data).digest(), 'big')
+
+def _check_size(L, N):
+    if (L, N) not in DSA_SIZES:
+        sizes = ", ".join(f"{l}/{n}" for l, n in DSA_SIZES)
+        raise ValueError(f"Dimensioni DSA non supportate: {L}/{N}. Ammesse: {sizes}")
+
+def generate_pq(L, N, seed=None):
+    """p, q, seed, counter per A.1.1.2 with SHA-256 (outlen 256, seedlen = N).
+    A given seed is only tried once: None if it does not yield a valid q and p."""
+    _check_size(L, N)
+    outlen = 256
+    n = -(-L // outlen) - 1
+    b = L - 1 - n * outlen
+    seedlen = N
+    while True:
+        domain_seed = seed if seed is not None else secrets.randbits(seedlen) | (1 << (seedlen - 1))
+        seed_bytes = domain_seed.to_bytes(seedlen // 8, 'big')
+        U = _sha256_int(seed_bytes) % (1 << (N - 1))
+        q = (1 << (N - 1)) + U + 1 - (U % 2)
+        if is_prime(q, PRIME_TEST_ROUNDS):
+            offset = 1
+            for counter in range(4 * L):
+                V = [_sha256_int(((domain_seed + offset + j) % (1 << seedlen)).to_bytes(seedlen // 8, 'big'))
+                     for j in range(n + 1)]
+                W = sum(v << (j * outlen) for j, v in enumerate(V[:-1])) + ((V[-1] % (1 << b)) << (n * outlen))
+                X = W + (1 << (L - 1))
+                p = X - (X % (2 * q) - 1)
+                offset += n + 1
+                if p < (1 << (L - 1)):
+                    continue
+                # is_prime does trial division first, and a composite fails at its first base
+                if is_prime(p, PRIME_TEST_ROUNDS):
+                    return p, q, domain_seed, counter
+        if seed is not None:
+            return None
+
+def generate_g(p, q, domain_seed, index=GGEN_INDEX):
+    """Verifiable canonical generator of the order-q subgroup (A.2.3)."""
+    e = (p - 1) // q
+    seed_bytes = domain_seed.to_bytes(-(-q.bit_length() // 8), 'big')
+    for count in range(1, 1 << 16):
+        W = _sha256_int(seed_bytes + b"ggen" + bytes([index]) + count.to_bytes(2, 'big'))
+        g = pow(W, e, p)
+        if g >= 2:
+            return g
+    raise ValueError("Nessun generatore trovato per questo seed.")
+
+def validate_parameters(p, q, g, rounds=PRIME_TEST_ROUNDS):
+    """Checks that q is an N-bit prime dividing p - 1, that p is prime and that g generates the order-q subgroup."""
+    L, N = p.bit_length(), q.bit_length()
+    _check_size(L, N)
+    if (p - 1) % q or not is_prime(q, rounds) or not is_prime(p, rounds):
+        raise ValueError("p e q non sono parametri DSA validi.")
+    if not 1 < g < p or pow(g, q, p) != 1:
+        raise ValueError("g non genera il sottogruppo di ordine q.")
+
+def _load_cache():
+    try:
+        with open(DSA_PARAMS_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(entries):
+    # Write to a temporary file and rename it: a concurrent reader never sees half a file
+    os.makedirs(os.path.dirname(DSA_PARAMS_CACHE), exist_ok=True)
+    tmp = f"{DSA_PARAMS_CACHE}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entries, f, indent=1)
+    os.replace(tmp, DSA_PARAMS_CACHE)
+
+def get_parameters(L=2048, N=256):
+    """Domain parameters for (L, N): from memory, then from the disk cache, then generated
+    (and saved). Returns a dict with p, q, g, seed (hex), counter and index."""
+    _check_size(L, N)
+    key = f"{L}/{N}"
+    with _lock:
+        if key in _params:
+            return _params[key]
+
+        entries = _load_cache()
+        entry = entries.get(key)
+        if entry is not None:
+            try:
+                params = {"p": int(entry["p"], 16), "q": int(entry["q"], 16), "g": int(entry["g"], 16),
+                          "seed": entry["seed"], "counter": entry["counter"], "index": entry["index"]}
+                if (params["p"].bit_length(), params["q"].bit_length()) != (L, N):
+                    raise ValueError(key)
+                # Our own file: the fixed bases of is_prime are enough to catch corruption
+                validate_parameters(params["p"], params["q"], params["g"], rounds=0)
+            except (KeyError, TypeError, ValueError):
+                # Corrupted or tampered entry: generate a new one
+                entry = None
+        if entry is None:
+            p, q, domain_seed, counter = generate_pq(L, N)
+            g = generate_g(p, q, domain_seed)
+            params = {"p": p, "q": q, "g": g, "seed": format(domain_seed, 'x'),
+                      "counter": counter, "index": GGEN_INDEX}
+            entries[key] = dict(params, p=format(p, 'x'), q=format(q, 'x'), g=format(g, 'x'))
+            try:
+                _save_cache(entries)
+            except OSError:
+                # Read-only directory: parameters still live in memory for this process
+                pass
+
+        _params[key] = params
+        return params
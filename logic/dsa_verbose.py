@@ -1,6 +1,13 @@
+import hmac
+import time
 import random
+import secrets
 import hashlib
 
+from logic.number_theory import is_prime, json_int, short_number
+from logic.fixed_base import MIN_MODULUS_BITS, fixed_base_pow, get_table, multi_table_pow
+from logic.dsa_params import get_parameters
+
 def mod_inverse(a, m):
     m0 = m
     y = 0
@@ -22,7 +29,24 @@ def mod_inverse(a, m):
         x = x + m0
     return x
 
-def dsa_setup_parameters():
+# Batch verification: from this many signatures on, building the tables for g and y (when not
+# cached yet) costs less than it saves; measured crossover about 7-8 at 2048 and 3072 bits
+MULTI_EXP_MIN_BATCH = 8
+
+def dsa_setup_parameters(L=None, N=None):
+    if L is not None:
+        # Real-size parameters (FIPS 186-4), generated once and cached on disk
+        params = get_parameters(L, N)
+        return {
+            "p": json_int(params["p"]),
+            "q": json_int(params["q"]),
+            "g": json_int(params["g"]),
+            "L": L,
+            "N": N,
+            "seed": params["seed"],
+            "counter": params["counter"]
+        }
+
     # Pre-calculated small primes for demonstration purposes
     # q must be a prime divisor of (p-1)
     # g must be of order q mod p, i.e., g^q mod p = 1
@@ -59,7 +83,7 @@ def dsa_setup_parameters():
     p = 0
     while True:
         p_candidate = k * q + 1
-        if all(p_candidate % i != 0 for i in range(2, int(p_candidate**0.5) + 1)):
+        if is_prime(p_candidate):
             p = p_candidate
             break
         k += 1
@@ -78,87 +102,118 @@ def dsa_setup_parameters():
 def dsa_generate_keys(p, q, g, private_key=None):
     if private_key is None:
         # x random in [1, q-1]
-        private_key = random.randint(1, q - 1)
+        private_key = secrets.randbelow(q - 1) + 1
         
     # y = g^x mod p
-    y = pow(g, private_key, p)
+    y = fixed_base_pow(g, private_key, p)
     
     steps = []
     steps.append({
         "step": "Generazione Chiavi",
         "description": f"Scegliamo un segreto x e calcoliamo la chiave pubblica y.",
-        "math_x": f"x = {private_key} (Privata, casuale < q)",
-        "math_y": f"y = g^x mod p = {g}^{private_key} mod {p} = <strong>{y}</strong> (Pubblica)"
+        "math_x": f"x = {short_number(private_key)} (Privata, casuale < q)",
+        "math_y": f"y = g^x mod p = {short_number(g)}^{short_number(private_key)} mod {short_number(p)} = <strong>{short_number(y)}</strong> (Pubblica)"
     })
     
     return {
-        "x": private_key,
-        "y": y,
-        "p": p, 
-        "q": q, 
-        "g": g,
+        "x": json_int(private_key),
+        "y": json_int(y),
+        "p": json_int(p), 
+        "q": json_int(q), 
+        "g": json_int(g),
         "steps": steps
     }
 
+def hash_message(message, q):
+    """SHA-256 of the message as an integer, keeping the leftmost min(N, 256) bits (FIPS 186-4)."""
+    digest = hashlib.sha256(message.encode()).digest()
+    hm = int.from_bytes(digest, 'big')
+    excess = len(digest) * 8 - q.bit_length()
+    return digest, (hm >> excess if excess > 0 else hm)
+
+def rfc6979_nonces(x, q, digest):
+    """Deterministic k values for (x, H(m)), RFC 6979 section 3.2 with HMAC-SHA256.
+    The first one is almost always used; the following ones only if r or s is 0."""
+    qlen = q.bit_length()
+    rlen = (qlen + 7) // 8
+
+    def bits2int(data):
+        v = int.from_bytes(data, 'big')
+        excess = len(data) * 8 - qlen
+        return v >> excess if excess > 0 else v
+
+    seed = x.to_bytes(rlen, 'big') + (bits2int(digest) % q).to_bytes(rlen, 'big')
+    V = b'\x01' * 32
+    K = b'\x00' * 32
+    K = hmac.new(K, V + b'\x00' + seed, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    K = hmac.new(K, V + b'\x01' + seed, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    while True:
+        T = b''
+        while len(T) < rlen:
+            V = hmac.new(K, V, hashlib.sha256).digest()
+            T += V
+        k = bits2int(T[:rlen])
+        if 1 <= k < q:
+            yield k
+        K = hmac.new(K, V + b'\x00', hashlib.sha256).digest()
+        V = hmac.new(K, V, hashlib.sha256).digest()
+
 def dsa_sign_verbose(message, p, q, g, x):
-    # 1. H(m)
-    # Simple hash: sum of ASCII or real SHA
-    # For visualization, simple hash number is better but let's use a truncated SHA-1/256 to fit q?
-    # To keep it visualizable, let's use a custom visual hash or small real hash
-    
-    # Using SHA-256 but represented as int mod q for valid arithmetic
-    hash_obj = hashlib.sha256(message.encode())
-    hash_hex = hash_obj.hexdigest()
-    hash_int = int(hash_hex, 16)
-    
-    # H(m) should be taken as integer
-    hm = hash_int
-    
-    # 2. Choose k
-    k = random.randint(1, q - 1)
-    
-    # 3. Calculate r = (g^k mod p) mod q
-    r = pow(g, k, p) % q
-    
-    # 4. Calculate s = (k^-1 * (H(m) + x*r)) mod q
-    k_inv = mod_inverse(k, q)
-    s = (k_inv * (hm + x * r)) % q
+    if not 0 < x < q:
+        raise ValueError("La chiave privata x deve essere compresa tra 1 e q - 1.")
+
+    # 1. H(m), truncated to the size of q
+    digest, hm = hash_message(message, q)
+    
+    # 2-4. Deterministic k (RFC 6979): same key and message give the same signature, and a
+    # zero r or s moves on to the next k instead of starting over
+    attempts = 0
+    for k in rfc6979_nonces(x, q, digest):
+        attempts += 1
+        # 3. Calculate r = (g^k mod p) mod q
+        r = fixed_base_pow(g, k, p) % q
+        if r == 0:
+            continue
+        # 4. Calculate s = (k^-1 * (H(m) + x*r)) mod q
+        k_inv = mod_inverse(k, q)
+        s = (k_inv * (hm + x * r)) % q
+        if s != 0:
+            break
     
     steps = []
     
     steps.append({
         "step": "1. Hashing del Messaggio",
-        "description": "Calcoliamo l'hash H(m) del messaggio e lo trattiamo come numero.",
-        "math": f"H('{message}') = ...{hash_hex[:6]}... -> int: {hm} (usato mod q)"
+        "description": "Calcoliamo l'hash H(m) del messaggio e ne teniamo i primi N bit (N = bit di q).",
+        "math": f"H('{message}') = ...{digest.hex()[:6]}... -> int: {short_number(hm)} ({q.bit_length()} bit)"
     })
     
     steps.append({
-        "step": "2. Scelta numero casuale k",
-        "description": "Scegliamo un numero segreto 'k' per questa firma.",
-        "math": f"k = {k} (1 < k < q)"
+        "step": "2. Scelta del numero k",
+        "description": "k è derivato in modo deterministico da x e H(m) con HMAC-SHA256 (RFC 6979): "
+                       "stessa chiave e stesso messaggio danno la stessa firma, senza dipendere dal generatore casuale.",
+        "math": f"k = {short_number(k)} (1 ≤ k < q" + (f", tentativo {attempts}" if attempts > 1 else "") + ")"
     })
     
     steps.append({
         "step": "3. Calcolo di r",
         "description": "r dipende dai parametri globali e da k.",
-        "math": f"r = (g^k mod p) mod q = ({g}^{k} mod {p}) mod {q} = <strong>{r}</strong>"
+        "math": f"r = (g^k mod p) mod q = ({short_number(g)}^{short_number(k)} mod {short_number(p)}) mod {short_number(q)} = <strong>{short_number(r)}</strong>"
     })
     
     steps.append({
         "step": "4. Calcolo di s",
         "description": "s lega il messaggio, la chiave privata x e r.",
-        "math": f"s = (k^(-1) * (H(m) + x*r)) mod q<br>s = ({k_inv} * ({hm} + {x}*{r})) mod {q} = <strong>{s}</strong>"
+        "math": f"s = (k^(-1) * (H(m) + x*r)) mod q<br>s = ({short_number(k_inv)} * ({short_number(hm)} + {short_number(x)}*{short_number(r)})) mod {short_number(q)} = <strong>{short_number(s)}</strong>"
     })
     
-    # If s=0 start over, technically required but rare with large q. With small q possible.
-    if r == 0 or s == 0:
-        return dsa_sign_verbose(message, p, q, g, x) # Retry
-    
     return {
-        "r": r,
-        "s": s,
-        "hm": hm,
-        "k": k, # exposed for teaching purposes
+        "r": json_int(r),
+        "s": json_int(s),
+        "hm": json_int(hm),
+        "k": json_int(k), # exposed for teaching purposes
         "steps": steps
     }
 
@@ -171,13 +226,12 @@ def dsa_verify_verbose(message, r, s, p, q, g, y):
         return {"valid": False, "steps": steps}
         
     # 2. Hash message
-    hash_obj = hashlib.sha256(message.encode())
-    hm = int(hash_obj.hexdigest(), 16)
+    _, hm = hash_message(message, q)
     
     steps.append({
         "step": "1. Hashing del Messaggio (Verifica)",
         "description": "Chi verifica calcola l'hash dello stesso messaggio.",
-        "math": f"H(m) = {hm}"
+        "math": f"H(m) = {short_number(hm)}"
     })
     
     # 3. w = s^-1 mod q
@@ -186,7 +240,7 @@ def dsa_verify_verbose(message, r, s, p, q, g, y):
     steps.append({
         "step": "2. Calcolo Chiave Ausiliaria w",
         "description": "Calcoliamo l'inverso di s modulo q.",
-        "math": f"w = s^(-1) mod q = {s}^(-1) mod {q} = <strong>{w}</strong>"
+        "math": f"w = s^(-1) mod q = {short_number(s)}^(-1) mod {short_number(q)} = <strong>{short_number(w)}</strong>"
     })
     
     # 4. u1 = (H(m) * w) mod q
@@ -198,13 +252,13 @@ def dsa_verify_verbose(message, r, s, p, q, g, y):
     steps.append({
         "step": "3. Calcolo Componenti u1 e u2",
         "description": "Calcoliamo due valori intermedi.",
-        "math_u1": f"u1 = (H(m) * w) mod q = ({hm} * {w}) mod {q} = <strong>{u1}</strong>",
-        "math_u2": f"u2 = (r * w) mod q = ({r} * {w}) mod {q} = <strong>{u2}</strong>"
+        "math_u1": f"u1 = (H(m) * w) mod q = ({short_number(hm)} * {short_number(w)}) mod {short_number(q)} = <strong>{short_number(u1)}</strong>",
+        "math_u2": f"u2 = (r * w) mod q = ({short_number(r)} * {short_number(w)}) mod {short_number(q)} = <strong>{short_number(u2)}</strong>"
     })
     
     # 6. v = ((g^u1 * y^u2) mod p) mod q
-    val1 = pow(g, u1, p)
-    val2 = pow(y, u2, p)
+    val1 = fixed_base_pow(g, u1, p)
+    val2 = fixed_base_pow(y, u2, p)
     v = (val1 * val2) % p % q
     
     match = (v == r)
@@ -212,17 +266,69 @@ def dsa_verify_verbose(message, r, s, p, q, g, y):
     steps.append({
         "step": "4. Calcolo Finale v e Verifica",
         "description": "Calcoliamo v e controlliamo se è uguale a r.",
-        "math_v": f"v = ((g^u1 * y^u2) mod p) mod q<br>v = (({g}^{u1} * {y}^{u2}) mod {p}) mod {q} = <strong>{v}</strong>",
+        "math_v": f"v = ((g^u1 * y^u2) mod p) mod q<br>v = (({short_number(g)}^{short_number(u1)} * {short_number(y)}^{short_number(u2)}) mod {short_number(p)}) mod {short_number(q)} = <strong>{short_number(v)}</strong>",
         "result": "v == r ?"
     })
     
     if match:
          steps.append({"step": "Risultato", "description": "L'uguaglianza è vera. La firma è <strong>VALIDA</strong>.", "valid": True})
     else:
-         steps.append({"step": "Risultato", "description": f"v ({v}) != r ({r}). La firma è <strong>NON VALIDA</strong>.", "valid": False})
+         steps.append({"step": "Risultato", "description": f"v ({short_number(v)}) != r ({short_number(r)}). La firma è <strong>NON VALIDA</strong>.", "valid": False})
     
     return {
         "valid": match,
-        "v": v,
+        "v": json_int(v),
         "steps": steps
     }
+
+def _batch_inverse(values, q):
+    """Inverses mod q of non-zero values with a single modular inversion (Montgomery's trick)."""
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % q
+    inv = pow(acc, -1, q)
+    out = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        out[i] = inv * prefix[i] % q
+        inv = inv * values[i] % q
+    return out
+
+def dsa_verify_batch(items, p, q, g, y):
+    """Verifies many (message, r, s) under the same (p, q, g, y).
+    The s^-1 are computed with one inversion; g^u1 * y^u2 comes from the fixed-base tables
+    of g and y in one pass (multi_table_pow). Returns (validity list in input order, stats)."""
+    results = [False] * len(items)
+    start = time.perf_counter()
+
+    pending = []
+    for i, (message, r, s) in enumerate(items):
+        r, s = int(r), int(s)
+        if 0 < r < q and 0 < s < q:
+            pending.append((i, hash_message(message, q)[1], r, s))
+    inverses = _batch_inverse([s for _, _, _, s in pending], q) if pending else []
+
+    multi_exp = len(pending) >= MULTI_EXP_MIN_BATCH and p.bit_length() >= MIN_MODULUS_BITS
+    if multi_exp:
+        g_rows = get_table(g, p, q.bit_length())
+        y_rows = get_table(y, p, q.bit_length())
+
+    for (i, hm, r, s), w in zip(pending, inverses):
+        u1 = hm * w % q
+        u2 = r * w % q
+        if multi_exp:
+            v = multi_table_pow(((g_rows, u1), (y_rows, u2)), p) % q
+        else:
+            v = fixed_base_pow(g, u1, p) * fixed_base_pow(y, u2, p) % p % q
+        results[i] = v == r
+    elapsed = time.perf_counter() - start
+
+    return results, {
+        "signatures": len(items),
+        "valid": sum(results),
+        "out_of_range": len(items) - len(pending),
+        "multi_exponentiation": multi_exp,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "per_second": round(len(items) / elapsed, 1) if elapsed else None
+    }
@@ -0,0 +1,247 @@
+# Elliptic Curve Core (short Weierstrass y^2 = x^3 + ax + b over GF(p))
+# Jacobian coordinates: (X, Y, Z) stands for the affine point (X/Z^2, Y/Z^3), so additions
+# and doublings need no modular inverse; one inverse converts the final result back.
+# Scalar multiplication: width-w NAF (default) or a Montgomery ladder with a fixed
+# sequence of operations per bit.
+
+import time
+import secrets
+
+CURVES = {
+    "P-256": {
+        "p": 0xFFFFFFFF00000001000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFF,
+        "a": -3,
+        "b": 0x5AC635D8AA3A93E7B3EBBD55769886BC651D06B0CC53B0F63BCE3C3E27D2604B,
+        "gx": 0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296,
+        "gy": 0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5,
+        "n": 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551,
+        "h": 1
+    },
+    "secp256k1": {
+        "p": 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F,
+        "a": 0,
+        "b": 7,
+        "gx": 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+        "gy": 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+        "n": 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
+        "h": 1
+    },
+}
+
+WNAF_WIDTH = 5
+
+class JacobianPoint:
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z=1):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def is_infinity(self):
+        return self.z == 0
+
+    def __repr__(self):
+        if self.z == 0:
+            return "O (Infinito)"
+        return f"[{self.x} : {self.y} : {self.z}]"
+
+INFINITY = JacobianPoint(1, 1, 0)
+
+def get_curve(name):
+    if name not in CURVES:
+        raise ValueError(f"Curva non supportata: {name}. Disponibili: {', '.join(CURVES)}")
+    return CURVES[name]
+
+# --- Point Arithmetic ---
+
+def jacobian_double(P, a, p):
+    if P.z == 0 or P.y == 0:
+        return INFINITY
+    x, y, z = P.x, P.y, P.z
+    yy = y * y % p
+    s = 4 * x * yy % p
+    zz = z * z % p
+    if a == -3:
+        # 3x^2 - 3z^4 = 3(x - z^2)(x + z^2)
+        m = 3 * (x - zz) * (x + zz) % p
+    else:
+        m = (3 * x * x + a * zz * zz) % p
+    x3 = (m * m - 2 * s) % p
+    y3 = (m * (s - x3) - 8 * yy * yy) % p
+    z3 = 2 * y * z % p
+    return JacobianPoint(x3, y3, z3)
+
+def jacobian_add(P, Q, a, p):
+    if P.z == 0:
+        return Q
+    if Q.z == 0:
+        return P
+    z1z1 = P.z * P.z % p
+    if Q.z == 1:
+        # Mixed addition: Q affine, saves the Z2 products
+        u1, s1 = P.x, P.y
+        u2 = Q.x * z1z1 % p
+        s2 = Q.y * P.z * z1z1 % p
+    else:
+        z2z2 = Q.z * Q.z % p
+        u1 = P.x * z2z2 % p
+        s1 = P.y * Q.z * z2z2 % p
+        u2 = Q.x * z1z1 % p
+        s2 = Q.y * P.z * z1z1 % p
+    h = (u2 - u1) % p
+    r = (s2 - s1) % p
+    if h == 0:
+        if r == 0:
+            return jacobian_double(P, a, p)
+        return INFINITY
+    hh = h * h % p
+    hhh = h * hh % p
+    v = u1 * hh % p
+    x3 = (r * r - hhh - 2 * v) % p
+    y3 = (r * (v - x3) - s1 * hhh) % p
+    z3 = h * P.z * Q.z % p
+    return JacobianPoint(x3, y3, z3)
+
+def jacobian_negate(P, p):
+    return JacobianPoint(P.x, (-P.y) % p, P.z)
+
+def to_affine(P, p):
+    """(x, y) or None for the point at infinity."""
+    if P.z == 0:
+        return None
+    z_inv = pow(P.z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return P.x * z_inv2 % p, P.y * z_inv2 * z_inv % p
+
+def is_on_curve(x, y, curve):
+    p = curve["p"]
+    return 0 <= x < p and 0 <= y < p and (y * y - (x * x * x + curve["a"] * x + curve["b"])) % p == 0
+
+# --- Scalar Multiplication ---
+
+def wnaf(k, w=WNAF_WIDTH):
+    """Width-w NAF digits of k, least significant first: non-zero digits are odd,
+    below 2^(w-1) in absolute value, and at least w - 1 zeros apart."""
+    digits = []
+    full = 1 << w
+    half = 1 << (w - 1)
+    while k:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+def _mul_wnaf(k, P, a, p, w=WNAF_WIDTH):
+    # Odd multiples P, 3P, ..., (2^(w-1) - 1)P
+    double_p = jacobian_double(P, a, p)
+    odd = [P]
+    for _ in range((1 << (w - 2)) - 1):
+        odd.append(jacobian_add(odd[-1], double_p, a, p))
+    neg = [jacobian_negate(Q, p) for Q in odd]
+
+    R = INFINITY
+    for d in reversed(wnaf(k, w)):
+        R = jacobian_double(R, a, p)
+        if d > 0:
+            R = jacobian_add(R, odd[d >> 1], a, p)
+        elif d < 0:
+            R = jacobian_add(R, neg[(-d) >> 1], a, p)
+    return R
+
+def _mul_ladder(k, P, a, p, bits):
+    """Montgomery ladder over a fixed number of bits: one addition and one doubling per bit
+    whatever its value. The operation sequence does not depend on k; Python integers are
+    still not constant-time, so this is a structural guarantee only."""
+    R0, R1 = INFINITY, P
+    for i in reversed(range(bits)):
+        if (k >> i) & 1:
+            R0 = jacobian_add(R0, R1, a, p)
+            R1 = jacobian_double(R1, a, p)
+        else:
+            R1 = jacobian_add(R0, R1, a, p)
+            R0 = jacobian_double(R0, a, p)
+    return R0
+
+def scalar_mult(k, point, curve, method='wnaf'):
+    """k * point with point = (x, y) affine; returns (x, y) or None (infinity)."""
+    a, p, n = curve["a"], curve["p"], curve["n"]
+    k %= n
+    if k == 0 or point is None:
+        return None
+    P = JacobianPoint(point[0], point[1], 1)
+    if method == 'wnaf':
+        R = _mul_wnaf(k, P, a, p)
+    elif method == 'ladder':
+        R = _mul_ladder(k, P, a, p, n.bit_length())
+    else:
+        raise ValueError(f"Metodo non supportato: {method}")
+    return to_affine(R, p)
+
+# --- Keys and ECDH ---
+
+def generate_keypair(curve_name, method='wnaf'):
+    curve = get_curve(curve_name)
+    d = secrets.randbelow(curve["n"] - 1) + 1
+    return d, scalar_mult(d, (curve["gx"], curve["gy"]), curve, method)
+
+def ecdh(curve_name, d, public_point, method='ladder'):
+    """Shared point d * Q. Q must be a valid point of the curve (invalid-curve attacks)."""
+    curve = get_curve(curve_name)
+    if public_point is None or not is_on_curve(public_point[0], public_point[1], curve):
+        raise ValueError("La chiave pubblica non è un punto della curva.")
+    shared = scalar_mult(d, public_point, curve, method)
+    if shared is None:
+        raise ValueError("Segreto condiviso nel punto all'infinito.")
+    return shared
+
+def point_to_dict(point):
+    if point is None:
+        return {"x": None, "y": None, "str": "O"}
+    x, y = point
+    return {"x": format(x, 'x'), "y": format(y, 'x'), "str": f"({x:#x}, {y:#x})"}
+
+def point_from_dict(data):
+    return int(str(data['x']), 16), int(str(data['y']), 16)
+
+# --- Benchmark ---
+
+def ecc_benchmark(curve_name='P-256', rounds=20):
+    """ms per scalar multiplication for each method, against the affine double-and-add."""
+    from logic.ecc_verbose import Point, point_add
+
+    curve = get_curve(curve_name)
+    G = (curve["gx"], curve["gy"])
+    scalars = [secrets.randbelow(curve["n"] - 1) + 1 for _ in range(rounds)]
+    results = {}
+    for method in ('wnaf', 'ladder'):
+        start = time.perf_counter()
+        for k in scalars:
+            scalar_mult(k, G, curve, method)
+        results[method] = round((time.perf_counter() - start) / rounds * 1000, 3)
+
+    def affine_mult(k):
+        result, base = Point(None, None), Point(*G)
+        while k:
+            if k & 1:
+                result, _ = point_add(result, base, curve["a"], curve["p"])
+            base, _ = point_add(base, base, curve["a"], curve["p"])
+            k >>= 1
+        return result
+
+    start = time.perf_counter()
+    for k in scalars[:5]:
+        affine_mult(k)
+    results["affine"] = round((time.perf_counter() - start) / 5 * 1000, 3)
+    return results
+
+if __name__ == '__main__':
+    for name in CURVES:
+        r = ecc_benchmark(name)
+        print(f"{name}: wNAF {r['wnaf']} ms, ladder {r['ladder']} ms, affine {r['affine']} ms")
@@ -1,4 +1,10 @@
 import random
+import time
+from array import array
+from functools import lru_cache
+
+from logic.number_theory import is_prime
+from logic.ecc_core import CURVES, get_curve, generate_keypair, ecdh, point_to_dict, point_from_dict
 
 # Simple Point class for better representation
 class Point:
@@ -50,16 +56,56 @@ def ecc_setup_parameters():
         "G": {"x": Gx, "y": Gy, "str": f"({Gx}, {Gy})"}
     }
 
-def get_curve_points(p, a, b):
-    points = []
-    # Brute force check for all x in 0..p-1
+# Curve points are enumerated in O(p): a table gives the smaller square root of every
+# quadratic residue (or -1), then each x needs one lookup. Point lists are cached per
+# (p, a, b) as two compact arrays and served in pages.
+POINTS_CACHE_SIZE = 4
+POINTS_MAX_P = 2_000_000
+POINTS_PAGE_MAX = 100_000
+
+@lru_cache(maxsize=POINTS_CACHE_SIZE)
+def _curve_points(p, a, b):
+    if p > POINTS_MAX_P:
+        raise ValueError(f"p troppo grande per elencare i punti (massimo {POINTS_MAX_P}).")
+    if not is_prime(p):
+        raise ValueError("p deve essere primo.")
+
+    # sqrt_table[r] = smaller y with y^2 = r (mod p), -1 if r is not a square
+    sqrt_table = array('l', [-1]) * p
+    for y in range(p // 2, -1, -1):
+        sqrt_table[y * y % p] = y
+
+    xs = array('l')
+    ys = array('l')
     for x in range(p):
-        rhs = (x**3 + a*x + b) % p
-        # Check if rhs is a quadratic residue (y^2 = rhs)
-        for y in range(p):
-            if (y**2) % p == rhs:
-                points.append({"x": x, "y": y})
-    return points
+        rhs = (x * x * x + a * x + b) % p
+        y = sqrt_table[rhs]
+        if y < 0:
+            continue
+        xs.append(x)
+        ys.append(y)
+        if y and p - y != y:
+            xs.append(x)
+            ys.append(p - y)
+    return xs, ys
+
+def get_curve_points(p, a, b, offset=0, limit=None):
+    """Points of y^2 = x^3 + ax + b over GF(p), ordered by x then y. Without limit the full
+    list is returned, as before; with limit, one page plus the total count."""
+    if offset < 0:
+        raise ValueError("offset non può essere negativo.")
+    if limit is not None and limit < 1:
+        raise ValueError("limit deve essere almeno 1.")
+    xs, ys = _curve_points(p, a % p, b % p)
+    if limit is None:
+        return [{"x": x, "y": y} for x, y in zip(xs, ys)]
+    end = min(offset + min(limit, POINTS_PAGE_MAX), len(xs))
+    return {
+        "points": [{"x": xs[i], "y": ys[i]} for i in range(offset, end)],
+        "total": len(xs),
+        "offset": offset,
+        "next_offset": end if end < len(xs) else None
+    }
     
 def point_add(P, Q, a, p):
     # Returns R = P + Q and a step description
@@ -177,3 +223,57 @@ def ecc_shared_secret(private_d, public_Q_dict, p, a):
         "shared_S": res['result'],
         "steps": res['steps']
     }
+
+# --- Standard Curves (P-256, secp256k1) ---
+# Real-size keys through the Jacobian core (ecc_core); coordinates and scalars travel as hex.
+
+def ecc_setup_named_curve(name):
+    curve = get_curve(name)
+    return {
+        "curve": name,
+        "p": format(curve["p"], 'x'),
+        "a": curve["a"],
+        "b": format(curve["b"], 'x'),
+        "n": format(curve["n"], 'x'),
+        "G": point_to_dict((curve["gx"], curve["gy"]))
+    }
+
+def ecc_generate_keys_named(name, method='wnaf'):
+    start = time.perf_counter()
+    d, Q = generate_keypair(name, method)
+    elapsed = (time.perf_counter() - start) * 1000
+    curve = CURVES[name]
+    return {
+        "curve": name,
+        "private_d": format(d, 'x'),
+        "public_Q": point_to_dict(Q),
+        "steps": [
+            {
+                "step": "Chiave Privata",
+                "description": f"d è un intero casuale in [1, n - 1], con n ordine di G ({curve['n'].bit_length()} bit)."
+            },
+            {
+                "step": "Chiave Pubblica Q = d * G",
+                "description": f"Moltiplicazione scalare in coordinate Jacobiane ({'wNAF' if method == 'wnaf' else 'scala di Montgomery'}): nessun inverso modulare fino alla conversione finale in coordinate affini. Tempo: {elapsed:.2f} ms."
+            }
+        ]
+    }
+
+def ecc_shared_secret_named(name, private_d, public_Q_dict, method='ladder'):
+    start = time.perf_counter()
+    S = ecdh(name, int(str(private_d), 16), point_from_dict(public_Q_dict), method)
+    elapsed = (time.perf_counter() - start) * 1000
+    return {
+        "curve": name,
+        "shared_S": point_to_dict(S),
+        "steps": [
+            {
+                "step": "Verifica della Chiave Pubblica",
+                "description": "Q deve soddisfare l'equazione della curva: un punto non valido permetterebbe attacchi a curva invalida."
+            },
+            {
+                "step": "Segreto S = d * Q",
+                "description": f"Calcolato con la {'scala di Montgomery (stessa sequenza di operazioni per ogni bit di d)' if method == 'ladder' else 'wNAF'} in {elapsed:.2f} ms."
+            }
+        ]
+    }
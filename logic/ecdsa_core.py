@@ -0,0 +1,228 @@
+# ECDSA on the Jacobian core (ecc_core)
+# Signing: k*G from a per-curve comb table (row i = j * 2^(6i) * G in affine form), so a
+# signature costs about 43 mixed additions and no doublings.
+# Verification: u1*G + u2*Q in one pass (Shamir's trick) with interleaved wNAF digits:
+# a single doubling chain, odd multiples of G cached per curve, odd multiples of Q per key.
+
+import time
+import hashlib
+import secrets
+from functools import lru_cache
+
+from logic.ecc_core import (CURVES, INFINITY, JacobianPoint, get_curve, wnaf, jacobian_add,
+                            jacobian_double, jacobian_negate, to_affine, is_on_curve)
+
+COMB_WIDTH = 6
+G_WNAF_WIDTH = 7
+Q_WNAF_WIDTH = 5
+
+def _batch_to_affine(points, p):
+    """Jacobian -> affine (z = 1) for many points with one inversion (Montgomery's trick)."""
+    prefix = []
+    acc = 1
+    for P in points:
+        prefix.append(acc)
+        acc = acc * P.z % p
+    inv = pow(acc, -1, p)
+    out = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        P = points[i]
+        z_inv = inv * prefix[i] % p
+        inv = inv * P.z % p
+        z_inv2 = z_inv * z_inv % p
+        out[i] = JacobianPoint(P.x * z_inv2 % p, P.y * z_inv2 * z_inv % p, 1)
+    return out
+
+def _odd_multiples(P, w, a, p):
+    """[P, 3P, ..., (2^(w-1) - 1)P] in affine form, and their negatives."""
+    double_p = jacobian_double(P, a, p)
+    odd = [P]
+    for _ in range((1 << (w - 2)) - 1):
+        odd.append(jacobian_add(odd[-1], double_p, a, p))
+    odd = _batch_to_affine(odd, p)
+    return odd, [jacobian_negate(Q, p) for Q in odd]
+
+@lru_cache(maxsize=None)
+def _generator_tables(curve_name):
+    """Comb rows for signing and odd multiples for verification, built once per curve."""
+    curve = get_curve(curve_name)
+    a, p = curve["a"], curve["p"]
+    G = JacobianPoint(curve["gx"], curve["gy"])
+
+    rows = []
+    base = G
+    for _ in range(-(-curve["n"].bit_length() // COMB_WIDTH)):
+        row = [base]
+        for _ in range((1 << COMB_WIDTH) - 2):
+            row.append(jacobian_add(row[-1], base, a, p))
+        next_base = jacobian_add(row[-1], base, a, p)
+        rows.append(row)
+        base = next_base
+    per_row = (1 << COMB_WIDTH) - 1
+    flat = _batch_to_affine([P for row in rows for P in row], p)
+    comb = tuple([None] + flat[i * per_row:(i + 1) * per_row] for i in range(len(rows)))
+
+    return comb, _odd_multiples(G, G_WNAF_WIDTH, a, p)
+
+def generator_mult(k, curve_name):
+    """k*G with the comb table, Jacobian result."""
+    curve = CURVES[curve_name]
+    comb, _ = _generator_tables(curve_name)
+    a, p = curve["a"], curve["p"]
+    mask = (1 << COMB_WIDTH) - 1
+    R = INFINITY
+    i = 0
+    while k:
+        digit = k & mask
+        if digit:
+            R = jacobian_add(R, comb[i][digit], a, p)
+        k >>= COMB_WIDTH
+        i += 1
+    return R
+
+def _public_tables(Q, curve):
+    return _odd_multiples(JacobianPoint(Q[0], Q[1]), Q_WNAF_WIDTH, curve["a"], curve["p"])
+
+def shamir_mult(u1, u2, q_tables, curve_name):
+    """u1*G + u2*Q in one doubling chain (interleaved wNAF)."""
+    curve = CURVES[curve_name]
+    a, p = curve["a"], curve["p"]
+    _, (g_odd, g_neg) = _generator_tables(curve_name)
+    q_odd, q_neg = q_tables
+    d1 = wnaf(u1, G_WNAF_WIDTH)
+    d2 = wnaf(u2, Q_WNAF_WIDTH)
+    length = max(len(d1), len(d2))
+    d1 += [0] * (length - len(d1))
+    d2 += [0] * (length - len(d2))
+
+    R = INFINITY
+    for i in range(length - 1, -1, -1):
+        R = jacobian_double(R, a, p)
+        x = d1[i]
+        if x > 0:
+            R = jacobian_add(R, g_odd[x >> 1], a, p)
+        elif x < 0:
+            R = jacobian_add(R, g_neg[(-x) >> 1], a, p)
+        y = d2[i]
+        if y > 0:
+            R = jacobian_add(R, q_odd[y >> 1], a, p)
+        elif y < 0:
+            R = jacobian_add(R, q_neg[(-y) >> 1], a, p)
+    return R
+
+# --- Sign / Verify ---
+
+def hash_to_int(message, n):
+    """SHA-256 of the message, truncated to the bit length of n (bits2int, FIPS 186-4)."""
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    digest = hashlib.sha256(message).digest()
+    e = int.from_bytes(digest, 'big')
+    excess = len(digest) * 8 - n.bit_length()
+    return e >> excess if excess > 0 else e
+
+def ecdsa_keypair(curve_name):
+    curve = get_curve(curve_name)
+    d = secrets.randbelow(curve["n"] - 1) + 1
+    return d, to_affine(generator_mult(d, curve_name), curve["p"])
+
+def ecdsa_sign(curve_name, d, message):
+    curve = get_curve(curve_name)
+    n, p = curve["n"], curve["p"]
+    e = hash_to_int(message, n)
+    while True:
+        k = secrets.randbelow(n - 1) + 1
+        x, _ = to_affine(generator_mult(k, curve_name), p)
+        r = x % n
+        if r == 0:
+            continue
+        s = pow(k, -1, n) * (e + r * d) % n
+        if s:
+            return r, s
+
+def ecdsa_verify(curve_name, Q, message, r, s, q_tables=None):
+    curve = get_curve(curve_name)
+    n = curve["n"]
+    if not (0 < r < n and 0 < s < n):
+        return False
+    if Q is None or not is_on_curve(Q[0], Q[1], curve):
+        return False
+    e = hash_to_int(message, n)
+    w = pow(s, -1, n)
+    R = shamir_mult(e * w % n, r * w % n, q_tables or _public_tables(Q, curve), curve_name)
+    point = to_affine(R, curve["p"])
+    return point is not None and point[0] % n == r
+
+def ecdsa_verify_batch(curve_name, items):
+    """items: dicts with Q (x, y), message, r, s. Q tables are built once per distinct key.
+    Returns (list of booleans, stats)."""
+    curve = get_curve(curve_name)
+    tables = {}
+    results = []
+    start = time.perf_counter()
+    for item in items:
+        Q = item["Q"]
+        if Q not in tables and Q is not None and is_on_curve(Q[0], Q[1], curve):
+            tables[Q] = _public_tables(Q, curve)
+        results.append(ecdsa_verify(curve_name, Q, item["message"], item["r"], item["s"], tables.get(Q)))
+    elapsed = time.perf_counter() - start
+    return results, {
+        "signatures": len(items),
+        "valid": sum(results),
+        "distinct_keys": len(tables),
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "per_second": round(len(items) / elapsed, 1) if elapsed else None
+    }
+
+# --- Benchmark ---
+
+def ecdsa_benchmark(curve_name='P-256', rounds=20, dsa_params=None):
+    """Signatures and verifications per second for ECDSA and, when dsa_params (p, q, g) is
+    given, for the DSA path of dsa_verbose. P-256 and secp256k1 match DSA with a
+    3072-bit p and 256-bit q (128-bit security, NIST SP 800-57)."""
+    _generator_tables(curve_name)
+    message = "benchmark"
+    d, Q = ecdsa_keypair(curve_name)
+
+    start = time.perf_counter()
+    signatures = [ecdsa_sign(curve_name, d, message) for _ in range(rounds)]
+    sign_time = time.perf_counter() - start
+    start = time.perf_counter()
+    if not all(ecdsa_verify(curve_name, Q, message, r, s) for r, s in signatures):
+        raise RuntimeError("Verifica ECDSA fallita.")
+    verify_time = time.perf_counter() - start
+
+    results = {"ecdsa": {
+        "curve": curve_name,
+        "sign_per_s": round(rounds / sign_time, 1),
+        "verify_per_s": round(rounds / verify_time, 1)
+    }}
+
+    if dsa_params:
+        from logic.dsa_verbose import dsa_generate_keys, dsa_sign_verbose, dsa_verify_verbose
+        p, q, g = dsa_params
+        keys = dsa_generate_keys(p, q, g)
+        x, y = int(keys["x"]), int(keys["y"])
+        start = time.perf_counter()
+        dsa_signatures = [dsa_sign_verbose(message, p, q, g, x) for _ in range(rounds)]
+        dsa_sign_time = time.perf_counter() - start
+        start = time.perf_counter()
+        if not all(dsa_verify_verbose(message, int(sig["r"]), int(sig["s"]), p, q, g, y)["valid"] for sig in dsa_signatures):
+            raise RuntimeError("Verifica DSA fallita.")
+        dsa_verify_time = time.perf_counter() - start
+        results["dsa"] = {
+            "p_bits": p.bit_length(),
+            "q_bits": q.bit_length(),
+            "sign_per_s": round(rounds / dsa_sign_time, 1),
+            "verify_per_s": round(rounds / dsa_verify_time, 1)
+        }
+    return results
+
+if __name__ == '__main__':
+    from logic.dsa_params import get_parameters
+    params = get_parameters(3072, 256)
+    dsa_params = (params["p"], params["q"], params["g"])
+    for name in CURVES:
+        r = ecdsa_benchmark(name, dsa_params=dsa_params)
+        print(f"ECDSA {name}: {r['ecdsa']['sign_per_s']} firme/s, {r['ecdsa']['verify_per_s']} verifiche/s")
+    print(f"DSA {r['dsa']['p_bits']}/{r['dsa']['q_bits']}: {r['dsa']['sign_per_s']} firme/s, {r['dsa']['verify_per_s']} verifiche/s")
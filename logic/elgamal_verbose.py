@@ -1,4 +1,8 @@
 import random
+import time
+import secrets
+
+from logic.fixed_base import fixed_base_pow
 
 def multiplicative_inverse(e, phi):
     d = 0
@@ -34,7 +38,7 @@ def generate_keys_elgamal(p, g, private_key=None):
         private_key = random.randint(2, p - 2)
         
     # Calculate Public Key component y = g^x mod p
-    y = pow(g, private_key, p)
+    y = fixed_base_pow(g, private_key, p)
     
     steps = []
     steps.append({
@@ -78,11 +82,11 @@ def elgamal_encrypt_verbose(message, p, g, y):
             k = random.randint(2, p - 2)
             
             # Calculate a = g^k mod p
-            a = pow(g, k, p)
+            a = fixed_base_pow(g, k, p)
             
             # Calculate b = (y^k * m) mod p
             # First s = y^k mod p (Shared secret part)
-            s = pow(y, k, p)
+            s = fixed_base_pow(y, k, p)
             b = (s * m) % p
             
             ciphertext.append({'a': a, 'b': b})
@@ -148,3 +152,68 @@ def elgamal_decrypt_verbose(ciphertext_list, p, x):
         }
     except Exception as e:
         return {"error": str(e)}
+
+# --- Packed Mode ---
+# Message bytes are packed into integers as large as p allows, so every block costs one
+# random k and two modular exponentiations instead of one pair per character.
+# A leading 0x01 byte keeps leading zero bytes of the block.
+
+def elgamal_block_size(p):
+    size = (p.bit_length() - 1) // 8 - 1
+    if size < 1:
+        raise ValueError("p troppo piccolo per la modalità a blocchi: servono almeno 17 bit.")
+    return size
+
+def elgamal_encrypt_packed(data, p, g, y):
+    """Encrypts bytes block by block. Returns (a, b) pairs as hex and throughput stats."""
+    size = elgamal_block_size(p)
+
+    start = time.perf_counter()
+    ciphertext = []
+    for i in range(0, len(data), size):
+        m = int.from_bytes(b'\x01' + data[i:i + size], 'big')
+        k = secrets.randbelow(p - 3) + 2
+        a = fixed_base_pow(g, k, p)
+        b = fixed_base_pow(y, k, p) * m % p
+        ciphertext.append({'a': format(a, 'x'), 'b': format(b, 'x')})
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "packed",
+        "ciphertext": ciphertext,
+        "block_size": size,
+        "stats": {
+            "bytes": len(data),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "kb_per_s": round(len(data) / elapsed / 1024, 3) if elapsed else None,
+            "modexp": 2 * len(ciphertext),
+            "modexp_per_char_mode": 2 * len(data)
+        }
+    }
+
+def elgamal_decrypt_packed(ciphertext_list, p, x):
+    start = time.perf_counter()
+    out = []
+    for pair in ciphertext_list:
+        a = int(pair['a'], 16)
+        b = int(pair['b'], 16)
+        # s^-1 = a^(p-1-x) mod p: one exponentiation, no separate inverse
+        m = b * pow(a, p - 1 - x, p) % p
+        block = m.to_bytes((m.bit_length() + 7) // 8, 'big')
+        if not block or block[0] != 1:
+            raise ValueError("Blocco cifrato non valido.")
+        out.append(block[1:])
+    plaintext = b''.join(out)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "packed",
+        "plaintext": plaintext,
+        "stats": {
+            "bytes": len(plaintext),
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "kb_per_s": round(len(plaintext) / elapsed / 1024, 3) if elapsed else None,
+            "modexp": len(ciphertext_list),
+            "modexp_per_char_mode": len(plaintext)
+        }
+    }
@@ -0,0 +1,350 @@
+# Enigma I (Wehrmacht): three rotors from I-V, reflector B or C, ring settings, plugboard,
+# double-stepping of the middle rotor.
+# Every rotor has a forward and an inverse 26-letter table per offset (position - ring), so
+# the whole scrambler at one machine position is a single 26-entry permutation composed once
+# per rotor order; encryption is then plugboard -> permutation -> plugboard per letter.
+# Bombe (Turing-Welchman): for each rotor order and start position, the crib's letter pairs
+# form a menu; a plugboard hypothesis for the most connected letter is propagated through
+# the scramblers and rejected at the first contradiction. Rotor orders are independent, so
+# they are spread over a process pool.
+
+import os
+import time
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# wiring, turnover notch (window letter)
+ROTORS = {
+    "I": ("EKMFLGDQVZNTOWYHXUSPAIBRCJ", "Q"),
+    "II": ("AJDKSIRUXBLHWTMCQGZNPYFVOE", "E"),
+    "III": ("BDFHJLCPRTXVZNYEIWGAKMUSQO", "V"),
+    "IV": ("ESOVPZJAYQUIRHXLNFTGKDCMWB", "J"),
+    "V": ("VZBRGITYUPSDNHLXAWMJQOFECK", "Z"),
+}
+
+REFLECTORS = {
+    "B": "YRUHQSLDPXNGOKMIEBFZCWVJAT",
+    "C": "FVPJIAOYEDRZXWGCTKUQSBNLHM",
+}
+
+BOMBE_WORKERS = os.cpu_count() or 1
+
+_pool = None
+
+def configure_bombe(workers=None):
+    """Changes the number of worker processes of the bombe."""
+    global BOMBE_WORKERS, _pool
+    if workers is not None and workers != BOMBE_WORKERS:
+        if workers < 1:
+            raise ValueError("Serve almeno un processo.")
+        BOMBE_WORKERS = workers
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=BOMBE_WORKERS)
+    return _pool
+
+# --- Settings ---
+
+def _letters(value, count, name):
+    """'ABC', 'A B C' or numbers 1-26 as on numbered rings ([1, 2, 3] = 'ABC') -> indexes 0-25."""
+    if isinstance(value, str):
+        value = [c for c in value.upper() if c.isalpha()]
+        result = [ALPHABET.index(c) for c in value]
+    else:
+        result = [int(v) - 1 for v in value]
+        if any(not 0 <= v < 26 for v in result):
+            raise ValueError(f"{name}: i valori numerici vanno da 1 a 26.")
+    if len(result) != count:
+        raise ValueError(f"{name}: servono {count} valori.")
+    return result
+
+def parse_plugboard(pairs):
+    """'AB CD EF' -> involution as a list of 26 indexes."""
+    plug = list(range(26))
+    tokens = pairs.upper().split() if isinstance(pairs, str) else [str(p).upper() for p in pairs]
+    for token in tokens:
+        if len(token) != 2 or not token.isalpha() or token[0] == token[1]:
+            raise ValueError(f"Coppia del pannello non valida: {token}")
+        a, b = ALPHABET.index(token[0]), ALPHABET.index(token[1])
+        if plug[a] != a or plug[b] != b:
+            raise ValueError(f"Lettera già collegata nel pannello: {token}")
+        plug[a], plug[b] = b, a
+    return plug
+
+def parse_settings(settings):
+    rotors = list(settings.get("rotors", ["I", "II", "III"]))
+    if len(rotors) != 3 or len(set(rotors)) != 3 or any(r not in ROTORS for r in rotors):
+        raise ValueError(f"Servono tre rotori diversi tra: {', '.join(ROTORS)}")
+    reflector = settings.get("reflector", "B")
+    if reflector not in REFLECTORS:
+        raise ValueError(f"Riflettore non supportato: {reflector}")
+    return {
+        "rotors": rotors,
+        "reflector": reflector,
+        "rings": _letters(settings.get("rings", "AAA"), 3, "Ring"),
+        "positions": _letters(settings.get("positions", "AAA"), 3, "Posizioni"),
+        "plugboard": parse_plugboard(settings.get("plugboard", ""))
+    }
+
+# --- Precomputed Tables ---
+
+@lru_cache(maxsize=None)
+def rotor_tables(name):
+    """(forward, inverse): for each offset 0..25 a 26-byte table, letter in -> letter out."""
+    wiring = [ALPHABET.index(c) for c in ROTORS[name][0]]
+    inverse = [0] * 26
+    for i, w in enumerate(wiring):
+        inverse[w] = i
+    fwd = tuple(bytes((wiring[(c + o) % 26] - o) % 26 for c in range(26)) for o in range(26))
+    inv = tuple(bytes((inverse[(c + o) % 26] - o) % 26 for c in range(26)) for o in range(26))
+    return fwd, inv
+
+@lru_cache(maxsize=8)
+def scrambler_tables(rotors, reflector, rings):
+    """Scrambler permutation (without plugboard) for all 26^3 window positions of a rotor
+    order, index (left * 26 + middle) * 26 + right. The left-middle-reflector part is
+    composed once per (left, middle) pair and reused for the 26 right positions."""
+    (lf, li), (mf, mi), (rf, ri) = (rotor_tables(r) for r in rotors)
+    refl = bytes(ALPHABET.index(c) for c in REFLECTORS[reflector])
+    ring_l, ring_m, ring_r = rings
+    letters = range(26)
+    tables = []
+    for pl in range(26):
+        fl, il = lf[(pl - ring_l) % 26], li[(pl - ring_l) % 26]
+        for pm in range(26):
+            fm, im = mf[(pm - ring_m) % 26], mi[(pm - ring_m) % 26]
+            inner = bytes(im[il[refl[fl[fm[c]]]]] for c in letters)
+            for pr in range(26):
+                fr, ir = rf[(pr - ring_r) % 26], ri[(pr - ring_r) % 26]
+                tables.append(bytes(ir[inner[fr[c]]] for c in letters))
+    return tables
+
+def step_positions(start, count, rotors):
+    """Window positions used for the next `count` key presses (each press steps first).
+    Double-stepping: a middle rotor on its notch steps itself and the left rotor."""
+    notch_m = ALPHABET.index(ROTORS[rotors[1]][1])
+    notch_r = ALPHABET.index(ROTORS[rotors[2]][1])
+    l, m, r = start
+    out = []
+    for _ in range(count):
+        if m == notch_m:
+            m = (m + 1) % 26
+            l = (l + 1) % 26
+        elif r == notch_r:
+            m = (m + 1) % 26
+        r = (r + 1) % 26
+        out.append((l * 26 + m) * 26 + r)
+    return out
+
+# --- Encryption ---
+
+def enigma_encrypt(text, settings, trace=False):
+    """Encrypts (or decrypts: Enigma is an involution) the letters of text; other characters
+    are dropped, as on the machine. With trace, the path of every letter."""
+    s = parse_settings(settings)
+    rotors = tuple(s["rotors"])
+    letters = [ALPHABET.index(c) for c in text.upper() if c in ALPHABET]
+    tables = scrambler_tables(rotors, s["reflector"], tuple(s["rings"]))
+    plug = s["plugboard"]
+    positions = step_positions(s["positions"], len(letters), rotors)
+
+    out = []
+    steps = []
+    for c, pos in zip(letters, positions):
+        a = plug[c]
+        b = tables[pos][a]
+        e = plug[b]
+        out.append(ALPHABET[e])
+        if trace:
+            window = ALPHABET[pos // 676] + ALPHABET[pos // 26 % 26] + ALPHABET[pos % 26]
+            steps.append({
+                "window": window,
+                "input": ALPHABET[c],
+                "plug_in": ALPHABET[a],
+                "scrambler": ALPHABET[b],
+                "output": ALPHABET[e],
+                "desc": f"Rotori in {window}: {ALPHABET[c]} → pannello {ALPHABET[a]} → rotori/riflettore {ALPHABET[b]} → pannello {ALPHABET[e]}"
+            })
+
+    end = positions[-1] if positions else None
+    result = {
+        "output": "".join(out),
+        "final_positions": s["positions"] if end is None else [end // 676, end // 26 % 26, end % 26]
+    }
+    result["final_positions"] = "".join(ALPHABET[p] for p in result["final_positions"])
+    if trace:
+        result["steps"] = steps
+    return result
+
+# --- Bombe ---
+
+def crib_offsets(ciphertext, crib):
+    """Offsets where the crib can sit: Enigma never encrypts a letter to itself."""
+    return [o for o in range(len(ciphertext) - len(crib) + 1)
+            if all(ciphertext[o + k] != crib[k] for k in range(len(crib)))]
+
+def _menu(ciphertext, crib, offset):
+    # Edges (step index, plain letter, cipher letter) and the most connected letter
+    edges = [(offset + k, ALPHABET.index(p), ALPHABET.index(ciphertext[offset + k])) for k, p in enumerate(crib)]
+    degree = [0] * 26
+    for _, a, b in edges:
+        degree[a] += 1
+        degree[b] += 1
+    return edges, degree.index(max(degree))
+
+def _consistent(perms, adjacency, start, guess, plug=None):
+    """Propagates plug(start) = guess through the menu, on top of an already implied plugboard.
+    Returns the implied plugboard (letter -> letter) or None at the first contradiction."""
+    plug = dict(plug) if plug else {}
+    if plug.get(guess, start) != start:
+        return None
+    plug[start] = guess
+    plug[guess] = start
+    stack = [start]
+    while stack:
+        a = stack.pop()
+        for k, b in adjacency[a]:
+            # c = P(S(P(p))): plug(b) = S_k(plug(a))
+            v = perms[k][plug[a]]
+            known = plug.get(b)
+            if known is None:
+                if plug.get(v, b) != b:
+                    return None
+                plug[b] = v
+                plug[v] = b
+                stack.append(b)
+                if v != b:
+                    stack.append(v)
+            elif known != v:
+                return None
+    return plug
+
+def _complete_plugboard(perms, adjacency, plug):
+    # Menu letters outside the stop's component (the checking machine's job): a letter is
+    # settled when exactly one hypothesis stays consistent with what is already implied
+    for letter in range(26):
+        if letter in plug or not adjacency[letter]:
+            continue
+        found = [p for p in (_consistent(perms, adjacency, letter, g, plug) for g in range(26)) if p is not None]
+        if len(found) == 1:
+            plug = found[0]
+    return plug
+
+def _bombe_order(rotors, reflector, rings, edges, start_letter, steps_needed, max_stops):
+    """All start positions for one rotor order; returns (stops, positions tested)."""
+    tables = scrambler_tables(rotors, reflector, rings)
+    adjacency = [[] for _ in range(26)]
+    for k, (step, a, b) in enumerate(edges):
+        adjacency[a].append((k, b))
+        adjacency[b].append((k, a))
+    crib_steps = [step for step, _, _ in edges]
+
+    stops = []
+    for start in range(26 ** 3):
+        positions = step_positions((start // 676, start // 26 % 26, start % 26), steps_needed, rotors)
+        perms = [tables[positions[step]] for step in crib_steps]
+        for guess in range(26):
+            plug = _consistent(perms, adjacency, start_letter, guess)
+            if plug is not None:
+                plug = _complete_plugboard(perms, adjacency, plug)
+                stops.append({
+                    "rotors": list(rotors),
+                    "positions": ALPHABET[start // 676] + ALPHABET[start // 26 % 26] + ALPHABET[start % 26],
+                    "plugboard": " ".join(sorted({ALPHABET[min(a, b)] + ALPHABET[max(a, b)]
+                                                  for a, b in plug.items() if a != b}))
+                })
+                if len(stops) >= max_stops:
+                    return stops, start + 1
+    return stops, 26 ** 3
+
+def bombe_search(ciphertext, crib, offset=None, rotors=None, reflector="B", rings="AAA",
+                 parallel=None, max_stops=50):
+    """Crib attack over every order of the given rotors and every start position.
+    Each stop comes with the plugboard pairs implied by the menu and a trial decryption
+    (letters outside the menu left unplugged)."""
+    ciphertext = "".join(c for c in ciphertext.upper() if c in ALPHABET)
+    crib = "".join(c for c in crib.upper() if c in ALPHABET)
+    rotors = list(rotors or ROTORS)
+    if any(r not in ROTORS for r in rotors) or len(set(rotors)) < 3:
+        raise ValueError(f"Servono almeno tre rotori diversi tra: {', '.join(ROTORS)}")
+    if reflector not in REFLECTORS:
+        raise ValueError(f"Riflettore non supportato: {reflector}")
+    if len(crib) < 2 or len(crib) > len(ciphertext):
+        raise ValueError("Il crib deve avere almeno 2 lettere e non superare il testo cifrato.")
+    offsets = crib_offsets(ciphertext, crib)
+    if offset is None:
+        if not offsets:
+            raise ValueError("Nessuna posizione compatibile per il crib (una lettera cifrerebbe se stessa).")
+        offset = offsets[0]
+    elif offset not in offsets:
+        raise ValueError(f"Il crib non può stare in posizione {offset}.")
+
+    rings = tuple(_letters(rings, 3, "Ring"))
+    edges, start_letter = _menu(ciphertext, crib, offset)
+    orders = [(a, b, c) for a in rotors for b in rotors for c in rotors if len({a, b, c}) == 3]
+    args = (reflector, rings, edges, start_letter, offset + len(crib), max_stops)
+
+    if parallel is None:
+        parallel = BOMBE_WORKERS > 1 and len(orders) > 1
+    start = time.perf_counter()
+    if parallel:
+        count = len(orders)
+        results = list(_get_pool().map(_bombe_order, orders, *([a] * count for a in args)))
+    else:
+        results = [_bombe_order(order, *args) for order in orders]
+    elapsed = time.perf_counter() - start
+
+    stops = [stop for order_stops, _ in results for stop in order_stops]
+    for stop in stops[:max_stops]:
+        trial = enigma_encrypt(ciphertext, {"rotors": stop["rotors"], "reflector": reflector,
+                                            "rings": "".join(ALPHABET[r] for r in rings), "positions": stop["positions"],
+                                            "plugboard": stop["plugboard"]})
+        stop["trial"] = trial["output"]
+    tested = sum(n for _, n in results)
+    return {
+        "offset": offset,
+        "offsets": offsets,
+        "menu_letter": ALPHABET[start_letter],
+        "orders": len(orders),
+        "positions_tested": tested,
+        "stops": stops[:max_stops],
+        "truncated": len(stops) > max_stops or any(n < 26 ** 3 for _, n in results),
+        "parallel": bool(parallel),
+        "workers": BOMBE_WORKERS if parallel else 1,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "positions_per_s": round(tested / elapsed) if elapsed else None
+    }
+
+# --- Benchmark ---
+
+def enigma_benchmark(rotors=("I", "II", "III"), crib="WETTERVORHERSAGE"):
+    """Serial vs parallel bombe over every order of `rotors`, on a message encrypted with a
+    known setting; also checks that the true setting is among the stops."""
+    setting = {"rotors": [rotors[1], rotors[2], rotors[0]], "positions": "QEV", "plugboard": "AR GK OX"}
+    ciphertext = enigma_encrypt(crib + "BISKAYAXHEUTENACHTREGEN", setting)["output"]
+    serial = bombe_search(ciphertext, crib, 0, rotors, parallel=False)
+    parallel = bombe_search(ciphertext, crib, 0, rotors, parallel=True)
+    found = any(s["rotors"] == setting["rotors"] and s["positions"] == setting["positions"]
+                for s in parallel["stops"])
+    return {
+        "orders": serial["orders"],
+        "workers": BOMBE_WORKERS,
+        "serial_ms": serial["elapsed_ms"],
+        "parallel_ms": parallel["elapsed_ms"],
+        "speedup": round(serial["elapsed_ms"] / parallel["elapsed_ms"], 2),
+        "stops": len(parallel["stops"]),
+        "found": found
+    }
+
+if __name__ == '__main__':
+    r = enigma_benchmark()
+    print(f"Bombe, {r['orders']} ordini di rotori: seriale {r['serial_ms']} ms, "
+          f"{r['workers']} processi {r['parallel_ms']} ms (x{r['speedup']}), "
+          f"{r['stops']} stop, impostazione corretta trovata: {r['found']}")
@@ -0,0 +1,231 @@
+# Fixed-Base Exponentiation
+# g^x mod p for a base that does not change (DH, DSA and ElGamal generators, public keys).
+# Row i of the table holds g^(j * 2^(w*i)) for every w-bit digit j, so g^x is one modular
+# multiplication per non-zero digit of x and no squarings at all.
+# Tables are kept in an LRU keyed by (g, p) and are only built once a base has been used
+# a few times: below that, the precomputation costs more than it saves. The LRU is bounded
+# both by entries and by estimated bytes: one table for a 3072-bit modulus and a full-size
+# exponent is about 8 MB, and per-user bases (public keys y) must not pile those up.
+
+import time
+import secrets
+import threading
+from collections import OrderedDict
+
+WINDOW_BITS = 5
+
+# Smaller moduli stay on pow(): the Python loop would cost more than the multiplications saved
+MIN_MODULUS_BITS = 128
+
+# Calls with the same (g, p) before the table is built. The measured crossover
+# (fixed_base_benchmark) is about 10-13 calls; building a bit earlier keeps the worst case
+# for a base used only a few times within about twice the cost of plain pow().
+BUILD_AFTER_USES = 8
+
+FIXED_BASE_CACHE_SIZE = 16
+FIXED_BASE_CACHE_BYTES = 64 * 1024 * 1024
+
+_tables = OrderedDict()
+_table_bytes = {}
+_uses = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "builds": 0, "evictions": 0}
+_maxsize = FIXED_BASE_CACHE_SIZE
+_max_bytes = FIXED_BASE_CACHE_BYTES
+_bytes = 0
+
+def _extend_rows(rows, g, p, nrows, w=WINDOW_BITS):
+    """Appends rows up to nrows. Each row starts from g^(2^(w*i)), the last entry of the
+    previous row times the previous base."""
+    rows = list(rows)
+    if rows:
+        base = rows[-1][-1] * rows[-1][1] % p
+    else:
+        base = g % p
+    while len(rows) < nrows:
+        row = [1] * (1 << w)
+        v = 1
+        for j in range(1, 1 << w):
+            v = v * base % p
+            row[j] = v
+        rows.append(row)
+        base = v * base % p
+    return rows
+
+def build_table(g, p, exp_bits):
+    """Rows covering exponents up to exp_bits bits."""
+    return _extend_rows([], g, p, -(-exp_bits // WINDOW_BITS))
+
+def table_pow(rows, x, p, w=WINDOW_BITS):
+    result = 1
+    mask = (1 << w) - 1
+    i = 0
+    while x:
+        digit = x & mask
+        if digit:
+            result = result * rows[i][digit] % p
+        x >>= w
+        i += 1
+    return result
+
+def table_size(rows, p):
+    """Estimated bytes of a table: per entry, the int header plus 4 bytes per 30-bit digit."""
+    return len(rows) * len(rows[0]) * (28 + 4 * -(-p.bit_length() // 30)) if rows else 0
+
+def _evict_over_limits():
+    # Caller holds _lock
+    global _bytes
+    while _tables and (len(_tables) > _maxsize or _bytes > _max_bytes):
+        key, _ = _tables.popitem(last=False)
+        _bytes -= _table_bytes.pop(key)
+        _stats["evictions"] += 1
+
+def _store(key, rows):
+    global _bytes
+    size = table_size(rows, key[1])
+    with _lock:
+        if key in _tables:
+            # Extended table replaces the shorter one
+            del _tables[key]
+            _bytes -= _table_bytes.pop(key)
+        if _maxsize > 0 and size <= _max_bytes:
+            _tables[key] = rows
+            _table_bytes[key] = size
+            _bytes += size
+            _evict_over_limits()
+
+def fixed_base_pow(g, x, p):
+    """Drop-in for pow(g, x, p) with x >= 0, using the cached table for (g, p) when there is one."""
+    if p.bit_length() < MIN_MODULUS_BITS or x < 0:
+        return pow(g, x, p)
+
+    key = (g, p)
+    nrows = -(-x.bit_length() // WINDOW_BITS)
+    with _lock:
+        rows = _tables.get(key)
+        if rows is not None:
+            _tables.move_to_end(key)
+            _stats["hits"] += 1
+        else:
+            _stats["misses"] += 1
+            uses = _uses.pop(key, 0) + 1
+            if uses < BUILD_AFTER_USES:
+                _uses[key] = uses
+                while len(_uses) > 4 * max(_maxsize, 1):
+                    _uses.popitem(last=False)
+                return pow(g, x, p)
+            _stats["builds"] += 1
+
+    if rows is None or len(rows) < nrows:
+        # Tables grow to the widest exponent seen: DSA exponents (< q) need far fewer rows than DH
+        rows = _extend_rows(rows or [], g, p, max(nrows, 1))
+        _store(key, rows)
+    return table_pow(rows, x, p)
+
+def get_table(g, p, exp_bits):
+    """Table for (g, p) covering exp_bits-bit exponents, built right away if missing
+    (skipping the use count) and kept in the cache."""
+    key = (g, p)
+    with _lock:
+        rows = _tables.get(key)
+        if rows is not None:
+            _tables.move_to_end(key)
+            _stats["hits"] += 1
+    if rows is None or len(rows) < -(-exp_bits // WINDOW_BITS):
+        rows = _extend_rows(rows or [], g, p, -(-exp_bits // WINDOW_BITS))
+        with _lock:
+            _stats["builds"] += 1
+        _store(key, rows)
+    return rows
+
+def preload_table(g, p, exp_bits):
+    """Builds the table for (g, p) right away (well-known groups)."""
+    get_table(g, p, exp_bits)
+
+def multi_table_pow(pairs, p, w=WINDOW_BITS):
+    """Product of g_i^x_i mod p for pairs (rows_i, x_i): the digits at the same position are
+    consumed together into one accumulator, so g1^x1 * g2^x2 costs about as many
+    multiplications as the two table_pow calls and no squarings."""
+    result = 1
+    mask = (1 << w) - 1
+    i = 0
+    pairs = [(rows, x) for rows, x in pairs if x]
+    while pairs:
+        remaining = []
+        for rows, x in pairs:
+            digit = x & mask
+            if digit:
+                result = result * rows[i][digit] % p
+            x >>= w
+            if x:
+                remaining.append((rows, x))
+        pairs = remaining
+        i += 1
+    return result
+
+def configure_fixed_base_cache(maxsize, max_bytes=None):
+    """Changes the number of cached tables (0 disables the tables) and, optionally, the byte budget."""
+    global _maxsize, _max_bytes
+    if maxsize < 0 or (max_bytes is not None and max_bytes < 0):
+        raise ValueError("La dimensione della cache non può essere negativa.")
+    with _lock:
+        _maxsize = maxsize
+        if max_bytes is not None:
+            _max_bytes = max_bytes
+        _evict_over_limits()
+
+def clear_fixed_base_cache():
+    global _bytes
+    with _lock:
+        _tables.clear()
+        _table_bytes.clear()
+        _bytes = 0
+        _uses.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+def fixed_base_cache_stats():
+    with _lock:
+        return dict(_stats, size=len(_tables), maxsize=_maxsize, bytes=_bytes, max_bytes=_max_bytes)
+
+# --- Benchmark ---
+
+def fixed_base_benchmark(p, g=2, exp_bits=None, calls=64):
+    """Cumulative time of `calls` exponentiations with pow() and with a table built up front.
+    The crossover is the first call count from which the table (build included) is ahead."""
+    exp_bits = exp_bits or p.bit_length()
+    exponents = [secrets.randbits(exp_bits) for _ in range(calls)]
+
+    start = time.perf_counter()
+    expected = [pow(g, x, p) for x in exponents]
+    pow_total = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = build_table(g, p, exp_bits)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [table_pow(rows, x, p) for x in exponents]
+    table_total = time.perf_counter() - start
+    if results != expected:
+        raise RuntimeError("Risultati diversi da pow().")
+
+    per_pow = pow_total / calls
+    per_table = table_total / calls
+    crossover = build / (per_pow - per_table) if per_pow > per_table else None
+    return {
+        "modulus_bits": p.bit_length(),
+        "exponent_bits": exp_bits,
+        "window_bits": WINDOW_BITS,
+        "build_ms": round(build * 1000, 3),
+        "pow_ms": round(per_pow * 1000, 4),
+        "table_ms": round(per_table * 1000, 4),
+        "speedup": round(per_pow / per_table, 2),
+        "crossover_calls": None if crossover is None else int(crossover) + 1
+    }
+
+if __name__ == '__main__':
+    from logic.number_theory import random_prime
+    for mod_bits, exp_bits in ((256, 256), (1024, 160), (2048, 256), (2048, 2048), (3072, 3072)):
+        r = fixed_base_benchmark(random_prime(mod_bits), exp_bits=exp_bits, calls=32)
+        print(f"p {mod_bits} bit, x {exp_bits} bit: pow {r['pow_ms']} ms, tabella {r['table_ms']} ms "
+              f"({r['speedup']}x), costruzione {r['build_ms']} ms, conviene da {r['crossover_calls']} chiamate")
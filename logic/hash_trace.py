@@ -0,0 +1,259 @@
+# SHA-256, SHA-512 and MD5 round by round
+# The digest always comes from hashlib (fast path); the Python compression functions only run
+# for the blocks whose trace is requested. Traces are paged per block (64 bytes for SHA-256
+# and MD5, 128 for SHA-512): to trace block i the chaining state before it is needed, so the
+# session keeps checkpoints every CHECKPOINT_INTERVAL blocks and after each page served.
+# Round constants and initial values are derived once at import: fractional parts of the
+# square and cube roots of the first primes (SHA-2) and of |sin(i)| (MD5).
+
+import math
+import struct
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+
+from logic.number_theory import small_primes
+
+M32 = 0xFFFFFFFF
+M64 = 0xFFFFFFFFFFFFFFFF
+
+TRACE_SESSIONS = 16
+TRACE_PAGE_MAX = 8
+CHECKPOINT_INTERVAL = 256
+# Jumping straight to the last page means running the Python compression over everything
+# before it (~3 s/MB for SHA-256): the cap keeps that worst case under a minute
+HASH_TRACE_MAX_BYTES = 16 * 1024 * 1024
+
+_trace_sessions = OrderedDict()
+_trace_lock = threading.Lock()
+
+def _icbrt(n):
+    # Integer cube root (Newton from above)
+    x = 1 << -(-n.bit_length() // 3)
+    while True:
+        y = (2 * x + n // (x * x)) // 3
+        if y >= x:
+            return x
+        x = y
+
+_PRIMES = small_primes()[:80]
+
+# First 32 / 64 bits of the fractional parts of sqrt(p) (initial values) and cbrt(p) (round constants)
+SHA256_IV = tuple(math.isqrt(p << 64) & M32 for p in _PRIMES[:8])
+SHA256_K = tuple(_icbrt(p << 96) & M32 for p in _PRIMES[:64])
+SHA512_IV = tuple(math.isqrt(p << 128) & M64 for p in _PRIMES[:8])
+SHA512_K = tuple(_icbrt(p << 192) & M64 for p in _PRIMES[:80])
+
+# MD5 (RFC 1321): T[i] = floor(2^32 * |sin(i + 1)|), shifts and message word per step
+MD5_IV = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476)
+MD5_T = tuple(int(abs(math.sin(i + 1)) * 2 ** 32) & M32 for i in range(64))
+MD5_S = (7, 12, 17, 22) * 4 + (5, 9, 14, 20) * 4 + (4, 11, 16, 23) * 4 + (6, 10, 15, 21) * 4
+MD5_G = tuple(list(range(16)) + [(5 * i + 1) % 16 for i in range(16, 32)]
+              + [(3 * i + 5) % 16 for i in range(32, 48)] + [(7 * i) % 16 for i in range(48, 64)])
+
+# --- Compression Functions ---
+# state: tuple of words; trace: None, or a list that receives the registers after each round.
+# Constants are bound as default arguments: locals are much cheaper than globals in these loops
+
+def sha256_schedule(block, M32=M32):
+    """The 64 words W[t]: 16 from the block, 48 from the sigma recurrence."""
+    w = list(struct.unpack('>16I', block))
+    append = w.append
+    for t in range(16, 64):
+        x = w[t - 15]
+        y = w[t - 2]
+        append((w[t - 16] + w[t - 7]
+                + (((x >> 7 | x << 25) ^ (x >> 18 | x << 14) ^ (x >> 3)) & M32)
+                + (((y >> 17 | y << 15) ^ (y >> 19 | y << 13) ^ (y >> 10)) & M32)) & M32)
+    return w
+
+def sha256_compress(state, block, trace=None, K=SHA256_K, M32=M32):
+    w = sha256_schedule(block)
+    a, b, c, d, e, f, g, h = state
+    for t in range(64):
+        t1 = (h + (((e >> 6 | e << 26) ^ (e >> 11 | e << 21) ^ (e >> 25 | e << 7)) & M32)
+              + ((e & f) ^ (~e & g)) + K[t] + w[t]) & M32
+        t2 = (((a >> 2 | a << 30) ^ (a >> 13 | a << 19) ^ (a >> 22 | a << 10)) & M32) + ((a & b) ^ (a & c) ^ (b & c))
+        h, g, f, e, d, c, b, a = g, f, e, (d + t1) & M32, c, b, a, (t1 + t2) & M32
+        if trace is not None:
+            trace.append((a, b, c, d, e, f, g, h))
+    return tuple((x + y) & M32 for x, y in zip(state, (a, b, c, d, e, f, g, h))), w
+
+def sha512_schedule(block, M64=M64):
+    """The 80 words W[t] of SHA-512."""
+    w = list(struct.unpack('>16Q', block))
+    append = w.append
+    for t in range(16, 80):
+        x = w[t - 15]
+        y = w[t - 2]
+        append((w[t - 16] + w[t - 7]
+                + (((x >> 1 | x << 63) ^ (x >> 8 | x << 56) ^ (x >> 7)) & M64)
+                + (((y >> 19 | y << 45) ^ (y >> 61 | y << 3) ^ (y >> 6)) & M64)) & M64)
+    return w
+
+def sha512_compress(state, block, trace=None, K=SHA512_K, M64=M64):
+    w = sha512_schedule(block)
+    a, b, c, d, e, f, g, h = state
+    for t in range(80):
+        t1 = (h + (((e >> 14 | e << 50) ^ (e >> 18 | e << 46) ^ (e >> 41 | e << 23)) & M64)
+              + ((e & f) ^ (~e & g)) + K[t] + w[t]) & M64
+        t2 = (((a >> 28 | a << 36) ^ (a >> 34 | a << 30) ^ (a >> 39 | a << 25)) & M64) + ((a & b) ^ (a & c) ^ (b & c))
+        h, g, f, e, d, c, b, a = g, f, e, (d + t1) & M64, c, b, a, (t1 + t2) & M64
+        if trace is not None:
+            trace.append((a, b, c, d, e, f, g, h))
+    return tuple((x + y) & M64 for x, y in zip(state, (a, b, c, d, e, f, g, h))), w
+
+def md5_compress(state, block, trace=None, T=MD5_T, S=MD5_S, G=MD5_G, M32=M32):
+    x = struct.unpack('<16I', block)
+    a, b, c, d = state
+    for i in range(64):
+        if i < 16:
+            f = (b & c) | (~b & d)
+        elif i < 32:
+            f = (d & b) | (~d & c)
+        elif i < 48:
+            f = b ^ c ^ d
+        else:
+            f = c ^ (b | ~d)
+        f = (f + a + T[i] + x[G[i]]) & M32
+        s = S[i]
+        a, d, c, b = d, c, b, (b + ((f << s | f >> (32 - s)) & M32)) & M32
+        if trace is not None:
+            trace.append((a, b, c, d))
+    return tuple((u + v) & M32 for u, v in zip(state, (a, b, c, d))), list(x)
+
+# name: (hashlib constructor, compression, IV, block bytes, word hex digits, length bytes, byte order)
+HASH_TRACERS = {
+    "sha256": (hashlib.sha256, sha256_compress, SHA256_IV, 64, 8, 8, 'big'),
+    "sha512": (hashlib.sha512, sha512_compress, SHA512_IV, 128, 16, 16, 'big'),
+    "md5": (hashlib.md5, md5_compress, MD5_IV, 64, 8, 8, 'little'),
+}
+
+def _tracer(algo):
+    if algo not in HASH_TRACERS:
+        raise ValueError(f"Algoritmo non supportato: {algo}. Disponibili: {', '.join(HASH_TRACERS)}")
+    return HASH_TRACERS[algo]
+
+def _padded_tail(message, block_size, length_bytes, byteorder):
+    """The last (one or two) padded blocks: the bytes after the last full block, 0x80, zeros, bit length."""
+    tail = message[len(message) - len(message) % block_size:]
+    zeros = (block_size - length_bytes - 1 - len(tail)) % block_size
+    return tail + b'\x80' + b'\x00' * zeros + (len(message) * 8).to_bytes(length_bytes, byteorder)
+
+def hash_digest(algo, message):
+    """Fast path: hashlib, no trace."""
+    return _tracer(algo)[0](message).hexdigest()
+
+def hash_python(algo, message):
+    """Digest computed entirely with the Python compression functions (checks and benchmarks)."""
+    _, compress, state, block_size, _, length_bytes, byteorder = _tracer(algo)
+    full = len(message) - len(message) % block_size
+    data = message[:full] + _padded_tail(message, block_size, length_bytes, byteorder)
+    for i in range(0, len(data), block_size):
+        state, _ = compress(state, data[i:i + block_size])
+    word_bytes = 4 if block_size == 64 else 8
+    return b''.join(v.to_bytes(word_bytes, byteorder) for v in state).hex()
+
+# --- Paged Trace ---
+
+def hash_trace_start(algo, message):
+    """Digest from hashlib and a handle for hash_trace_page (message kept in memory, capped)."""
+    ctor, _, iv, block_size, _, length_bytes, byteorder = _tracer(algo)
+    if len(message) > HASH_TRACE_MAX_BYTES:
+        raise ValueError(f"Messaggio troppo lungo per il trace (massimo {HASH_TRACE_MAX_BYTES // (1024 * 1024)} MB).")
+    tail = _padded_tail(message, block_size, length_bytes, byteorder)
+    full_blocks = len(message) // block_size
+    handle = secrets.token_hex(8)
+    with _trace_lock:
+        _trace_sessions[handle] = {
+            "algo": algo,
+            "message": message,
+            "tail": tail,
+            "full_blocks": full_blocks,
+            "num_blocks": full_blocks + len(tail) // block_size,
+            "states": {0: iv}
+        }
+        while len(_trace_sessions) > TRACE_SESSIONS:
+            _trace_sessions.popitem(last=False)
+
+    return {
+        "handle": handle,
+        "algo": algo,
+        "digest": ctor(message).hexdigest(),
+        "message_bytes": len(message),
+        "block_size": block_size,
+        "num_blocks": full_blocks + len(tail) // block_size,
+        "rounds": {"sha256": 64, "sha512": 80, "md5": 64}[algo]
+    }
+
+def _block(session, i, block_size):
+    if i < session["full_blocks"]:
+        return session["message"][i * block_size:(i + 1) * block_size]
+    j = i - session["full_blocks"]
+    return session["tail"][j * block_size:(j + 1) * block_size]
+
+def _state_before(session, i, compress, block_size):
+    # Nearest checkpoint at or before i, then plain compression (no trace) up to i
+    states = session["states"]
+    start = max(k for k in states if k <= i)
+    state = states[start]
+    for k in range(start, i):
+        state, _ = compress(state, _block(session, k, block_size))
+        if (k + 1) % CHECKPOINT_INTERVAL == 0:
+            states[k + 1] = state
+    return state
+
+def hash_trace_page(handle, start=0, count=1):
+    with _trace_lock:
+        session = _trace_sessions.get(handle)
+        if session is not None:
+            _trace_sessions.move_to_end(handle)
+    if session is None:
+        raise KeyError("Sessione di trace scaduta o inesistente.")
+
+    algo = session["algo"]
+    _, compress, _, block_size, digits, _, _ = HASH_TRACERS[algo]
+    num_blocks = session["num_blocks"]
+    start = max(0, min(int(start), num_blocks))
+    end = min(num_blocks, start + max(0, min(int(count), TRACE_PAGE_MAX)))
+    fmt = f'0{digits}x'
+
+    def hexes(words):
+        return [format(v, fmt) for v in words]
+
+    state = _state_before(session, start, compress, block_size)
+    blocks = []
+    for i in range(start, end):
+        block = _block(session, i, block_size)
+        rounds = []
+        new_state, schedule = compress(state, block, rounds)
+        blocks.append({
+            "index": i,
+            "block_hex": block.hex(),
+            "schedule": hexes(schedule),
+            "state_in": hexes(state),
+            "rounds": [hexes(r) for r in rounds],
+            "state_out": hexes(new_state)
+        })
+        state = new_state
+    session["states"][end] = state
+
+    return {
+        "handle": handle,
+        "algo": algo,
+        "num_blocks": num_blocks,
+        "start": start,
+        "end": end,
+        "blocks": blocks
+    }
+
+def hash_constants(algo):
+    """Round constants and initial values as hex (static, sent once to the page)."""
+    _, _, iv, _, digits, _, _ = _tracer(algo)
+    k = {"sha256": SHA256_K, "sha512": SHA512_K, "md5": MD5_T}[algo]
+    result = {"iv": [format(v, f'0{digits}x') for v in iv], "k": [format(v, f'0{digits}x') for v in k]}
+    if algo == "md5":
+        result["s"] = list(MD5_S)
+        result["g"] = list(MD5_G)
+    return result
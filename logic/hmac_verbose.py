@@ -1,78 +1,270 @@
+# HMAC (RFC 2104): H((K' ^ opad) || H((K' ^ ipad) || m))
+# The hash states after absorbing K' ^ ipad and K' ^ opad depend only on the key: they are
+# computed once and copied, and the message is fed to the inner state as it arrives, so
+# streaming sessions (init / update / finalize) authenticate any size in constant memory.
+# Key states are kept in an LRU keyed by (algorithm, key): a repeated key costs two .copy().
+
+import time
+import secrets
 import hashlib
+import threading
+from collections import OrderedDict
 
-def hmac_verbose(key_str, message_str, hash_algo='sha256'):
-    # 1. Setup
-    steps = []
-    
-    # Defaults for SHA-256
-    block_size = 64
-    
-    if hash_algo == 'sha256':
-        digest_mod = hashlib.sha256
-    elif hash_algo == 'md5':
-        digest_mod = hashlib.md5
-        block_size = 64
-    else:
-        digest_mod = hashlib.sha256 # Default
-        
-    key = key_str.encode('utf-8')
-    message = message_str.encode('utf-8')
-    
-    steps.append({
-        "step": "1. Preparazione Chiave",
-        "desc": f"Input chiave: '{key_str}'. Algoritmo: {hash_algo}. BlockSize: {block_size} byte."
-    })
+# Supported hash functions; the block size (B in RFC 2104) comes from the hashlib object
+HASH_ALGORITHMS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha224": hashlib.sha224,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+    "sha3_224": hashlib.sha3_224,
+    "sha3_256": hashlib.sha3_256,
+    "sha3_384": hashlib.sha3_384,
+    "sha3_512": hashlib.sha3_512,
+}
 
-    # 2. Key Processing
+# XOR with 0x36 / 0x5c of every byte value, applied with bytes.translate
+TRANS_36 = bytes((x ^ 0x36) for x in range(256))
+TRANS_5C = bytes((x ^ 0x5c) for x in range(256))
+
+HMAC_KEY_CACHE_SIZE = 64
+
+# Streaming sessions expire after this many seconds without updates
+HMAC_SESSION_TTL = 600
+HMAC_MAX_SESSIONS = 64
+
+# Bytes read from the request body per update() call
+STREAM_CHUNK_SIZE = 1 << 20
+
+_key_states = OrderedDict()
+_key_states_lock = threading.Lock()
+_key_states_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_key_states_maxsize = HMAC_KEY_CACHE_SIZE
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _digest_for(hash_algo):
+    # (hash constructor, block size in bytes)
+    if hash_algo not in HASH_ALGORITHMS:
+        raise ValueError(f"Algoritmo non supportato: {hash_algo}. Disponibili: {', '.join(HASH_ALGORITHMS)}")
+    digest_mod = HASH_ALGORITHMS[hash_algo]
+    return digest_mod, digest_mod().block_size
+
+def _prepare_key(key, hash_algo, digest_mod, block_size, key_label):
+    """K' (block_size bytes) and the steps that describe it."""
+    steps = [{
+        "step": "1. Preparazione Chiave",
+        "desc": f"Input chiave: '{key_label}'. Algoritmo: {hash_algo}. BlockSize: {block_size} byte."
+    }]
     if len(key) > block_size:
         key = digest_mod(key).digest()
         steps.append({
             "step": "1a. Hushing della Chiave",
             "desc": "La chiave è più lunga del blocco. Viene hashata per ridurla."
         })
-    elif len(key) < block_size:
-        key = key.ljust(block_size, b'\0')
+    if len(key) < block_size:
         steps.append({
             "step": "1b. Padding della Chiave",
-            "desc": f"La chiave è più corta del blocco. Viene riempita con {block_size - len(key_str.encode('utf-8'))} zeri (0x00) per raggiungere {block_size} byte."
+            "desc": f"La chiave è più corta del blocco. Viene riempita con {block_size - len(key)} zeri (0x00) per raggiungere {block_size} byte."
         })
-    
+        key = key.ljust(block_size, b'\0')
+    return key, steps
+
+def hmac_key_states(key, hash_algo='sha256'):
+    """Hash objects that have already absorbed K' ^ ipad and K' ^ opad, cached per
+    (algorithm, key). Shared: callers must .copy() them before updating."""
+    cache_key = (hash_algo, bytes(key))
+    with _key_states_lock:
+        states = _key_states.get(cache_key)
+        if states is not None:
+            _key_states.move_to_end(cache_key)
+            _key_states_stats["hits"] += 1
+            return states
+        _key_states_stats["misses"] += 1
+
+    digest_mod, block_size = _digest_for(hash_algo)
+    if len(key) > block_size:
+        key = digest_mod(key).digest()
+    key = key.ljust(block_size, b'\0')
+    states = (digest_mod(key.translate(TRANS_36)), digest_mod(key.translate(TRANS_5C)))
+
+    with _key_states_lock:
+        if _key_states_maxsize > 0:
+            _key_states[cache_key] = states
+            while len(_key_states) > _key_states_maxsize:
+                _key_states.popitem(last=False)
+                _key_states_stats["evictions"] += 1
+    return states
+
+def hmac_digest(key, message, hash_algo='sha256'):
+    """HMAC of bytes with the cached key states (no steps)."""
+    inner_state, outer_state = hmac_key_states(key, hash_algo)
+    inner = inner_state.copy()
+    inner.update(message)
+    outer = outer_state.copy()
+    outer.update(inner.digest())
+    return outer.digest()
+
+def configure_hmac_key_cache(maxsize):
+    """Changes the number of cached keys (0 disables the cache)."""
+    global _key_states_maxsize
+    if maxsize < 0:
+        raise ValueError("La dimensione della cache non può essere negativa.")
+    with _key_states_lock:
+        _key_states_maxsize = maxsize
+        while len(_key_states) > maxsize:
+            _key_states.popitem(last=False)
+            _key_states_stats["evictions"] += 1
+
+def clear_hmac_key_cache():
+    with _key_states_lock:
+        _key_states.clear()
+        for name in _key_states_stats:
+            _key_states_stats[name] = 0
+
+def hmac_key_cache_stats():
+    with _key_states_lock:
+        return dict(_key_states_stats, size=len(_key_states), maxsize=_key_states_maxsize)
+
+def hmac_verbose(key_str, message_str, hash_algo='sha256'):
+    # 1. Setup
+    digest_mod, block_size = _digest_for(hash_algo)
+    message = message_str.encode('utf-8')
+
+    # 2. Key Processing
+    key, steps = _prepare_key(key_str.encode('utf-8'), hash_algo, digest_mod, block_size, key_str)
+
+    # Hash states for this key (cached): K' ^ ipad and K' ^ opad are already absorbed
+    inner_state, outer_state = hmac_key_states(key_str.encode('utf-8'), hash_algo)
+
     # 3. Inner Pad (ipad) calculation
     # ipad = 0x36 repeated block_size times
-    ipad = bytes((x ^ 0x36) for x in key)
+    ipad = key.translate(TRANS_36)
     steps.append({
         "step": "2. Calcolo Inner Pad (Key XOR ipad)",
         "desc": "La chiave (paddata) viene messa in XOR con 0x36 (00110110) per ogni byte.",
     })
-    
-    # 4. Inner Hash
-    inner_data = ipad + message
-    inner_hash = digest_mod(inner_data).digest()
+
+    # 4. Inner Hash: the message continues from the state that already absorbed the pad
+    inner = inner_state.copy()
+    inner.update(message)
+    inner_hash = inner.digest()
     steps.append({
         "step": "3. Inner Hash",
         "desc": "Si calcola H( (K' ^ ipad) || messaggio ).",
-        "detail": f"Messaggio interno: {inner_data[:20]}... (troncato)",
+        "detail": f"Messaggio interno: {(ipad + message[:20])[:20]}... (troncato)",
         "result": inner_hash.hex()
     })
-    
+
     # 5. Outer Pad (opad) calculation
     # opad = 0x5c repeated block_size times
-    opad = bytes((x ^ 0x5c) for x in key)
     steps.append({
         "step": "4. Calcolo Outer Pad (Key XOR opad)",
         "desc": "La chiave (paddata) viene messa in XOR con 0x5c (01011100) per ogni byte.",
     })
-    
+
     # 6. Outer Hash (Final Result)
-    outer_data = opad + inner_hash
-    final_hash = digest_mod(outer_data).hexdigest()
+    outer = outer_state.copy()
+    outer.update(inner_hash)
+    final_hash = outer.hexdigest()
     steps.append({
         "step": "5. Outer Hash (Risultato Finale)",
         "desc": "Si calcola H( (K' ^ opad) || inner_hash ).",
         "result": final_hash
     })
-    
+
     return {
         "steps": steps,
         "hmac": final_hash
     }
+
+# --- Streaming (init / update / finalize) ---
+
+def _purge_sessions(now):
+    for sid in [sid for sid, s in _sessions.items() if now - s["last"] > HMAC_SESSION_TTL]:
+        del _sessions[sid]
+
+def hmac_init(key_str, hash_algo='sha256'):
+    """Opens a streaming session and returns its id."""
+    digest_mod, block_size = _digest_for(hash_algo)
+    _, steps = _prepare_key(key_str.encode('utf-8'), hash_algo, digest_mod, block_size, key_str)
+    inner, outer = hmac_key_states(key_str.encode('utf-8'), hash_algo)
+    now = time.monotonic()
+    with _sessions_lock:
+        _purge_sessions(now)
+        if len(_sessions) >= HMAC_MAX_SESSIONS:
+            raise ValueError("Troppe sessioni HMAC aperte, riprovare più tardi.")
+        sid = secrets.token_hex(16)
+        _sessions[sid] = {
+            "inner": inner.copy(),
+            "outer": outer,
+            "algo": hash_algo,
+            "key_steps": steps,
+            "bytes": 0,
+            "chunks": 0,
+            "last": now,
+            "lock": threading.Lock()
+        }
+    return sid
+
+def _get_session(sid):
+    with _sessions_lock:
+        session = _sessions.get(sid)
+        if session is None:
+            raise ValueError("Sessione HMAC inesistente o scaduta.")
+        session["last"] = time.monotonic()
+        return session
+
+def hmac_update(sid, data):
+    """Feeds bytes to the session. data is a bytes object or an iterable of chunks
+    (e.g. a request body read piece by piece). Returns the total bytes so far."""
+    session = _get_session(sid)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = (data,)
+    with session["lock"]:
+        for chunk in data:
+            session["inner"].update(chunk)
+            session["bytes"] += len(chunk)
+        session["chunks"] += 1
+        session["last"] = time.monotonic()
+        return session["bytes"]
+
+def hmac_finalize(sid):
+    """Closes the session: HMAC hex digest and the ipad/opad steps."""
+    session = _get_session(sid)
+    with _sessions_lock:
+        _sessions.pop(sid, None)
+    with session["lock"]:
+        inner_hash = session["inner"].digest()
+        outer = session["outer"].copy()
+        outer.update(inner_hash)
+        final_hash = outer.hexdigest()
+
+    steps = list(session["key_steps"])
+    steps.append({
+        "step": "2. Stato Interno Precalcolato (Key XOR ipad)",
+        "desc": "K' XOR 0x36 viene assorbito dall'hash una sola volta all'apertura della sessione; "
+                "i blocchi del messaggio proseguono da quello stato man mano che arrivano."
+    })
+    steps.append({
+        "step": "3. Inner Hash",
+        "desc": "Si calcola H( (K' ^ ipad) || messaggio ).",
+        "detail": f"Messaggio: {session['bytes']} byte in {session['chunks']} invii, senza tenerlo in memoria.",
+        "result": inner_hash.hex()
+    })
+    steps.append({
+        "step": "4. Stato Esterno Precalcolato (Key XOR opad)",
+        "desc": "Anche K' XOR 0x5c è già stato assorbito all'apertura: resta da aggiungere solo l'inner hash."
+    })
+    steps.append({
+        "step": "5. Outer Hash (Risultato Finale)",
+        "desc": "Si calcola H( (K' ^ opad) || inner_hash ).",
+        "result": final_hash
+    })
+    return {
+        "steps": steps,
+        "hmac": final_hash,
+        "bytes": session["bytes"]
+    }
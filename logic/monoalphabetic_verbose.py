@@ -1,4 +1,6 @@
-def monoalphabetic_encrypt_verbose(text, key):
+from logic.substitution_core import ALPHABET, clean_letters, substitute, step_window
+
+def monoalphabetic_encrypt_verbose(text, key, step_start=0, step_count=None):
     if not text:
         return {"error": "Missing text"}
     
@@ -7,14 +9,14 @@ def monoalphabetic_encrypt_verbose(text, key):
     cipher_alphabet = ""
     seen = set()
     
-    # Add unique key chars
+    # Add unique key chars (A-Z only: the alphabet becomes a translate table)
     for char in key_upper:
-        if char.isalpha() and char not in seen:
+        if char in ALPHABET and char not in seen:
             cipher_alphabet += char
             seen.add(char)
             
     # Fill remaining
-    standard_alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    standard_alphabet = ALPHABET
     for char in standard_alphabet:
         if char not in seen:
             cipher_alphabet += char
@@ -23,25 +25,17 @@ def monoalphabetic_encrypt_verbose(text, key):
         # Should not happen given logic, but sanity check
         return {"error": "Failed to generate alphabet"}
         
-    # 2. Build Mapping
-    mapping = {}
-    for i, std_char in enumerate(standard_alphabet):
-        mapping[std_char] = cipher_alphabet[i]
-        
-    # 3. Encrypt
-    text_clean = "".join([c.upper() for c in text if c.isalpha()])
-    ciphertext = ""
-    steps = []
+    # 2. Encrypt: one translate over the whole text
+    letters = clean_letters(text)
+    text_clean = letters.decode('ascii')
+    ciphertext = substitute(letters, cipher_alphabet).decode('ascii')
+    window = step_window(len(text_clean), step_start, step_count)
     
-    for i, char in enumerate(text_clean):
-        c_char = mapping.get(char, char) # Should always map if alpha
-        ciphertext += c_char
-        
-        steps.append({
-            "index": i,
-            "p_char": char,
-            "c_char": c_char
-        })
+    steps = [{
+        "index": i,
+        "p_char": text_clean[i],
+        "c_char": ciphertext[i]
+    } for i in window]
         
     return {
         "text": text_clean,
@@ -49,5 +43,7 @@ def monoalphabetic_encrypt_verbose(text, key):
         "standard_alphabet": list(standard_alphabet),
         "cipher_alphabet": list(cipher_alphabet),
         "ciphertext": ciphertext,
-        "steps": steps
+        "steps": steps,
+        "steps_start": window.start,
+        "total_letters": len(text_clean)
     }
@@ -0,0 +1,219 @@
+# Number Theory helpers shared by RSA, Diffie-Hellman, DSA and ElGamal
+# Primality: trial division by a cached sieve of small primes, then Miller-Rabin
+# (deterministic below 2^64, probabilistic with random bases above).
+
+import random
+import secrets
+from functools import lru_cache
+from math import gcd
+
+SIEVE_LIMIT = 2000
+
+# Prime search: odd candidates per window and sieving bound
+SEARCH_WINDOW = 4096
+SEARCH_SIEVE_LIMIT = 1 << 16
+
+# Above this, numbers go to the client as strings (JS numbers are exact only up to 2^53)
+JS_SAFE_INT = 2 ** 53
+
+# These bases make Miller-Rabin exact for every n < 2^64 (actually < 3.3 * 10^24)
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+def json_int(x):
+    return str(x) if x >= JS_SAFE_INT else x
+
+def short_number(x, digits=12):
+    """Abbreviates long numbers in step text: first and last digits plus the length."""
+    s = str(x)
+    if len(s) <= 2 * digits:
+        return x
+    return f"{s[:digits]}…{s[-digits:]} ({len(s)} cifre)"
+
+@lru_cache(maxsize=8)
+def small_primes(limit=SIEVE_LIMIT):
+    """Primes below limit (sieve of Eratosthenes), computed once per limit."""
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return tuple(i for i in range(limit) if sieve[i])
+
+def _miller_rabin(n, d, s, a):
+    # n - 1 = d * 2^s; True if n is a strong probable prime to base a
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+def is_prime(n, rounds=40):
+    if n < 2:
+        return False
+    for p in small_primes():
+        if n % p == 0:
+            return n == p
+    if n < SIEVE_LIMIT * SIEVE_LIMIT:
+        # No factor below sqrt(n)
+        return True
+
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in DETERMINISTIC_BASES:
+        if not _miller_rabin(n, d, s, a):
+            return False
+    if n < 1 << 64:
+        return True
+
+    # Error probability below 4^-rounds
+    for _ in range(rounds):
+        if not _miller_rabin(n, d, s, random.randrange(2, n - 1)):
+            return False
+    return True
+
+def random_prime(bits, rounds=8):
+    """Random prime of exactly `bits` bits. The two top bits are set so that the
+    product of two such primes has exactly 2 * bits bits (RSA modulus size).
+    Candidates start + 2k are sieved by the small primes in one pass over a window,
+    so Miller-Rabin only runs on the few survivors."""
+    if bits < 3:
+        raise ValueError("Servono almeno 3 bit.")
+    if bits <= 32:
+        while True:
+            candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+            if is_prime(candidate):
+                return candidate
+
+    primes = small_primes(SEARCH_SIEVE_LIMIT)[1:]
+    while True:
+        start = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        window = bytearray([1]) * SEARCH_WINDOW
+        for p in primes:
+            # first k with start + 2k = 0 (mod p); (p + 1) // 2 is the inverse of 2
+            k = (p - start % p) * ((p + 1) // 2) % p
+            window[k::p] = bytes(len(range(k, SEARCH_WINDOW, p)))
+        k = window.find(1)
+        while k != -1:
+            candidate = start + 2 * k
+            if candidate.bit_length() != bits:
+                break
+            if is_prime(candidate, rounds):
+                return candidate
+            k = window.find(1, k + 1)
+
+def random_safe_prime(bits):
+    """Random safe prime p = 2q + 1 (q prime) of exactly `bits` bits. The window sieve strikes
+    both q and 2q + 1 multiples of the small primes, so very few candidates reach Miller-Rabin."""
+    if bits < 6:
+        raise ValueError("Servono almeno 6 bit.")
+    if bits <= 32:
+        while True:
+            q = random_prime(bits - 1)
+            if is_prime(2 * q + 1):
+                return 2 * q + 1
+
+    primes = small_primes(SEARCH_SIEVE_LIMIT)[1:]
+    while True:
+        start = secrets.randbits(bits - 1) | (3 << (bits - 3)) | 1
+        window = bytearray([1]) * SEARCH_WINDOW
+        for r in primes:
+            inv2 = (r + 1) // 2
+            rem = start % r
+            # q = start + 2k divisible by r, or 2q + 1 divisible by r (q = (r - 1) / 2 mod r)
+            k = (r - rem) * inv2 % r
+            window[k::r] = bytes(len(range(k, SEARCH_WINDOW, r)))
+            k = ((r - 1) // 2 - rem) * inv2 % r
+            window[k::r] = bytes(len(range(k, SEARCH_WINDOW, r)))
+        k = window.find(1)
+        while k != -1:
+            q = start + 2 * k
+            if q.bit_length() != bits - 1:
+                break
+            # Cheap base-2 Fermat test on p first: most composites are rejected there
+            p = 2 * q + 1
+            if pow(2, p - 1, p) == 1 and is_prime(q, 8) and is_prime(p, 8):
+                return p
+            k = window.find(1, k + 1)
+
+# --- Factorization and Generators ---
+
+# Pollard's rho gives up after this many iterations per attempt (three attempts): enough for
+# factors up to roughly 36 bits, at most a couple of seconds; p - 1 with a composite cofactor of
+# larger primes is rejected instead of blocking the request
+RHO_MAX_ITERATIONS = 1 << 18
+RHO_ATTEMPTS = 3
+
+def _pollard_brent(n):
+    """A non-trivial factor of the composite n, or None if none was found in time."""
+    if n % 2 == 0:
+        return 2
+    for c in range(1, RHO_ATTEMPTS + 1):
+        y, m, g, r, q = random.randrange(1, n), 128, 1, 1, 1
+        x = ys = y
+        iterations = 0
+        while g == 1 and iterations < RHO_MAX_ITERATIONS:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            iterations += r
+            r *= 2
+        if g == n:
+            # Backtrack one step at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if 1 < g < n:
+            return g
+    return None
+
+@lru_cache(maxsize=64)
+def prime_factors(n):
+    """Distinct prime factors of n, sorted. Trial division by the small primes, then
+    Pollard's rho (Brent) on what is left. ValueError if a cofactor resists factoring."""
+    factors = set()
+    for p in small_primes():
+        if n % p == 0:
+            factors.add(p)
+            while n % p == 0:
+                n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors.add(m)
+            continue
+        d = _pollard_brent(m)
+        if d is None:
+            raise ValueError("Impossibile fattorizzare p - 1 in tempi ragionevoli: usare un primo sicuro.")
+        stack.extend((d, m // d))
+    return tuple(sorted(factors))
+
+@lru_cache(maxsize=64)
+def find_generator(p):
+    """Smallest generator of Z_p^*: g is a primitive root iff g^((p-1)/q) != 1 for every
+    prime factor q of p - 1. Cached per p."""
+    if not is_prime(p):
+        raise ValueError("p deve essere primo.")
+    if p == 2:
+        return 1
+    factors = prime_factors(p - 1)
+    for g in range(2, p):
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
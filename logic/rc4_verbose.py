@@ -0,0 +1,200 @@
+# RC4
+# KSA: S = [0..n-1] permuted by the key; PRGA: i = i + 1, j = j + S[i], swap, output S[S[i] + S[j]].
+# Bulk encryption generates the whole keystream into a bytearray and XORs it with the data as
+# two big integers (int.from_bytes), never byte by byte in Python.
+# States after the KSA (and after discarding the first `drop` bytes, RC4-drop[N]) are kept in
+# an LRU per (key, drop): repeated encryptions with the same key skip the KSA.
+
+import time
+import threading
+from collections import OrderedDict
+
+RC4_STATE_CACHE_SIZE = 64
+
+# Largest RC4-drop[N]: the discarded bytes run through the Python PRGA on every cache miss
+# and each distinct drop is its own cache entry (3072 is the usual recommendation)
+MAX_DROP = 4096
+
+# Trace limits: the verbose trace is for teaching, bulk data goes through rc4_crypt
+TRACE_MAX_BYTES = 256
+TRACE_STATE_SIZES = (8, 16, 256)
+
+_state_cache = OrderedDict()
+_state_cache_lock = threading.Lock()
+_state_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_state_cache_maxsize = RC4_STATE_CACHE_SIZE
+
+def rc4_ksa(key, n=256):
+    if not key:
+        raise ValueError("La chiave RC4 non può essere vuota.")
+    S = list(range(n))
+    j = 0
+    key_len = len(key)
+    for i in range(n):
+        j = (j + S[i] + key[i % key_len]) % n
+        S[i], S[j] = S[j], S[i]
+    return S
+
+def _prga_into(S, i, j, out):
+    """Fills out (bytearray) with keystream bytes from state (S, i, j); returns the new (i, j)."""
+    for k in range(len(out)):
+        i = (i + 1) & 0xFF
+        si = S[i]
+        j = (j + si) & 0xFF
+        sj = S[j]
+        S[i] = sj
+        S[j] = si
+        out[k] = S[(si + sj) & 0xFF]
+    return i, j
+
+def _check_drop(drop):
+    if not 0 <= drop <= MAX_DROP:
+        raise ValueError(f"drop deve essere compreso tra 0 e {MAX_DROP}.")
+
+def get_rc4_state(key, drop=0):
+    """(S, i, j) after the KSA and `drop` discarded bytes, cached per (key, drop). Returns a copy."""
+    _check_drop(drop)
+    cache_key = (bytes(key), drop)
+    with _state_cache_lock:
+        state = _state_cache.get(cache_key)
+        if state is not None:
+            _state_cache.move_to_end(cache_key)
+            _state_cache_stats["hits"] += 1
+            S, i, j = state
+            return bytearray(S), i, j
+        _state_cache_stats["misses"] += 1
+
+    S = bytearray(rc4_ksa(key))
+    i = j = 0
+    if drop:
+        i, j = _prga_into(S, 0, 0, bytearray(drop))
+
+    with _state_cache_lock:
+        if _state_cache_maxsize > 0:
+            _state_cache[cache_key] = (bytes(S), i, j)
+            while len(_state_cache) > _state_cache_maxsize:
+                _state_cache.popitem(last=False)
+                _state_cache_stats["evictions"] += 1
+    return S, i, j
+
+def rc4_keystream(key, length, drop=0):
+    S, i, j = get_rc4_state(key, drop)
+    out = bytearray(length)
+    _prga_into(S, i, j, out)
+    return out
+
+def rc4_crypt(data, key, drop=0):
+    """Encrypts or decrypts (same operation) data with RC4-drop[drop]."""
+    _check_drop(drop)
+    if not data:
+        return b''
+    keystream = rc4_keystream(key, len(data), drop)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(len(data), 'big')
+
+def configure_rc4_cache(maxsize):
+    """Changes the number of cached states (0 disables the cache)."""
+    global _state_cache_maxsize
+    if maxsize < 0:
+        raise ValueError("La dimensione della cache non può essere negativa.")
+    with _state_cache_lock:
+        _state_cache_maxsize = maxsize
+        while len(_state_cache) > maxsize:
+            _state_cache.popitem(last=False)
+            _state_cache_stats["evictions"] += 1
+
+def clear_rc4_cache():
+    with _state_cache_lock:
+        _state_cache.clear()
+        for name in _state_cache_stats:
+            _state_cache_stats[name] = 0
+
+def rc4_cache_stats():
+    with _state_cache_lock:
+        return dict(_state_cache_stats, size=len(_state_cache), maxsize=_state_cache_maxsize)
+
+# --- Verbose Trace ---
+
+def rc4_trace(key, length, n=256, drop=0):
+    """KSA and the first `length` PRGA outputs step by step. n = 8 or 16 gives the reduced
+    Mini-RC4 of the page (key values taken mod n)."""
+    if n not in TRACE_STATE_SIZES:
+        raise ValueError(f"Dimensione dello stato non supportata: {n}. Ammesse: {', '.join(map(str, TRACE_STATE_SIZES))}")
+    if not 0 <= length <= TRACE_MAX_BYTES or not 0 <= drop <= TRACE_MAX_BYTES:
+        raise ValueError(f"Il trace copre al massimo {TRACE_MAX_BYTES} byte.")
+    if not key:
+        raise ValueError("La chiave RC4 non può essere vuota.")
+    key = [k % n for k in key]
+
+    ksa = []
+    S = list(range(n))
+    j = 0
+    for i in range(n):
+        j_new = (j + S[i] + key[i % len(key)]) % n
+        ksa.append({
+            "i": i,
+            "j": j_new,
+            "desc": f"j = ({j} + S[{i}]({S[i]}) + K[{i % len(key)}]({key[i % len(key)]})) mod {n} = {j_new}; scambio S[{i}] ↔ S[{j_new}]"
+        })
+        j = j_new
+        S[i], S[j] = S[j], S[i]
+        if n <= 16:
+            ksa[-1]["state"] = list(S)
+    state_after_ksa = list(S)
+
+    prga = []
+    keystream = []
+    i = j = 0
+    for k in range(drop + length):
+        i = (i + 1) % n
+        j = (j + S[i]) % n
+        S[i], S[j] = S[j], S[i]
+        t = (S[i] + S[j]) % n
+        if k < drop:
+            continue
+        keystream.append(S[t])
+        step = {
+            "i": i,
+            "j": j,
+            "t": t,
+            "k": S[t],
+            "desc": f"i = {i}, j = {j}, scambio S[{i}] ↔ S[{j}], t = (S[{i}] + S[{j}]) mod {n} = {t}, K = S[{t}] = {S[t]}"
+        }
+        if n <= 16:
+            step["state"] = list(S)
+        prga.append(step)
+
+    return {
+        "n": n,
+        "key": key,
+        "drop": drop,
+        "ksa": ksa,
+        "state_after_ksa": state_after_ksa,
+        "prga": prga,
+        "keystream": keystream
+    }
+
+# --- Benchmark ---
+
+def rc4_benchmark(size=1 << 20, rounds=5):
+    """MB/s of rc4_crypt with a cold and a warm state cache, and cost of the KSA alone."""
+    data = bytes(size)
+    key = b"benchmark-key"
+    start = time.perf_counter()
+    for _ in range(rounds * 20):
+        rc4_ksa(key)
+    ksa_ms = (time.perf_counter() - start) / (rounds * 20) * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        rc4_crypt(data, key, 3072)
+    elapsed = time.perf_counter() - start
+    return {
+        "size": size,
+        "ksa_ms": round(ksa_ms, 4),
+        "mb_per_s": round(size * rounds / elapsed / 1e6, 2),
+        "cache": rc4_cache_stats()
+    }
+
+if __name__ == '__main__':
+    r = rc4_benchmark()
+    print(f"RC4: {r['mb_per_s']} MB/s, KSA {r['ksa_ms']} ms")
@@ -1,4 +1,26 @@
+import os
 import random
+import time
+import hashlib
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from logic.number_theory import is_prime, random_prime, json_int, short_number
+
+# Real-size keys: standard public exponent, modulus size limits in bits
+PUBLIC_EXPONENT = 65537
+MIN_BITS = 1024
+MAX_BITS = 4096
+
+# Packed mode: RSAES-OAEP (PKCS#1 v2.2) with SHA-256 and MGF1-SHA-256
+OAEP_HASH = hashlib.sha256
+OAEP_HLEN = 32
+
+# Batch decryption: at least this many distinct ciphertexts go to the process pool
+BATCH_PARALLEL_THRESHOLD = 64
+BATCH_WORKERS = os.cpu_count() or 1
+
+_pool = None
 
 def gcd(a, b):
     while b:
@@ -28,14 +50,6 @@ def multiplicative_inverse(e, phi):
         
     if temp_phi == 1:
         return d + phi
-    
-def is_prime(num):
-    if num < 2:
-        return False
-    for i in range(2, int(num ** 0.5) + 1):
-        if num % i == 0:
-            return False
-    return True
 
 def generate_keypair(p, q):
     if not (is_prime(p) and is_prime(q)):
@@ -98,6 +112,158 @@ def generate_keypair(p, q):
         "steps": steps
     }
 
+def crt_params(p, q, d):
+    """dP, dQ, qInv for decryption with the Chinese Remainder Theorem."""
+    return {
+        "p": p,
+        "q": q,
+        "dP": d % (p - 1),
+        "dQ": d % (q - 1),
+        "qInv": pow(q, -1, p)
+    }
+
+def validate_crt(crt, d, n):
+    """CRT parameters from client input: p * q must equal n, and any given dP, dQ, qInv must
+    match the values derived from d, p and q (wrong ones would silently give a wrong plaintext)."""
+    p, q = int(crt['p']), int(crt['q'])
+    if p * q != n:
+        raise ValueError("p * q non corrisponde a n.")
+    params = crt_params(p, q, d)
+    for name in ('dP', 'dQ', 'qInv'):
+        if crt.get(name) and int(crt[name]) != params[name]:
+            raise ValueError(f"{name} non corrisponde a d, p e q.")
+    return params
+
+def generate_keypair_large(bits=2048):
+    """Real-size key pair: random primes of bits/2 bits each, e = 65537 and the CRT parameters.
+    Large values are returned as strings."""
+    if not MIN_BITS <= bits <= MAX_BITS or bits % 2:
+        raise ValueError(f"La dimensione della chiave deve essere un numero pari di bit tra {MIN_BITS} e {MAX_BITS}.")
+
+    e = PUBLIC_EXPONENT
+    while True:
+        p = random_prime(bits // 2)
+        q = random_prime(bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and (p * q).bit_length() == bits and phi % e and (p - 1) % e and (q - 1) % e:
+            break
+    n = p * q
+    d = pow(e, -1, phi)
+    crt = crt_params(p, q, d)
+
+    steps = [
+        {
+            "step": "1. Generazione dei Primi p e q",
+            "formula": f"p = {short_number(p)}, q = {short_number(q)}",
+            "result": f"{bits // 2} bit ciascuno",
+            "desc": "I candidati casuali vengono prima setacciati con i primi piccoli e poi sottoposti al test di Miller-Rabin. I due bit più alti sono impostati a 1 così che n abbia esattamente la dimensione richiesta."
+        },
+        {
+            "step": "2. Calcolo del Modulo (n)",
+            "formula": f"n = p * q = {short_number(n)}",
+            "result": str(n),
+            "desc": f"Il modulo ha {n.bit_length()} bit."
+        },
+        {
+            "step": "3. Calcolo della Funzione di Eulero φ(n)",
+            "formula": f"φ(n) = (p - 1) * (q - 1) = {short_number(phi)}",
+            "result": str(phi),
+            "desc": "φ(n) resta segreto: serve solo per calcolare d."
+        },
+        {
+            "step": "4. Esponente Pubblico (e)",
+            "formula": f"e = {e} = 2^16 + 1",
+            "result": e,
+            "desc": "Nelle chiavi reali si usa e = 65537: è primo, coprimo con φ(n) (verificato) e ha solo due bit a 1, quindi la cifratura richiede 17 moltiplicazioni modulari."
+        },
+        {
+            "step": "5. Calcolo dell'Esponente Privato (d)",
+            "formula": f"d = e^(-1) mod φ(n) = {short_number(d)}",
+            "result": str(d),
+            "desc": "d è l'inverso moltiplicativo di e modulo φ(n) (algoritmo di Euclide esteso)."
+        },
+        {
+            "step": "6. Parametri CRT (dP, dQ, qInv)",
+            "formula": "dP = d mod (p - 1), dQ = d mod (q - 1), qInv = q^(-1) mod p",
+            "result": f"dP = {short_number(crt['dP'])}, dQ = {short_number(crt['dQ'])}, qInv = {short_number(crt['qInv'])}",
+            "desc": "Con il Teorema Cinese del Resto la decifratura esegue due esponenziazioni con moduli ed esponenti di metà dimensione invece di una sola completa: circa 3-4 volte più veloce."
+        },
+    ]
+
+    return {
+        "public": (e, str(n)),
+        "private": (str(d), str(n)),
+        "phi": str(phi),
+        "crt": {k: str(v) for k, v in crt.items()},
+        "bits": n.bit_length(),
+        "steps": steps
+    }
+
+def rsa_decrypt_crt(c, crt):
+    """m = c^d mod n via CRT: m1 = c^dP mod p, m2 = c^dQ mod q, h = qInv * (m1 - m2) mod p, m = m2 + h * q."""
+    p, q = crt["p"], crt["q"]
+    m1 = pow(c, crt["dP"], p)
+    m2 = pow(c, crt["dQ"], q)
+    h = crt["qInv"] * (m1 - m2) % p
+    return m2 + h * q
+
+# --- Batch Decryption ---
+# Per-character RSA is deterministic, so a long text has only as many distinct ciphertexts
+# as distinct characters: each one is decrypted once (CRT when available) and the results
+# are mapped back. Large sets of distinct values are split across a process pool.
+
+def configure_batch(threshold=None, workers=None):
+    """Changes the pool threshold (distinct ciphertexts) and/or worker count."""
+    global BATCH_PARALLEL_THRESHOLD, BATCH_WORKERS, _pool
+    if threshold is not None:
+        BATCH_PARALLEL_THRESHOLD = threshold
+    if workers is not None and workers != BATCH_WORKERS:
+        BATCH_WORKERS = workers
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return _pool
+
+def _decrypt_values(values, d, n, crt):
+    if crt:
+        return [rsa_decrypt_crt(c, crt) for c in values]
+    return [pow(c, d, n) for c in values]
+
+def rsa_decrypt_batch(cipher, private_key, crt=None, parallel=None):
+    """Decrypts a list of ciphertexts (ints or decimal strings) with one key.
+    Returns (plain values in input order, stats)."""
+    d, n = int(private_key[0]), int(private_key[1])
+    values = [int(c) for c in cipher]
+    distinct = list(dict.fromkeys(values))
+    if any(not 0 <= c < n for c in distinct):
+        raise ValueError("Valore cifrato fuori dal modulo.")
+
+    if parallel is None:
+        parallel = len(distinct) >= BATCH_PARALLEL_THRESHOLD and BATCH_WORKERS > 1
+    start = time.perf_counter()
+    if parallel and len(distinct) > 1:
+        per_part = -(-len(distinct) // (BATCH_WORKERS * 4))
+        parts = [distinct[i:i + per_part] for i in range(0, len(distinct), per_part)]
+        count = len(parts)
+        results = [m for chunk in _get_pool().map(_decrypt_values, parts, [d] * count, [n] * count, [crt] * count) for m in chunk]
+    else:
+        results = _decrypt_values(distinct, d, n, crt)
+    elapsed = time.perf_counter() - start
+
+    memo = dict(zip(distinct, results))
+    return [memo[c] for c in values], {
+        "ciphertexts": len(values),
+        "distinct": len(distinct),
+        "crt": bool(crt),
+        "parallel": bool(parallel and len(distinct) > 1),
+        "elapsed_ms": round(elapsed * 1000, 3)
+    }
+
 def rsa_encrypt_verbose(text, public_key):
     try:
         e, n = public_key
@@ -109,7 +275,7 @@ def rsa_encrypt_verbose(text, public_key):
         
         steps.append({
             "type": "info",
-            "message": f"Cifratura usando la Chiave Pubblica (e={e}, n={n})"
+            "message": f"Cifratura usando la Chiave Pubblica (e={e}, n={short_number(n)})"
         })
         
         for char in text:
@@ -119,14 +285,14 @@ def rsa_encrypt_verbose(text, public_key):
             
             # c = (m ^ e) % n
             c = pow(m, e, n)
-            cipher.append(c)
+            cipher.append(json_int(c))
             
             steps.append({
                 "type": "step",
                 "char": char,
                 "m": m,
-                "formula": f"{m}^{e} mod {n}",
-                "result": c
+                "formula": f"{m}^{e} mod {short_number(n)}",
+                "result": short_number(c)
             })
             
         return {
@@ -136,7 +302,9 @@ def rsa_encrypt_verbose(text, public_key):
     except Exception as e:
         return {"error": str(e)}
 
-def rsa_decrypt_verbose(cipher, private_key):
+def rsa_decrypt_verbose(cipher, private_key, crt=None, parallel=None):
+    """crt: optional dict with p, q, dP, dQ, qInv; when given, every value is decrypted via CRT.
+    Repeated ciphertexts are decrypted once (see rsa_decrypt_batch)."""
     try:
         d, n = private_key
         steps = []
@@ -145,12 +313,27 @@ def rsa_decrypt_verbose(cipher, private_key):
         
         steps.append({
             "type": "info",
-            "message": f"Decifratura usando la Chiave Privata (d={d}, n={n})"
+            "message": f"Decifratura usando la Chiave Privata (d={short_number(d)}, n={short_number(n)})"
+        })
+        if crt:
+            steps.append({
+                "type": "info",
+                "message": f"CRT: m1 = c^dP mod p, m2 = c^dQ mod q, m = m2 + q * (qInv * (m1 - m2) mod p), con p e q di {crt['p'].bit_length()} e {crt['q'].bit_length()} bit"
+            })
+
+        values, stats = rsa_decrypt_batch(cipher, private_key, crt, parallel)
+        steps.append({
+            "type": "info",
+            "message": f"{stats['ciphertexts']} valori cifrati, {stats['distinct']} distinti: RSA senza padding è deterministico, quindi ogni valore distinto viene decifrato una sola volta."
         })
         
-        for char_code in cipher:
-            # m = (c ^ d) % n
-            m = pow(char_code, d, n)
+        for char_code, m in zip(cipher, values):
+            char_code = int(char_code)
+            if crt:
+                formula = f"CRT({short_number(char_code)}) mod {short_number(n)}"
+            else:
+                # m = (c ^ d) % n
+                formula = f"{short_number(char_code)}^{short_number(d)} mod {short_number(n)}"
             
             try:
                 char = chr(m)
@@ -161,15 +344,105 @@ def rsa_decrypt_verbose(cipher, private_key):
             
             steps.append({
                 "type": "step",
-                "c": char_code,
-                "formula": f"{char_code}^{d} mod {n}",
+                "c": short_number(char_code),
+                "formula": formula,
                 "result_m": m,
                 "result_char": char
             })
             
         return {
             "plaintext": "".join(plain),
-            "steps": steps
+            "steps": steps,
+            "stats": stats
         }
     except Exception as e:
         return {"error": str(e)}
+
+# --- Packed Mode (OAEP) ---
+# Instead of one pow() per character, the message bytes are split into blocks as large
+# as the modulus allows (k - 2 * hLen - 2 bytes, k = byte length of n) and every block
+# is OAEP-padded and encrypted with a single modular exponentiation.
+
+def _mgf1(seed, length):
+    out = bytearray()
+    counter = 0
+    while len(out) < length:
+        out += OAEP_HASH(seed + counter.to_bytes(4, 'big')).digest()
+        counter += 1
+    return bytes(out[:length])
+
+def _xor(a, b):
+    return bytes(x ^ y for x, y in zip(a, b))
+
+def oaep_block_size(n):
+    """Message bytes per block for modulus n."""
+    k = (n.bit_length() + 7) // 8
+    size = k - 2 * OAEP_HLEN - 2
+    if size < 1:
+        raise ValueError(f"Modulo troppo piccolo per OAEP: servono almeno {(2 * OAEP_HLEN + 3) * 8} bit.")
+    return size
+
+def oaep_pad(message, k, label=b''):
+    l_hash = OAEP_HASH(label).digest()
+    ps = bytes(k - len(message) - 2 * OAEP_HLEN - 2)
+    db = l_hash + ps + b'\x01' + message
+    seed = secrets.token_bytes(OAEP_HLEN)
+    masked_db = _xor(db, _mgf1(seed, k - OAEP_HLEN - 1))
+    masked_seed = _xor(seed, _mgf1(masked_db, OAEP_HLEN))
+    return b'\x00' + masked_seed + masked_db
+
+def oaep_unpad(encoded, k, label=b''):
+    l_hash = OAEP_HASH(label).digest()
+    masked_seed = encoded[1:1 + OAEP_HLEN]
+    masked_db = encoded[1 + OAEP_HLEN:]
+    seed = _xor(masked_seed, _mgf1(masked_db, OAEP_HLEN))
+    db = _xor(masked_db, _mgf1(seed, k - OAEP_HLEN - 1))
+    separator = db.find(b'\x01', OAEP_HLEN)
+    if encoded[0] != 0 or db[:OAEP_HLEN] != l_hash or separator < 0 or any(db[OAEP_HLEN:separator]):
+        raise ValueError("Decifratura OAEP non valida.")
+    return db[separator + 1:]
+
+def _throughput(nbytes, elapsed, modexps, modexps_per_char):
+    return {
+        "bytes": nbytes,
+        "elapsed_ms": round(elapsed * 1000, 3),
+        "kb_per_s": round(nbytes / elapsed / 1024, 3) if elapsed else None,
+        "modexp": modexps,
+        "modexp_per_char_mode": modexps_per_char
+    }
+
+def rsa_encrypt_packed(data, public_key):
+    """Encrypts bytes in OAEP blocks. Returns the ciphertext blocks as hex and throughput stats."""
+    e, n = int(public_key[0]), int(public_key[1])
+    k = (n.bit_length() + 7) // 8
+    size = oaep_block_size(n)
+
+    start = time.perf_counter()
+    blocks = []
+    for i in range(0, len(data), size):
+        m = int.from_bytes(oaep_pad(data[i:i + size], k), 'big')
+        blocks.append(pow(m, e, n).to_bytes(k, 'big').hex())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "packed",
+        "ciphertext": blocks,
+        "block_size": size,
+        "ciphertext_bytes": len(blocks) * k,
+        "stats": _throughput(len(data), elapsed, len(blocks), len(data))
+    }
+
+def rsa_decrypt_packed(blocks, private_key, crt=None):
+    d, n = int(private_key[0]), int(private_key[1])
+    k = (n.bit_length() + 7) // 8
+
+    start = time.perf_counter()
+    values, _ = rsa_decrypt_batch([int(block, 16) for block in blocks], (d, n), crt)
+    plaintext = b''.join(oaep_unpad(m.to_bytes(k, 'big'), k) for m in values)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": "packed",
+        "plaintext": plaintext,
+        "stats": _throughput(len(plaintext), elapsed, len(blocks), len(plaintext))
+    }
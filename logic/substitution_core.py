@@ -0,0 +1,112 @@
+# Shared engine of the letter substitution ciphers (Caesar, monoalphabetic, Vigenère, Vernam)
+# Text is reduced once to ASCII bytes A-Z; the whole ciphertext is then produced by C loops:
+# - fixed alphabets (Caesar, monoalphabetic): bytes.translate with a 256-byte table
+# - key addition (Vigenère, Vernam): (p + k) mod 26 on uint8 arrays with NumPy when it is
+#   installed; otherwise p and k (as 0..25) are added as two big integers, which cannot carry
+#   between bytes because every sum is at most 50, and a translate table reduces mod 26.
+# Step dicts are only built for a window of letters (step_start, step_count).
+
+import time
+import secrets
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # optional: the big-integer path gives the same result
+    np = None
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_ALPHABET_BYTES = ALPHABET.encode('ascii')
+
+# Step dicts returned when no window is given (pages animate every step of short texts)
+STEP_WINDOW_DEFAULT = 500
+STEP_WINDOW_MAX = 5000
+
+# Every byte that is not A-Z, deleted with translate(None, ...)
+_NON_LETTERS = bytes(b for b in range(256) if not 65 <= b <= 90)
+# 'A'..'Z' -> 0..25 and back; sums 0..50 -> letter of (sum mod 26)
+_TO_INDEX = bytes.maketrans(_ALPHABET_BYTES, bytes(range(26)))
+_FROM_SUM = bytes.maketrans(bytes(range(51)), bytes(65 + v % 26 for v in range(51)))
+# Random bytes 0..233 -> letter of (byte mod 26); 234..255 are rejected so letters stay uniform
+_RANDOM_REJECT = bytes(range(234, 256))
+_FROM_RANDOM = bytes.maketrans(bytes(range(234)), bytes(65 + v % 26 for v in range(234)))
+
+def clean_letters(text):
+    """Uppercase ASCII letters of text as bytes (everything else dropped)."""
+    return text.upper().encode('ascii', 'ignore').translate(None, _NON_LETTERS)
+
+@lru_cache(maxsize=64)
+def substitution_table(cipher_alphabet):
+    """translate table A-Z -> cipher_alphabet (26 letters)."""
+    return bytes.maketrans(_ALPHABET_BYTES, cipher_alphabet.encode('ascii'))
+
+def shift_alphabet(shift):
+    shift %= 26
+    return ALPHABET[shift:] + ALPHABET[:shift]
+
+def substitute(letters, cipher_alphabet):
+    return letters.translate(substitution_table(cipher_alphabet))
+
+def expand_key(key_letters, length):
+    """Key repeated (or truncated) to length letters."""
+    return (key_letters * (length // len(key_letters) + 1))[:length]
+
+def add_key(letters, key_letters):
+    """(p + k) mod 26 letter by letter; key_letters as long as letters."""
+    if not letters:
+        return b''
+    if np is not None:
+        p = np.frombuffer(letters, dtype=np.uint8) - 65
+        k = np.frombuffer(key_letters, dtype=np.uint8) - 65
+        return ((p + k) % 26 + 65).astype(np.uint8).tobytes()
+    total = (int.from_bytes(letters.translate(_TO_INDEX), 'big')
+             + int.from_bytes(key_letters.translate(_TO_INDEX), 'big'))
+    return total.to_bytes(len(letters), 'big').translate(_FROM_SUM)
+
+def random_letters(length):
+    """length uniformly random letters A-Z from secrets."""
+    out = b''
+    while len(out) < length:
+        out += secrets.token_bytes(length - len(out) + 32).translate(None, _RANDOM_REJECT)
+    return out[:length].translate(_FROM_RANDOM)
+
+def step_window(total, step_start=0, step_count=None):
+    """range of letter indexes that get a step dict."""
+    start = max(0, min(int(step_start or 0), total))
+    count = STEP_WINDOW_DEFAULT if step_count is None else int(step_count)
+    return range(start, min(total, start + max(0, min(count, STEP_WINDOW_MAX))))
+
+# --- Benchmark ---
+
+def substitution_benchmark(size=10 * 1024 * 1024):
+    """ms for `size` letters: cleaning, Caesar (translate), Vigenère and Vernam (key addition)."""
+    text = ("Attack at dawn! " * (size // 16 + 1))[:size]
+    key = b"LEMON"
+    timings = {}
+
+    start = time.perf_counter()
+    letters = clean_letters(text)
+    timings["clean_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    substitute(letters, shift_alphabet(3))
+    timings["caesar_ms"] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    add_key(letters, expand_key(key, len(letters)))
+    timings["vigenere_ms"] = (time.perf_counter() - start) * 1000
+
+    pad = substitute(letters, shift_alphabet(11))
+    start = time.perf_counter()
+    add_key(letters, pad)
+    timings["vernam_ms"] = (time.perf_counter() - start) * 1000
+
+    result = {name: round(v, 1) for name, v in timings.items()}
+    result["letters"] = len(letters)
+    result["numpy"] = np is not None
+    return result
+
+if __name__ == '__main__':
+    r = substitution_benchmark()
+    print(f"{r['letters']} lettere (NumPy: {r['numpy']}): pulizia {r['clean_ms']} ms, "
+          f"Cesare {r['caesar_ms']} ms, Vigenère {r['vigenere_ms']} ms, Vernam {r['vernam_ms']} ms")
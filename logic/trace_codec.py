@@ -0,0 +1,110 @@
+# Compact Trace Encoding
+# Opt-in alternative to the nested dict/list JSON of the verbose AES and DES traces.
+# Numeric values travel as fixed-width big-endian fields in one base64 string,
+# described by a schema header; static/trace_codec.js rebuilds the usual structure.
+
+import base64
+
+COMPACT_MIME = 'application/vnd.trace-compact+json'
+
+def wants_compact(accept_header):
+    """True when the client asked for the compact format in the Accept header."""
+    return COMPACT_MIME in (accept_header or '')
+
+def _b64(data):
+    return base64.b64encode(bytes(data)).decode('ascii')
+
+# --- AES ---
+
+def encode_aes_trace(result):
+    """Every block has the same step sequence, so it is sent once as the schema.
+    Round keys are the same for every block and go in the header; the payload only holds
+    the 16 state bytes per step, row by row."""
+    blocks = result.get('blocks', [])
+    encoded = {k: v for k, v in result.items() if k != 'blocks'}
+
+    schema = []
+    keys = bytearray()
+    if blocks:
+        for step in blocks[0]:
+            has_key = 'key' in step
+            schema.append([step['round'], step['step'], 1 if has_key else 0, step.get('description')])
+            if has_key:
+                for row in step['key']:
+                    keys.extend(row)
+
+    states = bytearray()
+    for block_steps in blocks:
+        for step in block_steps:
+            for row in step['state']:
+                states.extend(row)
+
+    encoded.update({
+        'format': 'aes-trace-v1',
+        'num_trace_blocks': len(blocks),
+        'schema': schema,
+        'keys': _b64(keys),
+        'states': _b64(states)
+    })
+    return encoded
+
+# --- DES ---
+
+# Per round: (field, bits). l_prev/r_prev are the previous round's l_new/r_new,
+# the S-box details are slices of xor_key and sbox_out, k_bin/k_hex equal key_round.
+DES_ROUND_FIELDS = (
+    ('key_round', 48),
+    ('expansion', 48),
+    ('xor_key', 48),
+    ('sbox_out', 32),
+    ('p_perm', 32),
+    ('l_new', 32),
+    ('r_new', 32),
+    ('c_prev', 28),
+    ('d_prev', 28),
+    ('c_new', 28),
+    ('d_new', 28),
+    ('shift', 8),
+)
+
+def _put(buf, value, bits):
+    buf.extend(value.to_bytes((bits + 7) // 8, 'big'))
+
+def encode_des_trace(result):
+    steps = result['steps']
+    init, ip, rounds, fp = steps[0], steps[1], steps[2:-1], steps[-1]
+
+    data = bytearray()
+    _put(data, int(init['input_hex'], 16), 64)
+    _put(data, int(ip['state_hex'], 16), 64)
+    for step in rounds:
+        details = step['details']
+        schedule = details['key_schedule']
+        values = {
+            'key_round': int(details['key_round'], 16),
+            'expansion': int(details['expansion'], 16),
+            'xor_key': int(details['xor_key'], 16),
+            'sbox_out': int(details['sbox_out'], 16),
+            'p_perm': int(details['p_perm'], 16),
+            'l_new': int(details['l_new'], 16),
+            'r_new': int(details['r_new'], 16),
+            'c_prev': int(schedule['c_prev'], 2),
+            'd_prev': int(schedule['d_prev'], 2),
+            'c_new': int(schedule['c_new'], 2),
+            'd_new': int(schedule['d_new'], 2),
+            'shift': schedule['shift'],
+        }
+        for name, bits in DES_ROUND_FIELDS:
+            _put(data, values[name], bits)
+    _put(data, int(fp['pre_fp_hex'], 16), 64)
+    _put(data, int(fp['ciphertext_hex'], 16), 64)
+
+    encoded = {k: v for k, v in result.items() if k != 'steps'}
+    encoded.update({
+        'format': 'des-trace-v1',
+        'rounds': len(rounds),
+        'descriptions': [init['description'], ip['description'], fp['description']],
+        'round_fields': [list(f) for f in DES_ROUND_FIELDS],
+        'data': _b64(data)
+    })
+    return encoded
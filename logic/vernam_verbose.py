@@ -1,40 +1,37 @@
-import secrets
+from logic.substitution_core import clean_letters, expand_key, add_key, random_letters, step_window
 
-def vernam_encrypt_verbose(text, key):
+def vernam_encrypt_verbose(text, key, step_start=0, step_count=None):
     if not text:
         return {"error": "Missing text"}
     
     # 1. Clean inputs: Only uppercase letters
-    text_clean = "".join([c.upper() for c in text if c.isalpha()])
+    letters = clean_letters(text)
     
-    if not text_clean:
+    if not letters:
          return {"error": "No valid letters in text"}
     
     # 2. Handle Key
     if not key:
         # Generate random key (A-Z)
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        key_clean = "".join(secrets.choice(chars) for _ in range(len(text_clean)))
-        key = key_clean 
+        key_letters = random_letters(len(letters))
         generated = True
     else:
-        key_clean = "".join([c.upper() for c in key if c.isalpha()])
-        if not key_clean:
+        key_letters = clean_letters(key)
+        if not key_letters:
              return {"error": "No valid letters in key"}
         generated = False
 
     # Adjust key length (Loop or truncate)
-    if len(key_clean) < len(text_clean):
-        repetitions = (len(text_clean) // len(key_clean)) + 1
-        key_clean = (key_clean * repetitions)[:len(text_clean)]
-    elif len(key_clean) > len(text_clean):
-        key_clean = key_clean[:len(text_clean)]
+    key_letters = expand_key(key_letters, len(letters))
         
-    # 3. Modular Addition
-    ciphertext = ""
+    # 3. Modular Addition on the whole text
+    ciphertext = add_key(letters, key_letters).decode('ascii')
+    text_clean = letters.decode('ascii')
+    key_clean = key_letters.decode('ascii')
+    window = step_window(len(text_clean), step_start, step_count)
     steps = []
     
-    for i in range(len(text_clean)):
+    for i in window:
         p_char = text_clean[i]
         k_char = key_clean[i]
         
@@ -43,10 +40,6 @@ def vernam_encrypt_verbose(text, key):
         
         # (P + K) % 26
         sum_idx = p_idx + k_idx
-        c_idx = sum_idx % 26
-        
-        c_char = chr(c_idx + ord('A'))
-        ciphertext += c_char
         
         steps.append({
             "index": i,
@@ -55,8 +48,8 @@ def vernam_encrypt_verbose(text, key):
             "k_char": k_char,
             "k_idx": k_idx,
             "sum_val": sum_idx, # Useful to show wrapping
-            "c_idx": c_idx,
-            "c_char": c_char
+            "c_idx": sum_idx % 26,
+            "c_char": ciphertext[i]
         })
         
     return {
@@ -64,5 +57,7 @@ def vernam_encrypt_verbose(text, key):
         "key_used": key_clean, # Return processed key
         "generated_key": generated,
         "ciphertext": ciphertext,
-        "steps": steps
+        "steps": steps,
+        "steps_start": window.start,
+        "total_letters": len(text_clean)
     }
@@ -1,4 +1,6 @@
-def vigenere_encrypt_verbose(text, key):
+from logic.substitution_core import clean_letters, expand_key, add_key, step_window
+
+def vigenere_encrypt_verbose(text, key, step_start=0, step_count=None):
     if not text:
         return {"error": "Missing text"}
     
@@ -6,35 +8,30 @@ def vigenere_encrypt_verbose(text, key):
         return {"error": "Missing key"}
         
     # 1. Clean inputs: Only uppercase letters
-    text_clean = "".join([c.upper() for c in text if c.isalpha()])
-    key_clean = "".join([c.upper() for c in key if c.isalpha()])
+    letters = clean_letters(text)
+    key_letters = clean_letters(key)
     
-    if not text_clean:
+    if not letters:
          return {"error": "No valid letters in text"}
-    if not key_clean:
+    if not key_letters:
          return {"error": "No valid letters in key"}
          
-    # 2. encryption
-    ciphertext = ""
-    steps = []
-    
-    # We want to show the full expanded key
-    full_key_display = ""
+    # 2. encryption: the key repeated under the text, (P + K) mod 26 on the whole arrays
+    full_key = expand_key(key_letters, len(letters))
+    ciphertext = add_key(letters, full_key).decode('ascii')
+    text_clean = letters.decode('ascii')
+    full_key_display = full_key.decode('ascii')
     
-    key_idx = 0
-    for i in range(len(text_clean)):
+    # 3. Steps only for the requested window
+    window = step_window(len(text_clean), step_start, step_count)
+    steps = []
+    for i in window:
         p_char = text_clean[i]
-        k_char = key_clean[key_idx % len(key_clean)]
-        full_key_display += k_char
+        k_char = full_key_display[i]
         
         p_val = ord(p_char) - ord('A')
         k_val = ord(k_char) - ord('A')
         
-        c_val = (p_val + k_val) % 26
-        c_char = chr(c_val + ord('A'))
-        
-        ciphertext += c_char
-        
         steps.append({
             "index": i,
             "p_char": p_char,
@@ -42,16 +39,16 @@ def vigenere_encrypt_verbose(text, key):
             "k_char": k_char,
             "k_val": k_val,
             "sum_val": p_val + k_val,
-            "c_val": c_val,
-            "c_char": c_char
+            "c_val": (p_val + k_val) % 26,
+            "c_char": ciphertext[i]
         })
         
-        key_idx += 1
-        
     return {
         "text": text_clean,
-        "key": key_clean,
+        "key": key_letters.decode('ascii'),
         "full_key": full_key_display,
         "ciphertext": ciphertext,
-        "steps": steps
+        "steps": steps,
+        "steps_start": window.start,
+        "total_letters": len(text_clean)
     }
@@ -118,12 +118,16 @@ function visualizeEncryption(data) {
     document.getElementById('ciphertext-display').textContent = '';
 
     setTimeout(() => {
-        animateSteps(data.steps, 0, shiftVal);
+        animateSteps(data.steps, 0, shiftVal, data.ciphertext);
     }, 1200); // Wait for 1s slide + buffer
 }
 
-function animateSteps(steps, index, shiftVal) {
-    if (index >= steps.length) return;
+function animateSteps(steps, index, shiftVal, ciphertext) {
+    if (index >= steps.length) {
+        // Steps cover only a window of long texts: show the full ciphertext from the server
+        document.getElementById('ciphertext-display').textContent = ciphertext;
+        return;
+    }
 
     const step = steps[index];
     const pChar = step.p_char;
@@ -161,6 +165,6 @@ function animateSteps(steps, index, shiftVal) {
         if (pCell) pCell.classList.remove('active');
         if (cCell) cCell.classList.remove('active');
 
-        animateSteps(steps, index + 1, shiftVal);
+        animateSteps(steps, index + 1, shiftVal, ciphertext);
     }, 800);
 }
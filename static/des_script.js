@@ -145,10 +145,10 @@ async function runDesEncryption() {
     try {
         const response = await fetch('/encrypt_des', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Accept': TRACE_COMPACT_MIME },
             body: JSON.stringify({ text, key })
         });
-        const data = await response.json();
+        const data = decodeDesTrace(await response.json());
 
         if (data.error) throw data.error;
 
@@ -1,18 +1,25 @@
 let globalP = null;
 let globalG = null;
+let globalGroup = null; // named group, if one was selected
 let privateA = null;
 let privateB = null;
 let publicA = null;
 let publicB = null;
 
 async function step1Setup() {
+    const bitsSelect = document.getElementById('dh-bits');
+    const choice = bitsSelect ? bitsSelect.value : '';
+    // Numeric values are safe-prime sizes, the others are named groups
+    let body = {};
+    if (/^\d+$/.test(choice)) body = { bits: choice };
+    else if (choice) body = { group: choice };
     try {
         const response = await fetch('/dh_step1_setup', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({})
+            body: JSON.stringify(body)
         });
         const data = await response.json();
 
@@ -20,6 +27,7 @@ async function step1Setup() {
 
         globalP = data.p;
         globalG = data.g;
+        globalGroup = data.group || null;
 
         document.getElementById('p-val').textContent = globalP;
         document.getElementById('g-val').textContent = globalG;
@@ -38,7 +46,7 @@ async function step2Keys() {
         const response = await fetch('/dh_step2_keys', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ p: globalP, g: globalG })
+            body: JSON.stringify({ p: globalP, g: globalG, group: globalGroup })
         });
         const data = await response.json();
 
@@ -3,21 +3,24 @@ let keyPair = null;
 let lastSignature = null;
 
 async function setupParameters() {
+    // "2048/256" -> L, N; empty for the small demo parameters
+    const size = document.getElementById('dsa-size').value;
+    const body = size ? { L: parseInt(size.split('/')[0]), N: parseInt(size.split('/')[1]) } : {};
     try {
         const response = await fetch('/dsa_setup', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({})
+            body: JSON.stringify(body)
         });
         const data = await response.json();
         if (data.error) { alert("Error: " + data.error); return; }
 
-        globalParams = data;
+        globalParams = { p: data.p, q: data.q, g: data.g };
         document.getElementById('params-display').innerHTML = `
             p = ${data.p}<br>
             q = ${data.q}<br>
             g = ${data.g}
-        `;
+        ` + (data.seed ? `<br>seed = ${data.seed}, counter = ${data.counter} (FIPS 186-4, ${data.L}/${data.N})` : '');
         document.getElementById('setup-results').classList.remove('hidden');
     } catch (e) {
         alert("Errore setup: " + e);
@@ -4,11 +4,13 @@ let bobKeys = null;
 let chart = null;
 
 async function setupCurve() {
+    const curveSelect = document.getElementById('curve-select');
+    const curveName = curveSelect ? curveSelect.value : '';
     try {
         const response = await fetch('/ecc_setup', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({})
+            body: JSON.stringify(curveName ? { curve: curveName } : {})
         });
         const data = await response.json();
 
@@ -16,6 +18,23 @@ async function setupCurve() {
 
         globalCurve = data;
 
+        aliceKeys = null;
+        bobKeys = null;
+
+        if (data.curve) {
+            // Standard curve: too many points to draw, values are hex
+            document.getElementById('curve-params-display').innerHTML = `
+                Curva ${data.curve}<br>
+                Modulo Primo p = 0x${data.p}<br>
+                Equazione: y² = x³ + ${data.a}x + 0x${data.b}<br>
+                Ordine n = 0x${data.n}<br>
+                Punto Generatore G = ${data.G.str}
+            `;
+            document.getElementById('setup-results').classList.remove('hidden');
+            if (chart) { chart.destroy(); chart = null; }
+            return;
+        }
+
         document.getElementById('curve-params-display').innerHTML = `
             Modulo Primo p = ${data.p}<br>
             Equazione: y² = x³ + ${data.a}x + ${data.b}<br>
@@ -29,21 +48,37 @@ async function setupCurve() {
     } catch (e) { alert("Setup Error: " + e); }
 }
 
-async function drawCurveGraph(curveData) {
-    try {
+const POINTS_PAGE_SIZE = 50000;
+
+// Fetches the curve points page by page (the server caches the full list per curve)
+async function fetchCurvePoints(curveData) {
+    const points = [];
+    let offset = 0;
+    while (offset !== null) {
         const response = await fetch('/ecc_get_points', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(curveData)
+            body: JSON.stringify(Object.assign({}, curveData, { offset: offset, limit: POINTS_PAGE_SIZE }))
         });
-        const data = await response.json();
-        if (data.error) throw data.error;
+        const page = await response.json();
+        if (page.error) throw page.error;
+        for (const pt of page.points) points.push(pt);
+        offset = page.next_offset;
+    }
+    return points;
+}
+
+async function drawCurveGraph(curveData) {
+    try {
+        const data = { points: await fetchCurvePoints(curveData) };
 
         const ctx = document.getElementById('eccChart').getContext('2d');
 
         // Prepare datasets
         // 1. All integer points on curve
         const scatterData = data.points.map(pt => ({ x: pt.x, y: pt.y }));
+        // Large fields: small dots and no animation, or the chart becomes unusable
+        const dense = scatterData.length > 2000;
 
         // Destroy old chart if exists
         if (chart) chart.destroy();
@@ -56,8 +91,8 @@ async function drawCurveGraph(curveData) {
                     data: scatterData,
                     backgroundColor: '#8b5cf6', // accent color
                     borderColor: '#8b5cf6',
-                    pointRadius: 6,
-                    pointHoverRadius: 8
+                    pointRadius: dense ? 1 : 6,
+                    pointHoverRadius: dense ? 3 : 8
                 }, {
                     label: 'Generatore G',
                     data: [{ x: curveData.G.x, y: curveData.G.y }],
@@ -70,6 +105,7 @@ async function drawCurveGraph(curveData) {
             },
             options: {
                 responsive: true,
+                animation: dense ? false : undefined,
                 scales: {
                     x: {
                         type: 'linear',
@@ -141,7 +177,7 @@ async function generateKeysAlice() {
         const response = await fetch('/ecc_generate_keys', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ p: globalCurve.p, a: globalCurve.a, G: globalCurve.G })
+            body: JSON.stringify(globalCurve.curve ? { curve: globalCurve.curve } : { p: globalCurve.p, a: globalCurve.a, G: globalCurve.G })
         });
         const data = await response.json();
 
@@ -162,7 +198,7 @@ async function generateKeysBob() {
         const response = await fetch('/ecc_generate_keys', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ p: globalCurve.p, a: globalCurve.a, G: globalCurve.G })
+            body: JSON.stringify(globalCurve.curve ? { curve: globalCurve.curve } : { p: globalCurve.p, a: globalCurve.a, G: globalCurve.G })
         });
         const data = await response.json();
 
@@ -189,7 +225,8 @@ async function calcSharedSecret() {
                 private_d: aliceKeys.private_d,
                 public_Q: bobKeys.public_Q,
                 p: globalCurve.p,
-                a: globalCurve.a
+                a: globalCurve.a,
+                curve: globalCurve.curve
             })
         });
         const dataA = await responseA.json();
@@ -202,7 +239,8 @@ async function calcSharedSecret() {
                 private_d: bobKeys.private_d,
                 public_Q: aliceKeys.public_Q,
                 p: globalCurve.p,
-                a: globalCurve.a
+                a: globalCurve.a,
+                curve: globalCurve.curve
             })
         });
         const dataB = await responseB.json();
@@ -2,13 +2,32 @@ document.addEventListener('DOMContentLoaded', () => {
     const input = document.getElementById('hash-input');
     const output = document.getElementById('hash-output');
 
+    // The digest comes from the server (hashlib): hashing in the browser on every keystroke
+    // froze slower devices on long inputs. The local implementation is only a fallback.
+    let pending = null;
+    let latest = 0;
+
     function updateHash() {
         const text = input.value;
+        clearTimeout(pending);
         if (!text) {
             output.innerText = "...";
             return;
         }
-        output.innerText = sha256_simple(text);
+        pending = setTimeout(async () => {
+            const id = ++latest;
+            try {
+                const response = await fetch('/hash_digest', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ algo: 'sha256', message: text })
+                });
+                const data = await response.json();
+                if (id === latest) output.innerText = data.error ? "Errore: " + data.error : data.digest;
+            } catch (e) {
+                if (id === latest) output.innerText = sha256_simple(text);
+            }
+        }, 150);
     }
 
     // Update on type (real-time)
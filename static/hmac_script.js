@@ -1,6 +1,8 @@
 async function calculateHMAC() {
     const key = document.getElementById('hmac-key').value;
     const msg = document.getElementById('hmac-msg').value;
+    const algoSelect = document.getElementById('hmac-algo');
+    const algo = algoSelect.value;
 
     if (!key || !msg) { alert("Inserisci chiave e messaggio."); return; }
 
@@ -8,13 +10,15 @@ async function calculateHMAC() {
         const response = await fetch('/hmac_calculate', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ key: key, message: msg })
+            body: JSON.stringify({ key: key, message: msg, algo: algo })
         });
         const data = await response.json();
 
         if (data.error) { alert("Errore: " + data.error); return; }
 
         document.getElementById('hmac-output').textContent = data.hmac;
+        document.getElementById('hmac-result-title').textContent =
+            `Risultato (HMAC-${algoSelect.options[algoSelect.selectedIndex].text})`;
         renderSteps(data.steps, 'hmac-steps');
         document.getElementById('results-area').classList.remove('hidden');
 
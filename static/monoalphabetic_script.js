@@ -107,6 +107,12 @@ function visualizeEncryption(data) {
             animateStep(step, index);
         }, index * 800);
     });
+
+    // Steps cover only a window of long texts: show the full ciphertext from the server
+    // once the last step has been drawn
+    setTimeout(() => {
+        document.getElementById('ciphertext-display').textContent = data.ciphertext;
+    }, data.steps.length * 800 + 400);
 }
 
 function animateStep(step, index) {
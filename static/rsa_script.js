@@ -1,12 +1,15 @@
 let publicKey = null;
 let privateKey = null; // In real world never expose this client side easily but for demo ok
 let currentCiphertext = null;
+let crtParams = null; // p, q, dP, dQ, qInv (real-size keys only)
 
 async function generateKeys() {
     const p = document.getElementById('p').value;
     const q = document.getElementById('q').value;
+    const bitsSelect = document.getElementById('key-bits');
+    const bits = bitsSelect ? bitsSelect.value : '';
 
-    if (!p || !q) {
+    if (!bits && (!p || !q)) {
         alert("Inserisci entrambi i numeri primi p e q.");
         return;
     }
@@ -17,7 +20,7 @@ async function generateKeys() {
             headers: {
                 'Content-Type': 'application/json'
             },
-            body: JSON.stringify({ p: p, q: q })
+            body: JSON.stringify(bits ? { bits: bits } : { p: p, q: q })
         });
 
         const data = await response.json();
@@ -29,6 +32,7 @@ async function generateKeys() {
 
         publicKey = data.public_key;
         privateKey = data.private_key;
+        crtParams = data.crt || null;
 
         // Update UI
         document.getElementById('public-key-display').textContent = `(e=${publicKey[0]}, n=${publicKey[1]})`;
@@ -107,7 +111,8 @@ async function decryptMessage() {
             body: JSON.stringify({
                 ciphertext: currentCiphertext,
                 d: privateKey[0],
-                n: privateKey[1]
+                n: privateKey[1],
+                crt: crtParams
             })
         });
 
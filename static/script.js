@@ -138,11 +138,11 @@ async function runEncryption() {
     try {
         const response = await fetch('/encrypt', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: { 'Content-Type': 'application/json', 'Accept': TRACE_COMPACT_MIME },
             body: JSON.stringify({ text, key })
         });
 
-        const data = await response.json();
+        const data = decodeAesTrace(await response.json());
 
         if (data.error) {
             alert("Errore: " + data.error);
@@ -451,22 +451,22 @@ async function animateSequentialShiftRows(targetStateMatrix, srcStateMatrix) {
 
     tCells.forEach(c => c.style.color = 'transparent');
 
-    const cols = [0, 1, 2, 3];
+    const rows = [0, 1, 2, 3];
     const shifts = [0, 1, 2, 3];
 
-    for (const c of cols) {
+    for (const r of rows) {
         await animCtrl.wait(0);
 
-        for (let r = 0; r < 4; r++) {
+        for (let c = 0; c < 4; c++) {
             sCells[r * 4 + c].classList.add('highlight-source');
         }
 
         await animCtrl.wait(300);
 
-        const shift = shifts[c];
+        const shift = shifts[r];
         const flyers = [];
 
-        for (let r = 0; r < 4; r++) {
+        for (let c = 0; c < 4; c++) {
             const sCell = sCells[r * 4 + c];
             const sRect = sCell.getBoundingClientRect();
             const scrollTop = window.scrollY || document.documentElement.scrollTop;
@@ -482,8 +482,8 @@ async function animateSequentialShiftRows(targetStateMatrix, srcStateMatrix) {
             flyer.style.backgroundColor = 'var(--accent)';
             document.body.appendChild(flyer);
 
-            const r_new = (r - shift + 4) % 4;
-            const tCell = tCells[r_new * 4 + c];
+            const c_new = (c - shift + 4) % 4;
+            const tCell = tCells[r * 4 + c_new];
 
             flyers.push({ flyer, tCell });
         }
@@ -508,7 +508,7 @@ async function animateSequentialShiftRows(targetStateMatrix, srcStateMatrix) {
             obj.tCell.classList.add('xor-flash');
         });
 
-        for (let r = 0; r < 4; r++) {
+        for (let c = 0; c < 4; c++) {
             sCells[r * 4 + c].classList.remove('highlight-source');
         }
 
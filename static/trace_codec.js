@@ -0,0 +1,179 @@
+// --- Compact Trace Decoding ---
+// Counterpart of logic/trace_codec.py: rebuilds the same structures the verbose
+// endpoints return as plain JSON, so the renderers do not need to change.
+
+const TRACE_COMPACT_MIME = 'application/vnd.trace-compact+json';
+
+function b64ToBytes(b64) {
+    const bin = atob(b64);
+    const out = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) out[i] = bin.charCodeAt(i);
+    return out;
+}
+
+// Reads a big-endian field of `bits` bits as BigInt (fields are byte-aligned)
+function readField(bytes, offset, bits) {
+    const len = Math.ceil(bits / 8);
+    let v = 0n;
+    for (let i = 0; i < len; i++) v = (v << 8n) | BigInt(bytes[offset + i]);
+    return [v, offset + len];
+}
+
+function fieldHex(v, bits) {
+    return v.toString(16).toUpperCase().padStart(Math.ceil(bits / 4), '0');
+}
+
+function fieldBin(v, bits) {
+    return v.toString(2).padStart(bits, '0');
+}
+
+function matrixFrom(bytes, offset) {
+    const m = [];
+    for (let r = 0; r < 4; r++) {
+        m.push(Array.from(bytes.slice(offset + r * 4, offset + r * 4 + 4)));
+    }
+    return m;
+}
+
+// AES: schema = [[round, step, hasKey, description], ...], same for every block
+function decodeAesTrace(data) {
+    if (data.format !== 'aes-trace-v1') return data;
+
+    const keys = b64ToBytes(data.keys);
+    const states = b64ToBytes(data.states);
+    const blocks = [];
+    let offset = 0;
+
+    for (let b = 0; b < data.num_trace_blocks; b++) {
+        const steps = [];
+        let keyOffset = 0;
+        data.schema.forEach(([round, stepName, hasKey, description]) => {
+            const step = { round: round, step: stepName };
+            if (description !== null) step.description = description;
+            step.state = matrixFrom(states, offset);
+            offset += 16;
+            if (hasKey) {
+                step.key = matrixFrom(keys, keyOffset);
+                keyOffset += 16;
+            }
+            steps.push(step);
+        });
+        blocks.push(steps);
+    }
+
+    const out = Object.assign({}, data);
+    ['format', 'num_trace_blocks', 'schema', 'keys', 'states'].forEach(k => delete out[k]);
+    out.blocks = blocks;
+    return out;
+}
+
+// DES: fixed-width fields per round, see DES_ROUND_FIELDS in trace_codec.py
+function decodeDesTrace(data) {
+    if (data.format !== 'des-trace-v1') return data;
+
+    const bytes = b64ToBytes(data.data);
+    const [initDesc, ipDesc, fpDesc] = data.descriptions;
+    const steps = [];
+    let offset = 0;
+    let input, ip;
+
+    [input, offset] = readField(bytes, offset, 64);
+    [ip, offset] = readField(bytes, offset, 64);
+
+    const rounds = [];
+    for (let i = 0; i < data.rounds; i++) {
+        const f = {};
+        data.round_fields.forEach(([name, bits]) => {
+            [f[name], offset] = readField(bytes, offset, bits);
+        });
+        rounds.push(f);
+    }
+
+    let preFp, ct;
+    [preFp, offset] = readField(bytes, offset, 64);
+    [ct, offset] = readField(bytes, offset, 64);
+
+    steps.push({
+        step: 'init',
+        description: initDesc,
+        input_bin: fieldBin(input, 64),
+        input_hex: data.input_hex,
+        key_hex: data.key_hex,
+        round_keys_hex: rounds.map(f => fieldHex(f.key_round, 48))
+    });
+
+    let l = ip >> 32n;
+    let r = ip & 0xFFFFFFFFn;
+    steps.push({
+        step: 'ip',
+        description: ipDesc,
+        state_hex: fieldHex(ip, 64),
+        l_bin: fieldBin(l, 32),
+        r_bin: fieldBin(r, 32),
+        l_hex: fieldHex(l, 32),
+        r_hex: fieldHex(r, 32)
+    });
+
+    rounds.forEach((f, i) => {
+        const sboxDetails = [];
+        for (let j = 0; j < 8; j++) {
+            const chunk = Number((f.xor_key >> BigInt(42 - 6 * j)) & 0x3Fn);
+            const val = Number((f.sbox_out >> BigInt(28 - 4 * j)) & 0xFn);
+            sboxDetails.push({
+                box: j + 1,
+                input: chunk.toString(2).padStart(6, '0'),
+                row: ((chunk >> 4) & 0x2) | (chunk & 0x1),
+                col: (chunk >> 1) & 0xF,
+                output: val.toString(2).padStart(4, '0')
+            });
+        }
+
+        steps.push({
+            step: 'round',
+            round_num: i + 1,
+            details: {
+                round: i + 1,
+                l_prev: fieldHex(l, 32),
+                r_prev: fieldHex(r, 32),
+                key_round: fieldHex(f.key_round, 48),
+                expansion: fieldHex(f.expansion, 48),
+                xor_key: fieldHex(f.xor_key, 48),
+                sbox_in: fieldHex(f.xor_key, 48),
+                sbox_details: sboxDetails,
+                sbox_out: fieldHex(f.sbox_out, 32),
+                p_perm: fieldHex(f.p_perm, 32),
+                l_new: fieldHex(f.l_new, 32),
+                r_new: fieldHex(f.r_new, 32),
+                key_schedule: {
+                    round: i + 1,
+                    c_prev: fieldBin(f.c_prev, 28),
+                    d_prev: fieldBin(f.d_prev, 28),
+                    shift: Number(f.shift),
+                    c_new: fieldBin(f.c_new, 28),
+                    d_new: fieldBin(f.d_new, 28),
+                    k_bin: fieldBin(f.key_round, 48),
+                    k_hex: fieldHex(f.key_round, 48)
+                }
+            }
+        });
+        l = f.l_new;
+        r = f.r_new;
+    });
+
+    steps.push({
+        step: 'fp',
+        description: fpDesc,
+        pre_fp_hex: fieldHex(preFp, 64),
+        ciphertext_hex: fieldHex(ct, 64),
+        ciphertext_bin: fieldBin(ct, 64)
+    });
+
+    const out = Object.assign({}, data);
+    ['format', 'rounds', 'descriptions', 'round_fields', 'data'].forEach(k => delete out[k]);
+    out.steps = steps;
+    return out;
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { decodeAesTrace, decodeDesTrace, TRACE_COMPACT_MIME };
+}